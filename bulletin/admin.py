@@ -9,7 +9,7 @@ class BulletinAdmin(admin.ModelAdmin):
     Представляет административное представление для объявления.
     """
 
-    list_display = ("title", "price", "author", "created_at")
+    list_display = ("title", "price", "author", "created_at", "review_count")
     list_filter = ("title", "author")
     search_fields = ("title", "author")
 
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class BulletinConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "bulletin"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,365 @@
+# bulletin/async_views.py
+"""
+Асинхронные вьюхи чтения для режима ASGI (SERVER_MODE=asgi, uvicorn).
+
+DRF не поддерживает асинхронные вьюсеты, поэтому роутер по-прежнему создаёт обычные BulletinViewSet и
+ReviewViewSet, а wrap_async_read_views() подменяет callback'и URL списка и карточки объявления и списка отзывов
+асинхронным диспетчером (имена URL не меняются). Диспетчер сам обслуживает «простые» GET/HEAD-запросы через
+асинхронный ORM (aaggregate, afirst, async for). У кэш-бэкендов Django нет собственной асинхронной реализации
+(их a*-методы — тот же sync_to_async), поэтому обращения к кэшу сгруппированы в один переход в поток.
+Простой запрос:
+- из параметров только page, page_size и cursor (без фильтров, поиска и сортировки);
+- без суффикса формата и с Accept: */*, application/json или без Accept;
+- аноним или JWT в заголовке Authorization (без сессионной cookie).
+
+Логика ответа та же, что у синхронных вьюсетов, — общие помощники из bulletin.cache, bulletin.conditional и
+bulletin.paginators: кэш анонимов, ETag / 304, keyset- и постраничная пагинация, ValuesRowSerializer.
+Всё остальное — запись, фильтры, Browsable API, сессии, а также любые ошибки (401/403/404, неверный курсор или
+номер страницы) — передаётся синхронному вьюсету через sync_to_async, поэтому ответы совпадают побайтно.
+"""
+
+import asyncio
+import functools
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.paginator import InvalidPage
+
+from asgiref.sync import sync_to_async
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from config.db_router import achoose_replica, reading_from
+from user.authentication import CachedJWTAuthentication, get_local_user, token_cache_key
+
+from .cache import cached_list_response
+from .conditional import (
+    COST_KEY_PREFIX,
+    COST_TIMEOUT,
+    not_modified,
+    object_etag,
+    record_not_modified,
+    render_response,
+    set_validators,
+)
+from .models import Bulletin
+
+SIMPLE_QUERY_PARAMS = {"page", "page_size", "cursor"}
+JSON_ACCEPT = {"*/*", "application/json"}
+
+# Ключ кэша списка → Future с закэшированным значением, которое сейчас строится (см. bulletin_list)
+pending_list_misses: dict[str, asyncio.Future] = {}
+
+# Ошибки, при которых запрос отдаётся синхронному вьюсету: он построит тот же ответ об ошибке, что и раньше
+FALLBACK_ERRORS = (APIException, InvalidPage, ObjectDoesNotExist, DjangoValidationError, ValueError)
+
+
+class AsyncJWTAuthentication(CachedJWTAuthentication):
+    """
+    CachedJWTAuthentication для асинхронного пути: пользователь из памяти процесса берётся без перехода в поток,
+    Redis и база — одним переходом (get_user).
+    """
+
+    async def aauthenticate(self, request):
+        """
+        :param request: HttpRequest
+        :return: Пара (пользователь, токен) или None, если в запросе нет JWT
+        :raises InvalidToken, AuthenticationFailed: Если токен неверен или пользователь недоступен
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        user = get_local_user(token_cache_key(validated_token))
+        if user is not None:
+            return user
+        return await sync_to_async(self.get_user)(validated_token)
+
+
+jwt_authentication = AsyncJWTAuthentication()
+
+
+def is_simple_request(request, kwargs):
+    """
+    Проверяет, может ли запрос обслужить асинхронный путь (см. описание модуля).
+    """
+    accept = request.headers.get("Accept")
+    return (
+        request.method in ("GET", "HEAD")
+        and "format" not in kwargs
+        and request.GET.keys() <= SIMPLE_QUERY_PARAMS
+        and (accept is None or accept in JSON_ACCEPT)
+        and (settings.SESSION_COOKIE_NAME not in request.COOKIES or "Authorization" in request.headers)
+    )
+
+
+def init_view(sync_view, action, request, kwargs, user):
+    """
+    Создаёт экземпляр вьюсета так же, как его as_view() и initial(), но без аутентификации и согласования
+    содержимого: пользователь уже известен, ответ — всегда первый (JSON) рендерер.
+
+    :param sync_view: Callback синхронного вьюсета из роутера
+    :param action: Действие вьюсета (list, retrieve)
+    :param request: HttpRequest
+    :param kwargs: Аргументы из URL
+    :param user: Пользователь запроса
+    :return: Экземпляр вьюсета
+    """
+    view = sync_view.cls(**sync_view.initkwargs)
+    view.action_map = sync_view.actions
+    for method, name in sync_view.actions.items():
+        setattr(view, method, getattr(view, name))
+    if hasattr(view, "get") and not hasattr(view, "head"):
+        view.head = view.get
+
+    drf_request = Request(request)
+    drf_request.user = user
+    renderer = view.get_renderers()[0]
+    drf_request.accepted_renderer, drf_request.accepted_media_type = renderer, renderer.media_type
+
+    view.request, view.args, view.kwargs = drf_request, (), kwargs
+    view.action, view.format_kwarg = action, None
+    view.headers = view.default_response_headers
+    return view
+
+
+async def paginate(view, queryset):
+    """
+    Асинхронная версия paginate_queryset пагинаторов объявлений и отзывов (keyset или по номеру страницы).
+    Число строк для номера страницы уже известно из запроса валидаторов (known_count), COUNT(*) не выполняется.
+
+    :param view: Вьюсет
+    :param queryset: Queryset выдачи
+    :return: Строки страницы
+    """
+    paginator, request = view.paginator, view.request
+    paginator.keyset = paginator.use_keyset(request)
+    if paginator.keyset:
+        queryset, page_size = paginator.get_keyset_queryset(queryset, request)
+        return paginator.set_keyset_rows([row async for row in queryset[: page_size + 1]], page_size)
+
+    django_paginator = paginator.django_paginator_class(queryset, paginator.get_page_size(request))
+    page = django_paginator.page(paginator.get_page_number(request, django_paginator))
+    page.object_list = [row async for row in page.object_list]
+    paginator.page, paginator.request = page, request
+    return page.object_list
+
+
+async def list_validators(view, queryset):
+    """
+    Асинхронная версия ConditionalListMixin.get_list_validators: те же запросы и вычисления вьюсета, асинхронно
+    выполняется только обращение к базе (для пагинатора с приблизительным числом строк — синхронный
+    get_list_stats в потоке).
+
+    :return: Пара (etag, last_modified) или None для пустого списка
+    """
+    if view.uses_keyset():
+        return view.get_page_validators([row async for row in view.get_page_validator_rows(queryset)])
+    if getattr(view.paginator, "approximate_count", False):
+        # Оценка числа строк и поколение списка читаются синхронно (кэш, pg_class) — одним переходом в поток
+        stats = await sync_to_async(view.get_list_stats)(queryset)
+    else:
+        stats = await queryset.order_by().aaggregate(**view.list_stats_aggregates())
+        stats = stats["count"], stats["last"], None
+    return view.get_count_validators(*stats)
+
+
+async def conditional_response(view, validators, handler):
+    """
+    Асинхронная версия ConditionalResponseMixin.conditional_response.
+    «Цена» ответа для метрик 304 — время ожидания базы в handler.
+
+    :param handler: Корутина-функция без аргументов, строящая обычный ответ
+    """
+    if validators is None:
+        return await handler()
+    etag, last_modified = validators
+    response = not_modified(view.request, etag, last_modified)
+    if response is not None:
+        await sync_to_async(record_not_modified)(etag)
+        return response
+
+    started = time.perf_counter()
+    response = await handler()
+    elapsed = time.perf_counter() - started
+    if response.status_code == 200:
+        render_response(view, view.request, response)
+        set_validators(response, etag, last_modified)
+        await cache.aset(COST_KEY_PREFIX + etag, (len(response.content), round(elapsed * 1_000_000)), COST_TIMEOUT)
+    return response
+
+
+async def bulletin_list(view):
+    """
+    Список объявлений: кэш анонимов, затем ETag и строки .values() (как у BulletinViewSet.list).
+
+    Одновременные промахи по одному ключу кэша в процессе ждут первый запрос, а не строят ответ каждый сам:
+    при сотнях открытых соединений сброс поколения иначе вызывает лавину одинаковых запросов к базе.
+    """
+    request = view.request
+    if not view.is_list_cacheable(request):
+        return await bulletin_rows(view)
+
+    key, cached = await sync_to_async(view.get_cached_list)(request)
+    waited = cached is None and key in pending_list_misses
+    if waited:
+        cached = await asyncio.shield(pending_list_misses[key])
+    if cached is not None:
+        response = cached_list_response(request, cached)
+        if response.status_code != 200:
+            await sync_to_async(record_not_modified)(response["ETag"], size=len(cached[0]))
+        return response
+
+    # Между проверкой pending_list_misses выше и регистрацией нет await, поэтому ведущий запрос на ключ один;
+    # запрос, дождавшийся незакэшированного ответа, строит свой без регистрации
+    pending = asyncio.get_running_loop().create_future()
+    leader = not waited and pending_list_misses.setdefault(key, pending) is pending
+    cached = None
+    try:
+        response = await bulletin_rows(view)
+        if response.status_code == 200:
+            render_response(view, request, response)
+            validators = {header: response[header] for header in view.validator_headers if header in response}
+            cached = (response.content, response["Content-Type"], validators)
+            await cache.aset(key, cached, settings.BULLETIN_LIST_CACHE_TIMEOUT)
+    finally:
+        # Ждущие запросы получат тело или None (ответ не закэширован — 304 или ошибка) и построят ответ сами
+        if leader:
+            del pending_list_misses[key]
+            pending.set_result(cached)
+    response["X-Cache"] = "MISS"
+    return response
+
+
+async def bulletin_rows(view):
+    """
+    Список объявлений без кэша анонимов.
+    """
+    queryset = view.get_queryset()
+    serializer = view.values_serializer
+
+    async def handler():
+        rows = await paginate(view, queryset.values(*serializer.field_names))
+        return view.get_paginated_response(serializer.to_representation(rows))
+
+    return await conditional_response(view, await list_validators(view, queryset), handler)
+
+
+async def bulletin_retrieve(view):
+    """
+    Карточка объявления: ETag по версии, затем объект (как у BulletinViewSet.retrieve).
+    Несуществующее объявление отдаётся синхронному вьюсету (404).
+    """
+    request = view.request
+    lookup = view.kwargs[view.lookup_url_kwarg or view.lookup_field]
+    queryset = view.get_queryset().filter(**{view.lookup_field: lookup})
+    row = await queryset.order_by().values_list(view.version_field, view.last_modified_field).afirst()
+    if row is None:
+        return None
+    version, last_modified = row
+
+    async def handler():
+        instance = await queryset.aget()
+        view.check_object_permissions(request, instance)
+        return Response(view.get_serializer(instance).data)
+
+    validators = object_etag(request, request.accepted_media_type, version, last_modified), last_modified
+    return await conditional_response(view, validators, handler)
+
+
+async def review_list(view):
+    """
+    Отзывы объявления (как у ReviewViewSet.list). Пустая выдача несуществующего объявления отдаётся
+    синхронному вьюсету (404).
+    """
+    queryset = view.get_queryset()
+    validators = await list_validators(view, queryset)
+    if validators is None and not await Bulletin.objects.filter(pk=view.kwargs["bulletin_pk"]).aexists():
+        return None
+
+    async def handler():
+        reviews = await paginate(view, queryset)
+        return view.get_paginated_response(view.get_serializer(reviews, many=True).data)
+
+    return await conditional_response(view, validators, handler)
+
+
+# Имя URL → (действие вьюсета, асинхронный обработчик)
+ASYNC_READ_HANDLERS = {
+    "bulletins-list": ("list", bulletin_list),
+    "bulletins-detail": ("retrieve", bulletin_retrieve),
+    "bulletin-reviews-list": ("list", review_list),
+}
+
+
+async def serve(sync_view, action, handler, request, kwargs):
+    """
+    Обслуживает простой запрос асинхронно.
+
+    :return: Ответ или None, если запрос нужно передать синхронному вьюсету
+    """
+    try:
+        authenticated = await jwt_authentication.aauthenticate(request)
+        if authenticated is None and "Authorization" in request.headers:
+            return None
+        user = authenticated[0] if authenticated is not None else AnonymousUser()
+
+        view = init_view(sync_view, action, request, kwargs, user)
+        if view.get_throttles():
+            return None
+        view.check_permissions(view.request)
+        response = await handler(view)
+    except FALLBACK_ERRORS:
+        return None
+    if response is None:
+        return None
+
+    response = view.finalize_response(view.request, response)
+    if isinstance(response, Response):
+        response.render()
+    return response
+
+
+def async_read_view(sync_view, action, handler):
+    """
+    Оборачивает callback синхронного вьюсета асинхронным диспетчером.
+
+    :param sync_view: Callback из роутера (BulletinViewSet.as_view(...) и т. п.)
+    :param action: Действие вьюсета для GET-запроса
+    :param handler: Асинхронный обработчик простых запросов
+    :return: Асинхронная вьюха с атрибутами исходной (cls, actions, csrf_exempt) — для схемы API и CSRF
+    """
+    sync_handler = sync_to_async(sync_view)
+
+    async def view(request, *args, **kwargs):
+        if is_simple_request(request, kwargs):
+            with reading_from(await achoose_replica(request)):
+                response = await serve(sync_view, action, handler, request, kwargs)
+            if response is not None:
+                return response
+        return await sync_handler(request, *args, **kwargs)
+
+    return functools.update_wrapper(view, sync_view)
+
+
+def wrap_async_read_views(urlpatterns):
+    """
+    Подменяет callback'и URL из ASYNC_READ_HANDLERS асинхронными вьюхами (вместе с вариантами с суффиксом формата).
+
+    :param urlpatterns: Список URLPattern роутера
+    """
+    for pattern in urlpatterns:
+        if pattern.name in ASYNC_READ_HANDLERS:
+            action, handler = ASYNC_READ_HANDLERS[pattern.name]
+            pattern.callback = async_read_view(pattern.callback, action, handler)
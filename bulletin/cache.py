@@ -0,0 +1,178 @@
+# bulletin/cache.py
+"""
+Кэш ответов списка объявлений для анонимных пользователей.
+
+В кэше хранятся готовые байты JSON-ответа. Ключ строится из номера поколения, адреса и нормализованной строки
+запроса (page, page_size, ordering, фильтры — в отсортированном виде). Любое создание, изменение или удаление
+объявления увеличивает номер поколения, и все старые ключи перестают использоваться (истекают по TTL) —
+без сканирования ключей Redis.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.http import parse_http_date_safe, urlencode
+
+from config import metrics
+
+from .conditional import not_modified, record_not_modified, render_response
+
+LIST_GENERATION_KEY = "bulletin:list:generation"
+# v2: в значении хранятся ещё и валидаторы (ETag, Last-Modified)
+LIST_KEY_PREFIX = "bulletin:list:v2"
+
+metrics.register("bulletin_list_cache.hit", "bulletin_list_cache.miss")
+
+
+def get_list_generation():
+    """
+    Возвращает текущий номер поколения кэша списка объявлений.
+    """
+    generation = cache.get(LIST_GENERATION_KEY)
+    if generation is None:
+        cache.add(LIST_GENERATION_KEY, 1, timeout=None)
+        generation = cache.get(LIST_GENERATION_KEY, 1)
+    return generation
+
+
+def bump_list_generation():
+    """
+    Инвалидирует кэш списка объявлений, увеличивая номер поколения.
+    """
+    try:
+        cache.incr(LIST_GENERATION_KEY)
+    except ValueError:
+        cache.add(LIST_GENERATION_KEY, 1, timeout=None)
+
+
+def make_list_cache_key(request, media_type, generation, prefix=LIST_KEY_PREFIX):
+    """
+    Формирует ключ кэша списка: адрес, нормализованная строка запроса и тип ответа под номером поколения.
+
+    :param request: Запрос (HttpRequest или DRF Request)
+    :param media_type: Тип ответа, выбранный согласованием содержимого
+    :param generation: Номер поколения кэша
+    :param prefix: Префикс ключа
+    :return: Ключ кэша
+    """
+    raw = "|".join([request.build_absolute_uri(request.path), normalize_query(request.GET), media_type])
+    return f"{prefix}:{generation}:{hashlib.sha1(raw.encode()).hexdigest()}"
+
+
+def normalize_query(query_params):
+    """
+    Приводит строку запроса к каноническому виду: параметры отсортированы, пустые значения отброшены.
+
+    :param query_params: QueryDict запроса
+    :return: Нормализованная строка запроса
+    """
+    pairs = sorted((key, value) for key in query_params for value in query_params.getlist(key) if value != "")
+    return urlencode(pairs)
+
+
+def cached_not_modified(request, validators):
+    """
+    Проверяет условный запрос по валидаторам закэшированного ответа.
+
+    :return: Ответ 304 или None
+    """
+    etag = validators.get("ETag")
+    if etag is None:
+        return None
+    last_modified = parse_http_date_safe(validators.get("Last-Modified"))
+    return not_modified(
+        request, etag, datetime.fromtimestamp(last_modified, timezone.utc) if last_modified is not None else None
+    )
+
+
+def cached_list_response(request, cached):
+    """
+    Строит ответ из значения кэша: 304, если совпали валидаторы, иначе закэшированное тело.
+    Учёт 304 в метриках остаётся вызывающему (синхронно или асинхронно).
+
+    :param request: Запрос
+    :param cached: Значение кэша — (тело, Content-Type, валидаторы)
+    :return: Ответ с заголовком X-Cache: HIT
+    """
+    content, content_type, validators = cached
+    response = cached_not_modified(request, validators) or HttpResponse(content, content_type=content_type)
+    for header, value in validators.items():
+        response[header] = value
+    response["X-Cache"] = "HIT"
+    return response
+
+
+class AnonymousListCacheMixin:
+    """
+    Кэширует отрендеренный ответ action list для анонимных пользователей.
+
+    Кэшируется только JSON (Browsable API не кэшируется) и только ответы 200.
+    В ответ добавляется заголовок X-Cache: HIT/MISS.
+    Вместе с телом хранятся ETag и Last-Modified, поэтому условный запрос при попадании в кэш
+    получает 304 без обращения к базе.
+    """
+
+    validator_headers = ("ETag", "Last-Modified")
+
+    list_cache_prefix = LIST_KEY_PREFIX
+
+    def is_list_cacheable(self, request):
+        """
+        Проверяет, можно ли отдать ответ на запрос из кэша.
+        """
+        return (
+            settings.BULLETIN_LIST_CACHE_TIMEOUT > 0
+            and request.method == "GET"
+            and not request.user.is_authenticated
+            and request.accepted_renderer.format == "json"
+        )
+
+    def get_list_generation(self):
+        """
+        Поколение кэша списка меняется при каждом изменении объявлений (см. bulletin.signals),
+        поэтому годится и для ETag при приблизительном числе строк (см. bulletin.conditional).
+        """
+        return get_list_generation()
+
+    def get_list_cache_key(self, request):
+        """
+        Формирует ключ кэша для запроса.
+        """
+        return make_list_cache_key(request, request.accepted_media_type, get_list_generation(), self.list_cache_prefix)
+
+    def get_cached_list(self, request):
+        """
+        Ищет ответ в кэше и учитывает попадание или промах в метриках.
+        Всё обращение к кэшу — один синхронный вызов: асинхронная вьюха (см. bulletin.async_views) делает его
+        одним переходом в поток sync_to_async.
+
+        :return: Пара (ключ кэша, значение кэша или None)
+        """
+        key = self.get_list_cache_key(request)
+        cached = cache.get(key)
+        metrics.incr("bulletin_list_cache.hit" if cached is not None else "bulletin_list_cache.miss")
+        return key, cached
+
+    def list(self, request, *args, **kwargs):
+        if not self.is_list_cacheable(request):
+            return super().list(request, *args, **kwargs)  # type: ignore[misc]
+
+        key, cached = self.get_cached_list(request)
+        if cached is not None:
+            response = cached_list_response(request, cached)
+            if response.status_code != 200:
+                record_not_modified(response["ETag"], size=len(cached[0]))
+            return response
+
+        response = super().list(request, *args, **kwargs)  # type: ignore[misc]
+        if response.status_code == 200:
+            render_response(self, request, response)
+            validators = {header: response[header] for header in self.validator_headers if header in response}
+            cache.set(
+                key, (response.content, response["Content-Type"], validators), settings.BULLETIN_LIST_CACHE_TIMEOUT
+            )
+        response["X-Cache"] = "MISS"
+        return response
@@ -0,0 +1,346 @@
+# bulletin/conditional.py
+"""
+Условные HTTP-запросы (ETag / Last-Modified / 304) для объявлений и отзывов.
+
+Валидаторы вычисляются дешёвым запросом, без сериализации и рендеринга тела:
+- объект — по номеру версии и времени изменения (version, updated_at);
+- список — по числу строк и максимальному updated_at отфильтрованной выборки (число строк ловит удаления,
+  максимум — добавления и изменения), плюс путь со строкой запроса и тип ответа. Если число строк
+  приблизительное (см. bulletin.paginators.ApproximateCountPaginationMixin), удаления ловит номер поколения списка;
+- страница по курсору (keyset) — по (id, updated_at) строк самой страницы и одной следующей: без COUNT(*),
+  ради отказа от которого keyset-пагинация и введена.
+
+Если If-None-Match / If-Modified-Since совпадают, клиент получает 304 до сериализации. Для отданных ответов
+200 в кэше запоминается их «цена» — размер тела и время SQL-запросов на его построение, и при каждом 304
+эта цена добавляется к счётчикам сэкономленных байт и времени базы.
+
+Last-Modified имеет точность в секунду и не отражает удаления строк из списка, поэтому основным валидатором
+остаётся ETag (при наличии If-None-Match заголовок If-Modified-Since игнорируется).
+"""
+
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from rest_framework.response import Response
+
+from config import metrics
+from config.profiling import measure
+
+COST_KEY_PREFIX = "conditional:cost:"
+COST_TIMEOUT = 24 * 60 * 60
+
+metrics.register("conditional.not_modified", "conditional.bytes_saved", "conditional.db_time_saved_us")
+
+
+def make_etag(*parts):
+    """
+    Строит слабый ETag из составных частей.
+
+    :param parts: Значения, от которых зависит тело ответа
+    :return: Строка ETag вида W/"<sha1>"
+    """
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'W/"{digest}"'
+
+
+def list_etag(request, media_type, count, last_modified, generation=None):
+    """
+    Строит ETag списка: путь со строкой запроса, тип ответа, число строк и время последнего изменения
+    (и номер поколения списка, если число строк приблизительное).
+    """
+    parts = [request.get_full_path(), media_type, count, last_modified.isoformat()]
+    if generation is not None:
+        parts.append(generation)
+    return make_etag(*parts)
+
+
+def page_etag(request, media_type, rows):
+    """
+    Строит ETag страницы по курсору: путь со строкой запроса, тип ответа и (id, время изменения) строк страницы
+    вместе со следующей строкой (от неё зависит ссылка next).
+    """
+    return make_etag(request.get_full_path(), media_type, *(f"{pk}:{modified.isoformat()}" for pk, modified in rows))
+
+
+def object_etag(request, media_type, version, last_modified):
+    """
+    Строит ETag объекта: путь, тип ответа, номер версии и время изменения.
+    """
+    return make_etag(request.path, media_type, version, last_modified.isoformat())
+
+
+def set_validators(response, etag, last_modified):
+    """
+    Добавляет заголовки ETag и Last-Modified в ответ.
+
+    :param response: Ответ
+    :param etag: ETag
+    :param last_modified: Время изменения (datetime) или None
+    """
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+
+
+def not_modified(request, etag, last_modified):
+    """
+    Проверяет заголовки If-None-Match / If-Modified-Since запроса.
+
+    :param request: Запрос
+    :param etag: Текущий ETag
+    :param last_modified: Текущее время изменения (datetime) или None
+    :return: Ответ 304 (или 412 для If-Match) либо None, если нужно отдать тело
+    """
+    if request.method not in ("GET", "HEAD"):
+        return None
+    timestamp = int(last_modified.timestamp()) if last_modified is not None else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def record_not_modified(etag, size=None):
+    """
+    Учитывает ответ 304 в метриках.
+
+    :param etag: ETag, по которому совпал запрос
+    :param size: Размер тела, если ответ проверялся по кэшу ответов (база в этом случае не сэкономлена)
+    """
+    metrics.incr("conditional.not_modified")
+    if size is not None:
+        metrics.incr("conditional.bytes_saved", size)
+        return
+    cost = cache.get(COST_KEY_PREFIX + etag)
+    if cost is not None:
+        size, db_time_us = cost
+        metrics.incr("conditional.bytes_saved", size)
+        metrics.incr("conditional.db_time_saved_us", db_time_us)
+
+
+def render_response(view, request, response):
+    """
+    Рендерит DRF Response прямо во view, чтобы узнать размер тела (или сохранить его в кэш).
+
+    :param view: Вьюсет, вернувший ответ
+    :param request: Запрос
+    :param response: Response
+    :return: Отрендеренный Response
+    """
+    response.accepted_renderer = request.accepted_renderer
+    response.accepted_media_type = request.accepted_media_type
+    response.renderer_context = view.get_renderer_context()
+    with measure("render"):
+        return response.render()
+
+
+class QueryTimer:
+    """
+    Обёртка для connection.execute_wrapper: суммирует время выполнения SQL-запросов.
+    """
+
+    def __init__(self):
+        self.elapsed = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.elapsed += time.perf_counter() - started
+
+
+class ConditionalResponseMixin:
+    """
+    Общая логика условных ответов для вьюсетов.
+    """
+
+    def conditional_response(self, request, validators, handler):
+        """
+        Отдаёт 304, если валидаторы совпали с заголовками запроса, иначе вызывает handler и добавляет валидаторы.
+
+        :param request: Запрос
+        :param validators: Пара (etag, last_modified) или None, если условный ответ невозможен
+        :param handler: Функция без аргументов, строящая обычный ответ
+        :return: Ответ
+        """
+        if validators is None:
+            return handler()
+        etag, last_modified = validators
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            record_not_modified(etag)
+            return response
+
+        timer = QueryTimer()
+        with connection.execute_wrapper(timer):
+            response = handler()
+        if response.status_code == 200:
+            render_response(self, request, response)
+            set_validators(response, etag, last_modified)
+            cache.set(COST_KEY_PREFIX + etag, (len(response.content), round(timer.elapsed * 1_000_000)), COST_TIMEOUT)
+        return response
+
+
+class ConditionalListMixin(ConditionalResponseMixin):
+    """
+    Условные ответы для action list.
+
+    Число строк, посчитанное для ETag, передаётся пагинатору (known_count), поэтому отдельный COUNT(*)
+    для постраничного ответа не выполняется. Если пагинатор допускает приблизительное число строк, а вьюсет
+    отслеживает поколение списка (get_list_generation), COUNT(*) не выполняется вовсе. Для страницы по курсору
+    число строк не нужно: ETag строится по строкам страницы (get_page_validator_rows).
+    """
+
+    last_modified_field = "updated_at"
+
+    def get_list_generation(self):
+        """
+        Номер поколения списка: меняется при любом изменении строк, в том числе удалении.
+        Без него приблизительное число строк не используется — удаление не изменило бы ETag.
+
+        :return: Номер поколения или None, если вьюсет его не отслеживает
+        """
+        return None
+
+    def list_stats_aggregates(self):
+        """
+        Агрегаты точного числа строк и времени последнего изменения списка (для aggregate / aaggregate).
+        """
+        return {"count": Count("pk"), "last": Max(self.last_modified_field)}
+
+    def get_list_stats(self, queryset):
+        """
+        Считает число строк и время последнего изменения списка.
+
+        :param queryset: Отфильтрованный queryset
+        :return: Кортеж (число строк, last_modified, номер поколения — только для приблизительного числа строк)
+        """
+        paginator = self.paginator  # type: ignore[attr-defined]
+        if getattr(paginator, "approximate_count", False):
+            generation = self.get_list_generation()
+            count = paginator.get_approximate_count(queryset) if generation is not None else None
+            if count is not None:
+                last = queryset.order_by().aggregate(last=Max(self.last_modified_field))["last"]
+                return count, last, generation
+        stats = queryset.order_by().aggregate(**self.list_stats_aggregates())
+        return stats["count"], stats["last"], None
+
+    def uses_keyset(self):
+        """
+        Проверяет, отдаётся ли список запроса страницей по курсору (см. bulletin.paginators.KeysetPaginationMixin).
+        """
+        paginator = self.paginator  # type: ignore[attr-defined]
+        return hasattr(paginator, "use_keyset") and paginator.use_keyset(self.request)  # type: ignore[attr-defined]
+
+    def get_page_validator_rows(self, queryset):
+        """
+        Возвращает queryset (id, время изменения) строк страницы по курсору и одной следующей строки.
+        Запрос не выполняется: синхронный и асинхронный (см. bulletin.async_views) пути читают его сами.
+
+        :param queryset: Отфильтрованный queryset
+        :raises NotFound: Если курсор повреждён
+        """
+        paginator = self.paginator  # type: ignore[attr-defined]
+        queryset, page_size = paginator.get_keyset_queryset(queryset, self.request)  # type: ignore[attr-defined]
+        return queryset.values_list("pk", self.last_modified_field)[: page_size + 1]
+
+    def get_page_validators(self, rows):
+        """
+        Вычисляет валидаторы страницы по курсору из строк get_page_validator_rows.
+
+        :return: Пара (etag, last_modified) или None для пустой страницы
+        """
+        if not rows:
+            return None
+        request = self.request  # type: ignore[attr-defined]
+        last = max(modified for _, modified in rows)
+        return page_etag(request, request.accepted_media_type, rows), last
+
+    def get_count_validators(self, count, last, generation):
+        """
+        Вычисляет валидаторы постраничного списка из результата get_list_stats и передаёт число строк пагинатору.
+
+        :return: Пара (etag, last_modified) или None для пустого списка
+        """
+        request = self.request  # type: ignore[attr-defined]
+        paginator = self.paginator  # type: ignore[attr-defined]
+        if paginator is not None and hasattr(paginator, "known_count"):
+            paginator.known_count = count
+        if not count:
+            return None
+        return list_etag(request, request.accepted_media_type, count, last, generation), last
+
+    def get_list_validators(self, queryset):
+        """
+        Вычисляет валидаторы списка одним запросом: строки страницы по курсору или агрегат по выборке.
+
+        :param queryset: Отфильтрованный queryset
+        :return: Пара (etag, last_modified) или None для пустого списка
+        """
+        if self.uses_keyset():
+            return self.get_page_validators(list(self.get_page_validator_rows(queryset)))
+        return self.get_count_validators(*self.get_list_stats(queryset))
+
+    def list_response(self, queryset):
+        """
+        Строит обычный (постраничный) ответ со строками queryset — как ListModelMixin.list, но без повторной
+        фильтрации: list() фильтрует queryset один раз для валидаторов и ответа.
+
+        :param queryset: Отфильтрованный queryset
+        :return: Response
+        """
+        page = self.paginate_queryset(queryset)  # type: ignore[attr-defined]
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)  # type: ignore[attr-defined]
+            return self.get_paginated_response(serializer.data)  # type: ignore[attr-defined]
+        return Response(self.get_serializer(queryset, many=True).data)  # type: ignore[attr-defined]
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())  # type: ignore[attr-defined]
+        return self.conditional_response(
+            request, self.get_list_validators(queryset), lambda: self.list_response(queryset)
+        )
+
+
+class ConditionalRetrieveMixin(ConditionalResponseMixin):
+    """
+    Условные ответы для action retrieve по номеру версии и времени изменения объекта.
+    Права на просмотр проверяются в has_permission до вычисления валидаторов.
+    """
+
+    version_field = "version"
+    last_modified_field = "updated_at"
+
+    def get_object_validators(self):
+        """
+        Вычисляет валидаторы объекта запросом только двух колонок по первичному ключу.
+
+        :return: Пара (etag, last_modified) или None, если объект не найден (тогда 404 отдаст retrieve)
+        """
+        request = self.request  # type: ignore[attr-defined]
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field  # type: ignore[attr-defined]
+        row = (
+            self.get_queryset()  # type: ignore[attr-defined]
+            .filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})  # type: ignore[attr-defined]
+            .order_by()
+            .values_list(self.version_field, self.last_modified_field)
+            .first()
+        )
+        if row is None:
+            return None
+        version, last_modified = row
+        return object_etag(request, request.accepted_media_type, version, last_modified), last_modified
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            request,
+            self.get_object_validators(),
+            lambda: super(ConditionalRetrieveMixin, self).retrieve(request, *args, **kwargs),
+        )
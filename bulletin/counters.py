@@ -0,0 +1,71 @@
+# bulletin/counters.py
+"""
+Денормализованные счётчики отзывов объявления: review_count и last_review_at.
+Вместе со счётчиками обновляется updated_at объявления — от него зависят ETag и Last-Modified списка.
+
+Счётчики меняются атомарными UPDATE с F()-выражениями, без чтения строки объявления, поэтому параллельные отзывы
+не теряют инкременты. Возможное расхождение (массовые операции в обход сигналов) исправляет команда
+reconcile_review_counters.
+"""
+
+from django.db.models import Count, F, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest, Now
+from django.utils import timezone
+
+from .models import Bulletin, Review
+
+
+def review_added(bulletin_id, created_at):
+    """
+    Учитывает новый отзыв в счётчиках объявления.
+
+    :param bulletin_id: Идентификатор объявления
+    :param created_at: Время создания отзыва
+    """
+    Bulletin.objects.filter(pk=bulletin_id).update(
+        review_count=F("review_count") + 1,
+        # Coalesce — потому что на SQLite MAX(NULL, x) возвращает NULL
+        last_review_at=Greatest(Coalesce(F("last_review_at"), Value(created_at)), Value(created_at)),
+        updated_at=Now(),
+    )
+
+
+def review_removed(bulletin_id):
+    """
+    Учитывает удаление отзыва: уменьшает счётчик и пересчитывает время последнего отзыва.
+
+    :param bulletin_id: Идентификатор объявления
+    """
+    last_review = Review.objects.filter(bulletin_id=OuterRef("pk")).order_by("-created_at").values("created_at")[:1]
+    Bulletin.objects.filter(pk=bulletin_id, review_count__gt=0).update(
+        review_count=F("review_count") - 1,
+        last_review_at=Subquery(last_review),
+        updated_at=Now(),
+    )
+
+
+def reconcile(bulletin_ids):
+    """
+    Пересчитывает счётчики для пачки объявлений и исправляет расхождения.
+
+    :param bulletin_ids: Идентификаторы объявлений
+    :return: Количество исправленных объявлений
+    """
+    actual = {
+        row["bulletin_id"]: row
+        for row in Review.objects.filter(bulletin_id__in=bulletin_ids)
+        .order_by()
+        .values("bulletin_id")
+        .annotate(total=Count("id"), last=Max("created_at"))
+    }
+    drifted = []
+    now = timezone.now()
+    for bulletin in Bulletin.objects.filter(pk__in=bulletin_ids).only("id", "review_count", "last_review_at"):
+        row = actual.get(bulletin.pk, {"total": 0, "last": None})
+        if bulletin.review_count != row["total"] or bulletin.last_review_at != row["last"]:
+            bulletin.review_count = row["total"]
+            bulletin.last_review_at = row["last"]
+            bulletin.updated_at = now
+            drifted.append(bulletin)
+    Bulletin.objects.bulk_update(drifted, ["review_count", "last_review_at", "updated_at"])
+    return len(drifted)
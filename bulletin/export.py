@@ -0,0 +1,205 @@
+# bulletin/export.py
+"""
+Потоковая выгрузка объявлений и отзывов для аналитики (только администраторам):
+- GET /api/bulletin/bulletins/export/ — все объявления;
+- GET /api/bulletin/bulletins/<id>/reviews/export/ — отзывы объявления.
+
+Формат — NDJSON (по умолчанию, application/x-ndjson) или CSV (?format=csv или Accept: text/csv).
+Строки идут в порядке (created_at, id) и читаются курсором на стороне сервера (QuerySet.iterator / aiterator
+пачками по EXPORT_CHUNK_SIZE), поэтому память не зависит от объёма выгрузки; каждая пачка уходит клиенту
+одним куском.
+
+Инкрементальная выгрузка: ?since=<created_at последней выгруженной строки>&since_id=<её id> — только строки
+после этой позиции (без since_id — созданные строго позже since).
+"""
+
+import csv
+import io
+
+from django.conf import settings
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+import orjson
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import BaseRenderer
+
+from config.renderers import ORJSONRenderer
+
+from .permissions import IsAdmin
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    NDJSON: по объекту JSON на строку. Выгрузка пишет строки сама (см. ExportMixin), рендерер нужен для
+    согласования формата и ответов об ошибках.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return encode_ndjson(list(data), [tuple(data.values())]) if isinstance(data, dict) else b""
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    CSV с заголовком. Как и NDJSONRenderer, для выгрузки только согласует формат и рендерит ответы об ошибках.
+    """
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return encode_csv(list(data), [tuple(data.values())], header=True) if isinstance(data, dict) else b""
+
+
+def encode_ndjson(fields, rows):
+    """
+    Кодирует строки в NDJSON (даты — как в ответах API, ISO 8601 с 'Z' для UTC).
+
+    :param fields: Имена полей
+    :param rows: Кортежи значений
+    :return: bytes
+    """
+    return b"".join(
+        orjson.dumps(dict(zip(fields, row)), default=ORJSONRenderer.encoder.default, option=ORJSONRenderer.options)
+        + b"\n"
+        for row in rows
+    )
+
+
+def format_csv_value(value):
+    """
+    Приводит значение к виду, в котором оно выгружается в JSON (для дат — ISO 8601 с 'Z' для UTC).
+    """
+    if hasattr(value, "isoformat"):
+        value = value.isoformat()
+        return value[:-6] + "Z" if value.endswith("+00:00") else value
+    return value
+
+
+def encode_csv(fields, rows, header=False):
+    """
+    Кодирует строки в CSV.
+
+    :param fields: Имена полей
+    :param rows: Кортежи значений
+    :param header: Добавить строку заголовка
+    :return: bytes
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(fields)
+    writer.writerows([format_csv_value(value) for value in row] for row in rows)
+    return buffer.getvalue().encode()
+
+
+# Формат → (кодировщик пачки строк, заголовок выгрузки)
+ENCODERS = {
+    NDJSONRenderer.format: (encode_ndjson, lambda fields: b""),
+    CSVRenderer.format: (encode_csv, lambda fields: encode_csv(fields, [], header=True)),
+}
+
+
+def stream_rows(queryset, fields, encode, chunk_size, head):
+    """
+    Отдаёт head (заголовок CSV), затем строки queryset пачками по chunk_size, закодированными encode (для WSGI).
+    """
+    if head:
+        yield head
+    batch = []
+    for row in queryset.iterator(chunk_size=chunk_size):
+        batch.append(row)
+        if len(batch) == chunk_size:
+            yield encode(fields, batch)
+            batch = []
+    if batch:
+        yield encode(fields, batch)
+
+
+async def astream_rows(queryset, fields, encode, chunk_size, head):
+    """
+    Асинхронный stream_rows для ASGI: синхронный итератор Django в режиме ASGI собрал бы всю выгрузку в память.
+    """
+    if head:
+        yield head
+    batch = []
+    async for row in queryset.aiterator(chunk_size=chunk_size):
+        batch.append(row)
+        if len(batch) == chunk_size:
+            yield encode(fields, batch)
+            batch = []
+    if batch:
+        yield encode(fields, batch)
+
+
+def filter_since(queryset, request):
+    """
+    Оставляет строки после позиции (since, since_id) из параметров запроса.
+
+    :raises ValidationError: Если since или since_id некорректны
+    """
+    since = request.query_params.get("since")
+    if not since:
+        return queryset
+    try:
+        # None — строка не похожа на дату, ValueError — похожа, но такой даты нет (2024-02-30)
+        created_at = parse_datetime(since)
+    except ValueError:
+        created_at = None
+    if created_at is None:
+        raise ValidationError({"since": "Ожидается дата и время в формате ISO 8601."})
+    if timezone.is_naive(created_at):
+        created_at = timezone.make_aware(created_at)
+    since_id = request.query_params.get("since_id")
+    if since_id is None:
+        return queryset.filter(created_at__gt=created_at)
+    try:
+        since_id = int(since_id)
+    except ValueError:
+        raise ValidationError({"since_id": "Ожидается целое число."})
+    return queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=since_id))
+
+
+class ExportMixin:
+    """
+    Добавляет вьюсету действие export — потоковую выгрузку строк get_export_queryset() с полями export_fields.
+    """
+
+    export_fields: tuple[str, ...]
+    export_name: str
+
+    def get_export_queryset(self):
+        """
+        Строки для выгрузки. По умолчанию — get_queryset() вьюсета.
+        """
+        return self.get_queryset()  # type: ignore[attr-defined]
+
+    @action(
+        detail=False, methods=["get"], permission_classes=[IsAdmin], renderer_classes=[NDJSONRenderer, CSVRenderer]
+    )
+    def export(self, request, *args, **kwargs):
+        """
+        Потоковая выгрузка в NDJSON или CSV (см. bulletin.export).
+        """
+        queryset = filter_since(self.get_export_queryset(), request)
+        # Строки читаются уже после выхода из вьюхи: база (реплика запроса, см. config.db_router) фиксируется здесь
+        queryset = queryset.order_by("created_at", "id").values_list(*self.export_fields)
+        queryset = queryset.using(queryset.db)
+
+        renderer = request.accepted_renderer
+        encode, head = ENCODERS[renderer.format]
+        stream = astream_rows if settings.ASYNC_READ_VIEWS else stream_rows
+        response = StreamingHttpResponse(
+            stream(queryset, self.export_fields, encode, settings.EXPORT_CHUNK_SIZE, head(self.export_fields)),
+            content_type=renderer.media_type + (f"; charset={renderer.charset}" if renderer.charset else ""),
+        )
+        response["Content-Disposition"] = f'attachment; filename="{self.export_name}.{renderer.format}"'
+        return response
@@ -0,0 +1,92 @@
+# bulletin/management/commands/bench_bulk_bulletins.py
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from bulletin.models import Bulletin
+from bulletin.views import BulletinViewSet
+from user.models import User
+
+
+class Command(BaseCommand):
+    """
+    Кастомная команда. Сравнивает пропускную способность загрузки каталога объявлений:
+    - по одному POST /bulletins/ на объявление (BulletinCreateSerializer.create);
+    - POST /bulletins/bulk/ пачками по BULLETIN_BULK_MAX_ITEMS (bulk_create);
+    - PATCH /bulletins/bulk/ — частичное обновление тех же объявлений пачками (bulk_update).
+
+    Вьюсет вызывается напрямую (без HTTP и middleware) от имени первого пользователя; созданные объявления
+    удаляются после замера.
+
+    Пример: python manage.py bench_bulk_bulletins --items 10000
+    """
+
+    help = "Бенчмарк загрузки объявлений: POST по одному против /bulletins/bulk/"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--items", type=int, default=10000, help="Количество объявлений")
+
+    def handle(self, *args, **options):
+        user = User.objects.order_by("id").first()
+        if user is None:
+            raise CommandError("В базе нет пользователей: запустите seed_bulletins")
+
+        factory = APIRequestFactory()
+        count = options["items"]
+        chunk = settings.BULLETIN_BULK_MAX_ITEMS
+        items = [
+            {"title": f"Товар каталога {number}", "price": number, "description": "Загрузка каталога"}
+            for number in range(count)
+        ]
+        created = []
+        try:
+            create = BulletinViewSet.as_view({"post": "create"})
+            elapsed = self.measure(factory, user, create, "post", "/api/bulletin/bulletins/", items, created)
+            self.report("POST по одному", count, elapsed, count)
+
+            bulk = BulletinViewSet.as_view({"post": "bulk", "patch": "bulk"})
+            batches = [items[start : start + chunk] for start in range(0, count, chunk)]
+            elapsed = self.measure(factory, user, bulk, "post", "/api/bulletin/bulletins/bulk/", batches, created)
+            self.report("bulk POST", count, elapsed, len(batches))
+
+            ids = created[count:]
+            batches = [
+                [{"id": pk, "price": number} for number, pk in enumerate(ids[start : start + chunk])]
+                for start in range(0, count, chunk)
+            ]
+            elapsed = self.measure(factory, user, bulk, "patch", "/api/bulletin/bulletins/bulk/", batches, [])
+            self.report("bulk PATCH", count, elapsed, len(batches))
+        finally:
+            Bulletin.objects.filter(pk__in=created).delete()
+
+    @staticmethod
+    def measure(factory, user, view, method, url, payloads, created):
+        """
+        Отправляет запросы с телами payloads и добавляет id созданных объявлений в created.
+
+        :return: Общее время, секунды
+        """
+        started = time.perf_counter()
+        for payload in payloads:
+            request = getattr(factory, method)(url, payload, format="json")
+            force_authenticate(request, user)
+            response = view(request)
+            if response.status_code not in (200, 201):
+                raise CommandError(f"Неожиданный ответ {response.status_code}: {response.data}")
+            if "results" in response.data:
+                created.extend(result["id"] for result in response.data["results"])
+            else:
+                created.append(response.data["id"])
+        return time.perf_counter() - started
+
+    def report(self, name, count, elapsed, requests):
+        """
+        Печатает итог замера.
+        """
+        self.stdout.write(
+            f"{name:>15}: {count} объявлений за {elapsed:7.2f} с | {count / elapsed:8.0f} объявлений/с | "
+            f"запросов: {requests}"
+        )
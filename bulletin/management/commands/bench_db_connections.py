@@ -0,0 +1,102 @@
+# bulletin/management/commands/bench_db_connections.py
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.signals import request_finished, request_started
+from django.db import connection
+
+from bulletin.models import Bulletin
+
+POOL_OPTIONS = {"min_size": 1, "max_size": 4, "timeout": 10}
+
+# Варианты подключения: изменения settings_dict подключения default
+VARIANTS = {
+    # Как было: CONN_MAX_AGE = 0 — новое подключение на каждый запрос
+    "per-request": {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": False, "OPTIONS": {}},
+    # Постоянное подключение потока с проверкой перед запросом
+    "persistent": {"CONN_MAX_AGE": 60, "CONN_HEALTH_CHECKS": True, "OPTIONS": {}},
+    # Пул psycopg 3: подключение возвращается в пул в конце запроса
+    "pool": {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": True, "OPTIONS": {"pool": POOL_OPTIONS}},
+}
+
+
+class Command(BaseCommand):
+    """
+    Кастомная команда. Измеряет цену подключения к PostgreSQL в запросе: цикл «начало запроса — короткий запрос
+    к базе — конец запроса» (сигналы request_started/request_finished, как в обработчике Django) для вариантов:
+    - per-request — подключение открывается и закрывается в каждом запросе (CONN_MAX_AGE = 0);
+    - persistent — постоянное подключение с проверкой (CONN_MAX_AGE + CONN_HEALTH_CHECKS);
+    - pool — пул подключений psycopg 3 (DATABASES["default"]["OPTIONS"]["pool"]).
+
+    Для каждого варианта печатает среднее и p50/p99 времени запроса и число подключений к серверу
+    (разных backend_pid). Нужна база PostgreSQL из настроек.
+
+    Пример: python manage.py bench_db_connections --requests 2000
+    """
+
+    help = "Бенчмарк подключений к PostgreSQL: подключение на запрос, постоянное подключение и пул"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=1000, help="Количество запросов на вариант")
+        parser.add_argument("--variants", nargs="+", choices=list(VARIANTS), default=list(VARIANTS))
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Бенчмарк требует базу PostgreSQL")
+        bulletin_id = Bulletin.objects.order_by("-id").values_list("id", flat=True).first()
+        if bulletin_id is None:
+            raise CommandError("В базе нет объявлений: запустите seed_bulletins")
+
+        original = {key: connection.settings_dict.get(key) for key in ("CONN_MAX_AGE", "CONN_HEALTH_CHECKS")}
+        original["OPTIONS"] = connection.settings_dict["OPTIONS"]
+        self.stdout.write(f"{options['requests']} запросов на вариант, база {settings.DATABASES['default']['NAME']}")
+        results = {}
+        try:
+            for variant in options["variants"]:
+                self.configure(VARIANTS[variant])
+                self.measure(bulletin_id, min(options["requests"], 50))  # прогрев
+                timings, backends = self.measure(bulletin_id, options["requests"])
+                results[variant] = statistics.mean(timings)
+                quantiles = statistics.quantiles(timings, n=100)
+                self.stdout.write(
+                    f"{variant:>12}: среднее {results[variant]:7.3f} мс | p50 {quantiles[49]:7.3f} мс | "
+                    f"p99 {quantiles[98]:7.3f} мс | подключений к серверу {backends}"
+                )
+        finally:
+            self.configure(original)
+
+        baseline = results.get("per-request")
+        for variant in [variant for variant in results if baseline and variant != "per-request"]:
+            self.stdout.write(
+                f"{variant}: экономия на запросе {baseline - results[variant]:.3f} мс "
+                f"({baseline / results[variant]:.1f}×)"
+            )
+
+    @staticmethod
+    def configure(changes):
+        """
+        Закрывает подключение и пул и применяет новые параметры подключения default.
+        """
+        connection.close()
+        connection.close_pool()
+        connection.settings_dict.update(changes)
+
+    @staticmethod
+    def measure(bulletin_id, requests):
+        """
+        Выполняет requests циклов запроса.
+
+        :return: Кортеж (время каждого цикла в мс, число разных подключений к серверу)
+        """
+        timings = []
+        backends = set()
+        for _ in range(requests):
+            started = time.perf_counter()
+            request_started.send(sender=Command)
+            Bulletin.objects.filter(pk=bulletin_id).values_list("version", flat=True).get()
+            backends.add(connection.connection.info.backend_pid)
+            request_finished.send(sender=Command)
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings, len(backends)
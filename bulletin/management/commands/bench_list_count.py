@@ -0,0 +1,54 @@
+# bulletin/management/commands/bench_list_count.py
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from rest_framework.test import APIRequestFactory
+
+from bulletin.views import BulletinViewSet
+
+# Порог APPROXIMATE_COUNT_THRESHOLD для вариантов: 0 — точный COUNT(*), 1 — оценка для любой таблицы
+VARIANTS = {"exact": 0, "approximate": 1}
+
+
+class Command(BaseCommand):
+    """
+    Кастомная команда. Сравнивает время первой страницы списка объявлений (GET /bulletins/ без фильтров)
+    с точным COUNT(*) и с приблизительным числом строк (см. bulletin.paginators.ApproximateCountPaginationMixin).
+
+    Вьюсет вызывается напрямую от имени анонима, кэш списка анонимов выключен. На PostgreSQL оценка берётся
+    из pg_class.reltuples, на других базах — из кэша (первый, прогревочный запрос считает её точно).
+
+    Перед запуском наполните базу: python manage.py seed_bulletins --bulletins 1000000
+    """
+
+    help = "Бенчмарк списка объявлений: точное число строк против приблизительного"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=20, help="Количество запросов на вариант")
+
+    def handle(self, *args, **options):
+        # Ссылки next/previous строятся по Host запроса: берём разрешённый хост
+        factory = APIRequestFactory(SERVER_NAME=settings.ALLOWED_HOSTS[0] if settings.ALLOWED_HOSTS else "localhost")
+        view = BulletinViewSet.as_view({"get": "list"})
+        original = settings.APPROXIMATE_COUNT_THRESHOLD, settings.BULLETIN_LIST_CACHE_TIMEOUT
+        settings.BULLETIN_LIST_CACHE_TIMEOUT = 0
+        self.stdout.write(f"База: {connection.vendor}, запросов на вариант: {options['repeat']}")
+        try:
+            for name, threshold in VARIANTS.items():
+                settings.APPROXIMATE_COUNT_THRESHOLD = threshold
+                response = view(factory.get("/api/bulletin/bulletins/"))  # прогрев
+                timings = []
+                for _ in range(options["repeat"]):
+                    started = time.perf_counter()
+                    view(factory.get("/api/bulletin/bulletins/")).render()
+                    timings.append((time.perf_counter() - started) * 1000)
+                self.stdout.write(
+                    f"{name:>12}: медиана {statistics.median(timings):8.2f} мс | max {max(timings):8.2f} мс | "
+                    f"count={response.data['count']} (приблизительно: {response.data['count_is_approximate']})"
+                )
+        finally:
+            settings.APPROXIMATE_COUNT_THRESHOLD, settings.BULLETIN_LIST_CACHE_TIMEOUT = original
@@ -0,0 +1,62 @@
+# bulletin/management/commands/bench_list_fast_path.py
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from bulletin.models import Bulletin
+from bulletin.serializers import BulletinListSerializer, ValuesRowSerializer
+from config.renderers import ORJSONRenderer
+
+
+class Command(BaseCommand):
+    """
+    Кастомная команда. Сравнивает стоимость одной строки ленты объявлений при сериализации через
+    BulletinListSerializer (модели + поля сериализатора) и через быстрый путь .values() + ValuesRowSerializer.
+    В замер входят выборка из базы, сериализация и рендеринг JSON.
+
+    Перед запуском наполните базу: python manage.py seed_bulletins --bulletins 100000
+    """
+
+    help = "Бенчмарк списка объявлений: сериализатор против .values()"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1_000], help="Размеры страницы")
+        parser.add_argument("--repeat", type=int, default=20, help="Количество повторов на замер")
+
+    def handle(self, *args, **options):
+        queryset = Bulletin.objects.defer("search_vector").order_by("-created_at", "-id")
+        fast = ValuesRowSerializer(BulletinListSerializer)
+        renderer = ORJSONRenderer()
+        self.stdout.write(f"Объявлений в базе: {Bulletin.objects.count()}")
+
+        for size in options["sizes"]:
+
+            def serializer_path():
+                return renderer.render(BulletinListSerializer(queryset[:size], many=True).data)
+
+            def values_path():
+                return renderer.render(fast.to_representation(queryset.values(*fast.field_names)[:size]))
+
+            if serializer_path() != values_path():
+                self.stderr.write(self.style.ERROR(f"page_size={size}: ответы различаются"))
+                return
+
+            serializer_us = self.measure(serializer_path, options["repeat"]) / size
+            values_us = self.measure(values_path, options["repeat"]) / size
+            self.stdout.write(
+                f"page_size={size:>5}: serializer {serializer_us:8.2f} мкс/строка | "
+                f"values {values_us:8.2f} мкс/строка | x{serializer_us / values_us:.1f}"
+            )
+
+    @staticmethod
+    def measure(func, repeat):
+        """
+        Возвращает медианное время (мкс) вызова func.
+        """
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1_000_000)
+        return statistics.median(timings)
@@ -0,0 +1,106 @@
+# bulletin/management/commands/bench_notification_payloads.py
+import pickle
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from kombu.serialization import dumps
+
+from bulletin.models import Bulletin, Review
+
+EMBED = {"callbacks": None, "errbacks": None, "chain": None, "chord": None}
+
+
+class Command(BaseCommand):
+    """
+    Кастомная команда. Сравнивает полный и облегчённый контракт уведомления об отзыве:
+    - полный: веб-запрос загружает владельца объявления и передаёт email-ы, название и текст отзыва;
+    - облегчённый: передаётся только review_id, данные загружаются на воркере пачками.
+
+    Выводит размер тела сообщения Celery (JSON) и записи журнала в кэше (pickle), суммарный объём для N отзывов
+    и задержку постановки уведомления (p50/p99) при параллельной нагрузке из нескольких потоков.
+
+    Перед запуском наполните базу: python manage.py seed_bulletins --bulletins 10000 --reviews 10000
+    """
+
+    help = "Бенчмарк контракта уведомлений: полные данные против review_id"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reviews", type=int, default=10_000, help="Количество отзывов")
+        parser.add_argument("--threads", type=int, default=8, help="Количество параллельных потоков")
+        parser.add_argument("--text-length", type=int, default=500, help="Длина текста отзыва (0 — как в базе)")
+
+    def handle(self, *args, **options):
+        reviews = list(Review.objects.select_related("author").only("id", "text", "bulletin_id", "author__email"))
+        reviews = reviews[: options["reviews"]]
+        if not reviews:
+            raise CommandError("В базе нет отзывов: запустите seed_bulletins --reviews N")
+        if options["text_length"]:
+            for review in reviews:
+                review.text = (review.text * (options["text_length"] // len(review.text) + 1))[
+                    : options["text_length"]
+                ]
+
+        sample = self.full_payload(reviews[0])
+        rows = [
+            ("полный", self.full_payload, lambda payload: payload),
+            ("review_id", lambda review: {"review_id": review.pk}, lambda payload: payload["review_id"]),
+        ]
+        self.stdout.write(
+            f"Отзывов: {len(reviews)}, потоков: {options['threads']}, текст: {len(sample['review_text'])}"
+        )
+        for name, build, journal_item in rows:
+            payloads = [build(review) for review in reviews]
+            message_bytes = sum(len(dumps(((), payload, EMBED), serializer="json")[2]) for payload in payloads)
+            journal_bytes = sum(
+                len(pickle.dumps(journal_item(payload), pickle.HIGHEST_PROTOCOL)) for payload in payloads
+            )
+            p50, p99 = self.measure_enqueue(reviews, build, journal_item, options["threads"])
+            self.stdout.write(
+                f"{name:>10}: сообщение Celery {message_bytes / len(reviews):7.0f} Б "
+                f"(всего {message_bytes / 1024:8.0f} КиБ) | журнал {journal_bytes / len(reviews):6.0f} Б "
+                f"(всего {journal_bytes / 1024:7.0f} КиБ) | постановка p50 {p50:7.1f} мкс, p99 {p99:7.1f} мкс"
+            )
+
+    @staticmethod
+    def full_payload(review):
+        """
+        Полный контракт: веб-запрос загружает объявление с владельцем, как прежний perform_create.
+        """
+        bulletin = (
+            Bulletin.objects.select_related("author").only("id", "title", "author__email").get(pk=review.bulletin_id)
+        )
+        return {
+            "email": bulletin.author.email,
+            "bulletin_id": bulletin.id,
+            "bulletin_title": bulletin.title,
+            "bulletin_author": bulletin.author.email,
+            "review_author": review.author.email,
+            "review_text": review.text,
+        }
+
+    def measure_enqueue(self, reviews, build, journal_item, threads):
+        """
+        Возвращает p50 и p99 (мкс) постановки уведомления: сборка данных + запись в кэш.
+        """
+
+        def enqueue(chunk):
+            timings = []
+            for number, review in chunk:
+                started = time.perf_counter()
+                cache.set(f"bench:notify:{number}", journal_item(build(review)), 60)
+                timings.append((time.perf_counter() - started) * 1_000_000)
+            connection.close()
+            return timings
+
+        numbered = list(enumerate(reviews))
+        chunks = [numbered[index::threads] for index in range(threads)]
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            timings = [timing for chunk_timings in pool.map(enqueue, chunks) for timing in chunk_timings]
+        cache.delete_many([f"bench:notify:{number}" for number in range(len(reviews))])
+        quantiles = statistics.quantiles(timings, n=100)
+        return quantiles[49], quantiles[98]
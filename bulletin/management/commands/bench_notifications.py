@@ -0,0 +1,95 @@
+# bulletin/management/commands/bench_notifications.py
+import random
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from bulletin import notifications
+from bulletin.models import Review
+from bulletin.utils import send_review_notification_email
+from config.smtp_sink import SMTPSink
+
+
+class Command(BaseCommand):
+    """
+    Кастомная команда. Сравнивает пропускную способность уведомлений об отзывах:
+    - по письму и SMTP-соединению на отзыв (send_review_notification_email, как раньше);
+    - журнал в кэше + дайджесты через одно соединение (bulletin.notifications).
+
+    Письма уходят в локальную SMTP-заглушку; задержка подключения имитирует TLS-рукопожатие.
+    Старый путь замеряется на выборке отзывов и пересчитывается на отзывы в минуту.
+
+    Перед запуском наполните базу: python manage.py seed_bulletins --bulletins 10000 --reviews 10000
+    """
+
+    help = "Бенчмарк уведомлений: письмо на отзыв против дайджестов"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reviews", type=int, default=10_000, help="Количество отзывов (за минуту)")
+        parser.add_argument("--connect-latency-ms", type=float, default=50, help="Задержка подключения к SMTP")
+        parser.add_argument("--legacy-sample", type=int, default=100, help="Отзывов для замера старого пути")
+
+    def handle(self, *args, **options):
+        review_ids = list(Review.objects.values_list("id", flat=True)[: options["reviews"]])
+        if len(review_ids) < options["reviews"]:
+            raise CommandError(
+                f"В базе {len(review_ids)} отзывов, нужно {options['reviews']}: запустите seed_bulletins"
+            )
+        random.shuffle(review_ids)
+
+        with SMTPSink(connect_latency=options["connect_latency_ms"] / 1000) as sink:
+            with override_settings(**sink.email_settings(), NOTIFICATION_MAX_EMAILS_PER_HOUR=len(review_ids)):
+                self.bench_legacy(sink, review_ids[: options["legacy_sample"]])
+                self.bench_digest(sink, review_ids)
+
+    def bench_legacy(self, sink, review_ids):
+        """
+        Одно письмо и одно соединение на отзыв; данные письма, как раньше, загружаются запросом на отзыв.
+        """
+        sample = len(review_ids)
+        started = time.perf_counter()
+        for review_id in review_ids:
+            review = Review.objects.select_related("author", "bulletin__author").get(pk=review_id)
+            bulletin = review.bulletin
+            send_review_notification_email(
+                bulletin.author.email,
+                bulletin.id,
+                bulletin.title,
+                bulletin.author.email,
+                review.author.email,
+                review.text,
+            )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"письмо на отзыв: {sample / elapsed * 60:10.0f} отзывов/мин | "
+            f"соединений {sink.connections}, писем {sink.messages} на {sample} отзывов"
+        )
+
+    def bench_digest(self, sink, review_ids):
+        """
+        Журнал в кэше и сброс дайджестами.
+        """
+        reviews = len(review_ids)
+        journal = notifications.journal
+        cache.delete_many([journal.seq_key, journal.cursor_key, journal.gap_key])
+        connections, messages = sink.connections, sink.messages
+
+        started = time.perf_counter()
+        for review_id in review_ids:
+            notifications.enqueue_review_notification(review_id)
+        enqueue_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        notifications.flush(batch_size=1000)
+        flush_elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            f"дайджесты:       {reviews / flush_elapsed * 60:10.0f} отзывов/мин | "
+            f"соединений {sink.connections - connections}, писем {sink.messages - messages} на {reviews} отзывов"
+        )
+        self.stdout.write(
+            f"сброс {reviews} отзывов: {flush_elapsed * 1000:.0f} мс, "
+            f"постановка в журнал: {enqueue_ms / reviews * 1000:.1f} мкс/отзыв"
+        )
@@ -0,0 +1,70 @@
+# bulletin/management/commands/bench_pagination.py
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from bulletin.models import Bulletin
+from bulletin.paginators import BulletinPagination, encode_cursor
+
+
+class Command(BaseCommand):
+    """
+    Кастомная команда. Сравнивает время получения страницы ленты объявлений в режиме номеров страниц
+    (COUNT(*) + OFFSET) и в режиме курсора (keyset по (created_at, id)).
+
+    Перед запуском наполните базу: python manage.py seed_bulletins --bulletins 1000000
+    """
+
+    help = "Бенчмарк пагинации: номер страницы против курсора"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pages", type=int, nargs="+", default=[1, 1_000, 100_000], help="Номера страниц")
+        parser.add_argument("--page-size", type=int, default=10, help="Размер страницы")
+        parser.add_argument("--repeat", type=int, default=5, help="Количество повторов на замер")
+
+    def handle(self, *args, **options):
+        factory = APIRequestFactory()
+        queryset = Bulletin.objects.all().order_by("-created_at", "-id")
+        page_size = options["page_size"]
+        self.stdout.write(f"Объявлений в базе: {Bulletin.objects.count()}, page_size={page_size}")
+
+        for page in options["pages"]:
+            page_params = {"page": page, "page_size": page_size}
+            offset_ms = self.measure(factory, queryset, page_params, options["repeat"])
+
+            # Курсор для глубокой страницы вычисляется заранее и в замер не входит
+            cursor_params = {"cursor": "", "page_size": page_size}
+            if page > 1:
+                position = queryset.values_list("created_at", "id")[
+                    (page - 1) * page_size - 1 : (page - 1) * page_size
+                ]
+                position = list(position)
+                cursor_params["cursor"] = encode_cursor(*position[0]) if position else ""
+            keyset_ms = self.measure(factory, queryset, cursor_params, options["repeat"])
+
+            self.stdout.write(f"page={page:>7}: offset {self.format(offset_ms)} | keyset {self.format(keyset_ms)}")
+
+    def measure(self, factory, queryset, params, repeat):
+        """
+        Возвращает медианное время (мс) получения страницы или None, если страницы нет.
+        """
+        timings = []
+        for _ in range(repeat):
+            request = Request(factory.get("/api/bulletin/bulletins/", params))
+            paginator = BulletinPagination()
+            started = time.perf_counter()
+            try:
+                paginator.paginate_queryset(queryset, request)
+            except NotFound:
+                return None
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
+
+    @staticmethod
+    def format(value):
+        return "n/a" if value is None else f"{value:8.2f} ms"
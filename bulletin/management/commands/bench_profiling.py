@@ -0,0 +1,56 @@
+# bulletin/management/commands/bench_profiling.py
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from config import profiling
+
+MIDDLEWARE = "config.profiling.ProfilingMiddleware"
+
+
+class Command(BaseCommand):
+    """
+    Кастомная команда. Цена профилирования запросов (см. config.profiling): медиана времени GET списка
+    объявлений через весь стек Django (middleware, вьюсет, рендеринг) без ProfilingMiddleware — как при
+    PROFILING=False, когда от профилирования остаются только проверки ContextVar в ProfilingMixin, — и с ним.
+    Отдельно — цена одной такой проверки (measure() без профиля). Кэш списка анонимов выключен.
+
+    Перед запуском наполните базу: python manage.py seed_bulletins --bulletins 10000
+    """
+
+    help = "Бенчмарк накладных расходов профилирования запросов"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500, help="Количество запросов на вариант")
+
+    def handle(self, *args, **options):
+        url = reverse("bulletin:bulletins-list")
+        server_name = settings.ALLOWED_HOSTS[0] if settings.ALLOWED_HOSTS else "localhost"
+        middleware = [name for name in settings.MIDDLEWARE if name != MIDDLEWARE]
+        variants = (("выключено", middleware), ("включено", [MIDDLEWARE, *middleware]))
+        with override_settings(BULLETIN_LIST_CACHE_TIMEOUT=0):
+            for label, chain in variants:
+                with override_settings(MIDDLEWARE=chain):
+                    client = Client(SERVER_NAME=server_name)
+                    client.get(url)  # прогрев
+                    timings = []
+                    for _ in range(options["requests"]):
+                        started = time.perf_counter()
+                        response = client.get(url)
+                        timings.append((time.perf_counter() - started) * 1_000_000)
+                self.stdout.write(
+                    f"{label:>10}: медиана {statistics.median(timings):8.1f} мкс/запрос | "
+                    f"Server-Timing: {response.get('Server-Timing', '—')}"
+                )
+
+        calls = 1_000_000
+        started = time.perf_counter()
+        for _ in range(calls):
+            with profiling.measure("serializer"):
+                pass
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"measure() без профиля: {elapsed / calls * 1_000_000_000:.0f} нс на стадию")
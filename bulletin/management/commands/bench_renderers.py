@@ -0,0 +1,54 @@
+# bulletin/management/commands/bench_renderers.py
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from rest_framework.renderers import JSONRenderer
+
+from bulletin.models import Bulletin
+from bulletin.serializers import BulletinListSerializer
+from config.renderers import ORJSONRenderer
+
+
+class Command(BaseCommand):
+    """
+    Кастомная команда. Сравнивает время рендеринга N строк BulletinListSerializer стандартным JSONRenderer DRF
+    и ORJSONRenderer. Объекты создаются в памяти, база не нужна.
+    """
+
+    help = "Бенчмарк JSON-рендереров на строках BulletinListSerializer"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10_000, help="Количество строк")
+        parser.add_argument("--repeat", type=int, default=10, help="Количество повторов")
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        bulletins = [
+            Bulletin(
+                id=i,
+                title=f"Велосипед Trek FX 3 #{i}",
+                price=10_000 + i,
+                created_at=now - timedelta(minutes=i),
+                review_count=i % 7,
+                last_review_at=now if i % 2 else None,
+            )
+            for i in range(options["rows"])
+        ]
+        data = BulletinListSerializer(bulletins, many=True).data
+
+        results = {}
+        for renderer in (JSONRenderer(), ORJSONRenderer()):
+            timings = []
+            for _ in range(options["repeat"]):
+                started = time.perf_counter()
+                content = renderer.render(data, "application/json")
+                timings.append((time.perf_counter() - started) * 1000)
+            results[type(renderer).__name__] = content
+            self.stdout.write(f"{type(renderer).__name__:>15}: {statistics.median(timings):8.2f} ms")
+
+        same = results["JSONRenderer"] == results["ORJSONRenderer"]
+        self.stdout.write(f"Вывод совпадает побайтно: {'да' if same else 'нет'}")
@@ -0,0 +1,54 @@
+# bulletin/management/commands/bench_search.py
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from rest_framework.filters import SearchFilter
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from bulletin.models import Bulletin
+from bulletin.search import BulletinFullTextSearchFilter
+from bulletin.views import BulletinViewSet
+
+
+class Command(BaseCommand):
+    """
+    Кастомная команда. Сравнивает поиск по вхождению (SearchFilter, ILIKE '%term%') с полнотекстовым поиском
+    (?q=, tsvector + GIN, триграммы как запасной вариант) на первой странице выдачи.
+
+    Перед запуском наполните базу: python manage.py seed_bulletins --bulletins 1000000
+    """
+
+    help = "Бенчмарк поиска: ILIKE против полнотекстового поиска"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--terms",
+            nargs="+",
+            default=["велосипед", "iphone", "царапины", "гитарра"],
+            help="Поисковые запросы (последний по умолчанию — с опечаткой)",
+        )
+        parser.add_argument("--page-size", type=int, default=10, help="Размер страницы")
+        parser.add_argument("--repeat", type=int, default=5, help="Количество повторов на замер")
+
+    def handle(self, *args, **options):
+        factory = APIRequestFactory()
+        view = BulletinViewSet()
+        queryset = BulletinViewSet.queryset
+        page_size = options["page_size"]
+        self.stdout.write(f"Объявлений в базе: {Bulletin.objects.count()}, page_size={page_size}")
+
+        backends = [("ilike", SearchFilter(), "search"), ("fts", BulletinFullTextSearchFilter(), "q")]
+        for term in options["terms"]:
+            results = []
+            for name, backend, param in backends:
+                request = Request(factory.get("/api/bulletin/bulletins/", {param: term}))
+                timings, found = [], 0
+                for _ in range(options["repeat"]):
+                    started = time.perf_counter()
+                    found = len(list(backend.filter_queryset(request, queryset, view)[:page_size]))
+                    timings.append((time.perf_counter() - started) * 1000)
+                results.append(f"{name} {statistics.median(timings):8.2f} ms ({found} шт.)")
+            self.stdout.write(f"{term:>15}: " + " | ".join(results))
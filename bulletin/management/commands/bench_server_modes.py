@@ -0,0 +1,193 @@
+# bulletin/management/commands/bench_server_modes.py
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from urllib.request import urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+
+from rest_framework_simplejwt.tokens import AccessToken
+
+from bulletin.models import Bulletin
+from user.models import User
+
+SERVER_COMMANDS = {
+    # Как в entrypoint-web.sh: Gunicorn с синхронными воркерами против uvicorn
+    "wsgi": ["-m", "gunicorn", "config.wsgi:application", "--bind", "127.0.0.1:{port}", "--workers", "{workers}"],
+    "asgi": [
+        "-m",
+        "uvicorn",
+        "config.asgi:application",
+        "--host",
+        "127.0.0.1",
+        "--port",
+        "{port}",
+        "--workers",
+        "{workers}",
+        "--no-access-log",
+    ],
+}
+
+
+class Command(BaseCommand):
+    """
+    Кастомная команда. Нагрузочный тест: сравнивает запросы в секунду и хвостовые задержки (p50/p99) сервера
+    в режимах WSGI (Gunicorn, sync-воркеры) и ASGI (uvicorn, асинхронные вьюхи чтения, см. bulletin.async_views)
+    при большом числе одновременных keep-alive соединений.
+
+    Сервер запускается подпроцессом с текущими настройками Django (DJANGO_SETTINGS_MODULE и окружение
+    наследуются), клиент — асинхронный HTTP/1.1 в этом процессе: каждое соединение шлёт запросы по кругу и
+    переподключается, если сервер закрыл соединение (sync-воркеры Gunicorn не держат keep-alive).
+
+    По умолчанию запросы идут с JWT первого пользователя (список и карточка строятся из базы),
+    с --anonymous — без него (список отдаётся из кэша анонимов).
+
+    Пример: python manage.py bench_server_modes --connections 1000 --duration 20 --workers 4
+    """
+
+    help = "Нагрузочный тест: WSGI (Gunicorn) против ASGI (uvicorn) на keep-alive соединениях"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--modes", nargs="+", choices=list(SERVER_COMMANDS), default=list(SERVER_COMMANDS))
+        parser.add_argument("--connections", type=int, default=1000, help="Одновременных соединений")
+        parser.add_argument("--duration", type=float, default=15, help="Длительность замера, секунды")
+        parser.add_argument("--workers", type=int, default=1, help="Воркеров сервера")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--path",
+            action="append",
+            help="Адрес запроса (можно несколько, соединения чередуют их); по умолчанию — список и карточка",
+        )
+        parser.add_argument(
+            "--anonymous", action="store_true", help="Запросы без JWT (список анонимам отдаётся из кэша)"
+        )
+
+    def handle(self, *args, **options):
+        paths = options["path"] or self.default_paths()
+        headers = ""
+        if not options["anonymous"]:
+            user = User.objects.order_by("id").first()
+            if user is None:
+                raise CommandError("В базе нет пользователей: запустите seed_bulletins")
+            headers = f"Authorization: Bearer {AccessToken.for_user(user)}\r\n"
+
+        self.stdout.write(
+            f"{options['connections']} соединений, {options['duration']:.0f} с, воркеров: {options['workers']}, "
+            f"адреса: {', '.join(paths)}"
+        )
+        for mode in options["modes"]:
+            server = self.start_server(mode, options["port"], options["workers"])
+            try:
+                stats = asyncio.run(
+                    self.load(options["port"], paths, headers, options["connections"], options["duration"])
+                )
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+            self.report(mode, stats, options["duration"])
+
+    @staticmethod
+    def default_paths():
+        """
+        Список объявлений и карточка последнего объявления.
+        """
+        bulletin_id = Bulletin.objects.order_by("-id").values_list("id", flat=True).first()
+        if bulletin_id is None:
+            raise CommandError("В базе нет объявлений: запустите seed_bulletins")
+        return ["/api/bulletin/bulletins/?page_size=10", f"/api/bulletin/bulletins/{bulletin_id}/"]
+
+    def start_server(self, mode, port, workers):
+        """
+        Запускает сервер и ждёт ответа /healthz.
+
+        :return: Popen
+        """
+        with socket.socket() as probe:
+            if probe.connect_ex(("127.0.0.1", port)) == 0:
+                raise CommandError(f"Порт {port} занят")
+
+        command = [sys.executable] + [part.format(port=port, workers=workers) for part in SERVER_COMMANDS[mode]]
+        env = {**os.environ, "SERVER_MODE": mode, "PYTHONPATH": os.pathsep.join(sys.path)}
+        server = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f"Сервер {mode} не запустился: {server.stderr.read().decode()[-2000:]}")
+            try:
+                with urlopen(f"http://localhost:{port}/healthz", timeout=1) as response:
+                    if response.status == 200:
+                        return server
+            except OSError:
+                time.sleep(0.2)
+        server.kill()
+        raise CommandError(f"Сервер {mode} не ответил на /healthz за 30 с")
+
+    async def load(self, port, paths, headers, connections, duration):
+        """
+        Держит connections соединений и шлёт запросы до истечения duration.
+
+        :return: Словарь с задержками (мс), числом ответов по статусам, ошибок и переподключений
+        """
+        stats = {"latencies": [], "statuses": {}, "errors": 0, "connects": 0}
+        deadline = time.monotonic() + duration
+        requests = [
+            f"GET {path} HTTP/1.1\r\nHost: localhost\r\nAccept: application/json\r\n{headers}\r\n".encode()
+            for path in paths
+        ]
+        await asyncio.gather(
+            *(self.client(port, requests[number % len(requests)], deadline, stats) for number in range(connections))
+        )
+        return stats
+
+    @staticmethod
+    async def client(port, request, deadline, stats):
+        """
+        Одно keep-alive соединение: запрос, чтение ответа по Content-Length, повтор; переподключение при закрытии.
+        """
+        reader = writer = None
+        while time.monotonic() < deadline:
+            try:
+                if writer is None:
+                    reader, writer = await asyncio.open_connection("127.0.0.1", port, limit=2**20)
+                    stats["connects"] += 1
+                started = time.perf_counter()
+                writer.write(request)
+                head = await reader.readuntil(b"\r\n\r\n")
+                lines = head.decode("latin-1").split("\r\n")
+                response_headers = dict(
+                    (name.lower(), value.strip()) for name, _, value in (line.partition(":") for line in lines[1:])
+                )
+                await reader.readexactly(int(response_headers.get("content-length", 0)))
+                stats["latencies"].append((time.perf_counter() - started) * 1000)
+                status = lines[0].split(" ", 2)[1]
+                stats["statuses"][status] = stats["statuses"].get(status, 0) + 1
+                if response_headers.get("connection", "").lower() == "close":
+                    writer.close()
+                    reader = writer = None
+            except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+                stats["errors"] += 1
+                if writer is not None:
+                    writer.close()
+                reader = writer = None
+                await asyncio.sleep(0.01)
+        if writer is not None:
+            writer.close()
+
+    def report(self, mode, stats, duration):
+        """
+        Печатает итог по режиму.
+        """
+        latencies = stats["latencies"]
+        if len(latencies) < 2:
+            self.stdout.write(f"{mode}: нет ответов (ошибок: {stats['errors']})")
+            return
+        quantiles = statistics.quantiles(latencies, n=100)
+        self.stdout.write(
+            f"{mode}: {len(latencies) / duration:8.0f} запросов/с | p50 {quantiles[49]:8.1f} мс | "
+            f"p99 {quantiles[98]:8.1f} мс | статусы {stats['statuses']} | ошибок {stats['errors']} | "
+            f"подключений {stats['connects']}"
+        )
@@ -0,0 +1,31 @@
+# bulletin/management/commands/check_query_plans.py
+from django.core.management.base import BaseCommand, CommandError
+
+from bulletin.query_plans import QueryPlanError, check_query_plans
+
+
+class Command(BaseCommand):
+    """
+    Кастомная команда. Прогоняет EXPLAIN для выборок BulletinViewSet и ReviewViewSet на рабочей базе и завершается
+    с ошибкой, если какая-то из них читает всю таблицу с сортировкой.
+
+    Для осмысленной проверки база должна быть наполнена: python manage.py seed_bulletins --bulletins 1000000
+    """
+
+    help = "Проверяет, что выборки вьюсетов используют индексы"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--page-size", type=int, default=10, help="Размер страницы (LIMIT)")
+        parser.add_argument("--database", default="default", help="Алиас базы данных")
+        parser.add_argument("--verbose-plans", action="store_true", help="Выводить планы всех выборок")
+
+    def handle(self, *args, **options):
+        try:
+            plans = check_query_plans(page_size=options["page_size"], using=options["database"])
+        except QueryPlanError as error:
+            raise CommandError(str(error))
+
+        for name, plan in plans.items():
+            self.stdout.write(self.style.SUCCESS(f"OK {name}"))
+            if options["verbose_plans"]:
+                self.stdout.write(plan)
@@ -0,0 +1,36 @@
+# bulletin/management/commands/reconcile_review_counters.py
+from django.core.management.base import BaseCommand
+
+from bulletin.cache import bump_list_generation
+from bulletin.counters import reconcile
+from bulletin.models import Bulletin
+
+
+class Command(BaseCommand):
+    """
+    Кастомная команда. Сверяет денормализованные счётчики отзывов (review_count, last_review_at) с таблицей отзывов
+    и исправляет расхождения. Объявления обрабатываются пачками по возрастанию id, чтобы не держать долгих
+    транзакций и блокировок на большой таблице.
+    """
+
+    help = "Исправляет расхождения в счётчиках отзывов объявлений"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Количество объявлений в пачке")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        last_id, checked, fixed = 0, 0, 0
+        while True:
+            ids = list(
+                Bulletin.objects.filter(pk__gt=last_id).order_by("pk").values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            fixed += reconcile(ids)
+            checked += len(ids)
+            last_id = ids[-1]
+
+        if fixed:
+            bump_list_generation()
+        self.stdout.write(self.style.SUCCESS(f"Проверено объявлений: {checked}, исправлено: {fixed}"))
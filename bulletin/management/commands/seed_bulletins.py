@@ -0,0 +1,101 @@
+# bulletin/management/commands/seed_bulletins.py
+import random
+
+from django.core.management.base import BaseCommand
+
+from bulletin.models import Bulletin, Review
+from user.models import User
+
+
+class Command(BaseCommand):
+    """
+    Кастомная команда. Наполняет базу большим количеством объявлений и отзывов для нагрузочных замеров
+    (пагинация, индексы, поиск). Вставка идёт пачками через bulk_create.
+    """
+
+    help = "Создаёт N объявлений (и отзывы к ним) для бенчмарков"
+
+    titles = [
+        "iPhone 15 Pro Max",
+        "PlayStation 5",
+        "MacBook Air M3",
+        "Велосипед Trek FX 3",
+        "Электросамокат Xiaomi",
+        "Гитара Fender Stratocaster",
+        "Монитор LG UltraFine 5K",
+        "Кресло Herman Miller",
+        "Наушники Sony WH-1000XM5",
+        "Часы Apple Watch Series 9",
+    ]
+    descriptions = [
+        "В идеальном состоянии, полный комплект.",
+        "Почти не использовался, всё работает.",
+        "Новая модель, куплена недавно.",
+        "Есть мелкие царапины, цена снижена.",
+        "Продажа по причине ненадобности.",
+    ]
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bulletins", type=int, default=100_000, help="Количество объявлений")
+        parser.add_argument("--reviews", type=int, default=0, help="Количество отзывов (распределяются случайно)")
+        parser.add_argument("--users", type=int, default=100, help="Количество авторов")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Размер пачки для bulk_create")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        authors = self.get_authors(options["users"])
+
+        created = 0
+        while created < options["bulletins"]:
+            size = min(batch_size, options["bulletins"] - created)
+            Bulletin.objects.bulk_create(
+                [
+                    Bulletin(
+                        title=f"{random.choice(self.titles)} #{created + i}",
+                        price=random.randint(500, 200_000),
+                        description=random.choice(self.descriptions),
+                        author_id=random.choice(authors),
+                    )
+                    for i in range(size)
+                ],
+                batch_size=batch_size,
+            )
+            created += size
+            self.stdout.write(f"Объявлений создано: {created}")
+
+        if options["reviews"]:
+            self.create_reviews(options["reviews"], authors, batch_size)
+
+        self.stdout.write(self.style.SUCCESS("Данные для бенчмарков созданы"))
+
+    def get_authors(self, count):
+        """
+        Возвращает id авторов, создавая недостающих пользователей без хэширования пароля.
+        """
+        existing = User.objects.filter(email__startswith="seed-").count()
+        User.objects.bulk_create(
+            [User(email=f"seed-{i}@example.com", password="!") for i in range(existing, count)],
+        )
+        return list(User.objects.filter(email__startswith="seed-").values_list("id", flat=True))
+
+    def create_reviews(self, count, authors, batch_size):
+        """
+        Создаёт отзывы к случайным объявлениям.
+        """
+        bulletin_ids = list(Bulletin.objects.values_list("id", flat=True))
+        created = 0
+        while created < count:
+            size = min(batch_size, count - created)
+            Review.objects.bulk_create(
+                [
+                    Review(
+                        text="Отличное объявление!",
+                        author_id=random.choice(authors),
+                        bulletin_id=random.choice(bulletin_ids),
+                    )
+                    for _ in range(size)
+                ],
+                batch_size=batch_size,
+            )
+            created += size
+            self.stdout.write(f"Отзывов создано: {created}")
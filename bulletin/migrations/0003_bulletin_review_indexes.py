@@ -0,0 +1,35 @@
+# Generated by Django 5.2.1 on 2026-10-18 11:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bulletin", "0002_remove_review_ad_review_bulletin"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="bulletin",
+            index=models.Index(fields=["-created_at", "-id"], name="bulletin_created_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="bulletin",
+            index=models.Index(fields=["author", "-created_at", "-id"], name="bulletin_author_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="bulletin",
+            index=models.Index(fields=["price"], name="bulletin_price_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="bulletin",
+            index=models.Index(fields=["title"], name="bulletin_title_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(fields=["bulletin", "-created_at", "-id"], name="review_bulletin_created_idx"),
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:00
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+SEARCH_VECTOR_SQL = """
+    setweight(to_tsvector('russian', coalesce(NEW.title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+    setweight(to_tsvector('russian', coalesce(NEW.description, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B')
+"""
+
+FORWARD_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"""
+    CREATE OR REPLACE FUNCTION bulletin_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := {SEARCH_VECTOR_SQL};
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    # search_vector в списке колонок: Django при save() перезаписывает все поля, включая вектор
+    """
+    CREATE TRIGGER bulletin_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description, search_vector ON bulletin_bulletin
+    FOR EACH ROW EXECUTE FUNCTION bulletin_search_vector_update()
+    """,
+    # Заполняем вектор для существующих строк: UPDATE срабатывает через триггер
+    "UPDATE bulletin_bulletin SET search_vector = NULL",
+    "CREATE INDEX bulletin_search_vector_idx ON bulletin_bulletin USING gin (search_vector)",
+    "CREATE INDEX bulletin_title_trgm_idx ON bulletin_bulletin USING gin (title gin_trgm_ops)",
+]
+
+BACKWARD_SQL = [
+    "DROP INDEX IF EXISTS bulletin_title_trgm_idx",
+    "DROP INDEX IF EXISTS bulletin_search_vector_idx",
+    "DROP TRIGGER IF EXISTS bulletin_search_vector_trigger ON bulletin_bulletin",
+    "DROP FUNCTION IF EXISTS bulletin_search_vector_update()",
+]
+
+
+def run_postgres_sql(statements):
+    """
+    Возвращает функцию для RunPython, выполняющую SQL только на PostgreSQL (тесты идут на SQLite).
+    """
+
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bulletin", "0003_bulletin_review_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bulletin",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False,
+                help_text="Заполняется триггером базы данных из наименования и описания",
+                null=True,
+                verbose_name="Поисковый вектор",
+            ),
+        ),
+        migrations.RunPython(run_postgres_sql(FORWARD_SQL), run_postgres_sql(BACKWARD_SQL)),
+    ]
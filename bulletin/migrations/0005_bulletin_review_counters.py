@@ -0,0 +1,53 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:03
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_review_counters(apps, schema_editor):
+    """
+    Заполняет счётчики отзывов для существующих объявлений одним UPDATE.
+    """
+    Bulletin = apps.get_model("bulletin", "Bulletin")
+    Review = apps.get_model("bulletin", "Review")
+    reviews = Review.objects.filter(bulletin_id=OuterRef("pk")).order_by().values("bulletin_id")
+    Bulletin.objects.update(
+        review_count=Coalesce(
+            Subquery(reviews.annotate(total=Count("id")).values("total"), output_field=IntegerField()),
+            Value(0),
+        ),
+        last_review_at=Subquery(reviews.annotate(last=Max("created_at")).values("last")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bulletin", "0004_bulletin_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bulletin",
+            name="last_review_at",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                help_text="Время и дата последнего отзыва",
+                null=True,
+                verbose_name="Последний отзыв",
+            ),
+        ),
+        migrations.AddField(
+            model_name="bulletin",
+            name="review_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="Обновляется при создании и удалении отзывов",
+                verbose_name="Количество отзывов",
+            ),
+        ),
+        migrations.RunPython(fill_review_counters, migrations.RunPython.noop),
+    ]
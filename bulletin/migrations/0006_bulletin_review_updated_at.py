@@ -0,0 +1,53 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:14
+
+from django.db import migrations, models
+from django.db.models import F
+from django.db.models.functions import Coalesce, Greatest
+
+
+def fill_updated_at(apps, schema_editor):
+    """
+    Заполняет время изменения существующих записей временем создания (для объявлений — или последнего отзыва),
+    а не временем применения миграции.
+    """
+    Bulletin = apps.get_model("bulletin", "Bulletin")
+    Review = apps.get_model("bulletin", "Review")
+    Bulletin.objects.update(updated_at=Greatest(F("created_at"), Coalesce(F("last_review_at"), F("created_at"))))
+    Review.objects.update(updated_at=F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bulletin", "0005_bulletin_review_counters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bulletin",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, help_text="Время и дата последнего изменения объявления", verbose_name="Дата изменения"
+            ),
+        ),
+        migrations.AddField(
+            model_name="bulletin",
+            name="version",
+            field=models.PositiveIntegerField(
+                default=1,
+                editable=False,
+                help_text="Увеличивается при каждом сохранении объявления",
+                verbose_name="Версия",
+            ),
+        ),
+        migrations.AddField(
+            model_name="review",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True,
+                help_text="Время и дата последнего изменения отзыва",
+                verbose_name="Время и дата изменения отзыва",
+            ),
+        ),
+        migrations.RunPython(fill_updated_at, migrations.RunPython.noop),
+    ]
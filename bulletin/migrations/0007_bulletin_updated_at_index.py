@@ -0,0 +1,19 @@
+# Generated by Django 5.2.1 on 2026-10-18 13:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bulletin", "0006_bulletin_review_updated_at"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="bulletin",
+            index=models.Index(fields=["updated_at"], name="bulletin_updated_idx"),
+        ),
+    ]
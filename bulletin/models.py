@@ -1,5 +1,7 @@
 # bulletin/models.py
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import F
 
 
 class Bulletin(models.Model):
@@ -11,6 +13,11 @@ class Bulletin(models.Model):
        description (str): Описание товара;
                   author: Пользователь, который создал объявление;
               created_at: Время и дата создания объявления;
+           search_vector: Поисковый вектор (title + description), поддерживается триггером PostgreSQL;
+      review_count (int): Количество отзывов (денормализовано, см. bulletin.signals);
+          last_review_at: Время и дата последнего отзыва (денормализовано);
+              updated_at: Время и дата последнего изменения (в том числе счётчиков отзывов);
+           version (int): Номер версии, увеличивается при каждом сохранении (для ETag);
     """
 
     title = models.CharField(
@@ -42,6 +49,57 @@ class Bulletin(models.Model):
         help_text="Время и дата создания объявления",
     )  # type: ignore[var-annotated]
 
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        verbose_name="Поисковый вектор",
+        help_text="Заполняется триггером базы данных из наименования и описания",
+    )  # type: ignore[var-annotated]
+
+    review_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Количество отзывов",
+        help_text="Обновляется при создании и удалении отзывов",
+    )  # type: ignore[var-annotated]
+
+    last_review_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="Последний отзыв",
+        help_text="Время и дата последнего отзыва",
+    )  # type: ignore[var-annotated]
+
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Дата изменения",
+        help_text="Время и дата последнего изменения объявления",
+    )  # type: ignore[var-annotated]
+
+    version = models.PositiveIntegerField(
+        default=1,
+        editable=False,
+        verbose_name="Версия",
+        help_text="Увеличивается при каждом сохранении объявления",
+    )  # type: ignore[var-annotated]
+
+    def save(self, *args, **kwargs):
+        """
+        Сохраняет объявление, увеличивая номер версии у уже существующего.
+        Версия увеличивается в самом UPDATE (version = version + 1) и перечитывается после сохранения:
+        при одновременных сохранениях каждое получает свой номер, и разные тела не делят один ETag.
+        """
+        if self._state.adding:
+            super().save(*args, **kwargs)
+            return
+        self.version = F("version") + 1
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "version", "updated_at"}
+        super().save(*args, **kwargs)
+        self.refresh_from_db(fields=["version"])
+
     def __str__(self):
         """
         Возвращает строковое представление объявления.
@@ -53,6 +111,17 @@ class Bulletin(models.Model):
         verbose_name = "Объявление"
         verbose_name_plural = "Объявления"
         ordering = ["-created_at"]
+        indexes = [
+            # Лента объявлений и keyset-пагинация: ORDER BY created_at DESC, id DESC
+            models.Index(fields=["-created_at", "-id"], name="bulletin_created_id_idx"),
+            # /bulletins/me/: WHERE author_id = ... ORDER BY created_at DESC, id DESC
+            models.Index(fields=["author", "-created_at", "-id"], name="bulletin_author_created_idx"),
+            # OrderingFilter: ?ordering=price / ?ordering=title
+            models.Index(fields=["price"], name="bulletin_price_idx"),
+            models.Index(fields=["title"], name="bulletin_title_idx"),
+            # Last-Modified списка без COUNT(*) (приблизительное число строк): MAX(updated_at)
+            models.Index(fields=["updated_at"], name="bulletin_updated_idx"),
+        ]
 
 
 class Review(models.Model):
@@ -63,6 +132,7 @@ class Review(models.Model):
                   author: Пользователь, который оставил отзыв;
                 bulletin: Объявление, под которым оставлен отзыв;
               created_at: Время и дата создания отзыва;
+              updated_at: Время и дата последнего изменения отзыва;
     """
 
     text = models.TextField(
@@ -91,6 +161,12 @@ class Review(models.Model):
         help_text="Время и дата создания отзыва",
     )  # type: ignore[var-annotated]
 
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Время и дата изменения отзыва",
+        help_text="Время и дата последнего изменения отзыва",
+    )  # type: ignore[var-annotated]
+
     def __str__(self):
         """
         Возвращает строковое представление отзыва.
@@ -102,3 +178,7 @@ class Review(models.Model):
         verbose_name = "Отзыв"
         verbose_name_plural = "Отзывы"
         ordering = ["-created_at"]
+        indexes = [
+            # Отзывы объявления: WHERE bulletin_id = ... ORDER BY created_at DESC, id DESC
+            models.Index(fields=["bulletin", "-created_at", "-id"], name="review_bulletin_created_idx"),
+        ]
@@ -0,0 +1,155 @@
+# bulletin/notifications.py
+"""
+Буфер уведомлений о новых отзывах и их отправка дайджестами.
+
+Отзыв не порождает отдельную задачу Celery и отдельное SMTP-соединение. В журнал в кэше (Redis, см.
+config.journal) под префиксом notify записывается только идентификатор отзыва. Периодическая задача
+bulletin.tasks.flush_review_notifications читает журнал от курсора, загружает отзывы с авторами и объявлениями
+одним запросом на пачку, группирует их по получателю и отправляет каждому одно письмо-дайджест. Все письма
+сброса уходят через одно SMTP-соединение (get_connection().send_messages).
+
+Частота писем ограничена: не более NOTIFICATION_MAX_EMAILS_PER_HOUR дайджестов получателю в час. Уведомления
+сверх лимита возвращаются в журнал и попадут в дайджест следующего часа.
+
+Курсор сдвигается только после успешной отправки, поэтому при сбое SMTP записи будут отправлены повторно
+(доставка «хотя бы один раз»).
+"""
+
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMessage, get_connection
+
+from config import metrics
+from config.journal import CacheJournal
+
+from .models import Review
+
+RATE_KEY = "notify:rate:{}:{}"
+
+FROM_EMAIL = "no-reply@example.com"
+BULLETIN_URL = "http://localhost:8000/api/bulletin/bulletins/{}/"
+
+metrics.register("notifications.enqueued", "notifications.sent", "notifications.digested", "notifications.deferred")
+
+journal = CacheJournal("notify")
+
+
+def enqueue_review_notification(review_id):
+    """
+    Добавляет уведомление о новом отзыве в журнал.
+    В журнал пишется только идентификатор отзыва: данные письма загружаются при сбросе пачками.
+
+    :param review_id: Идентификатор отзыва
+    """
+    journal.append(review_id)
+    metrics.incr("notifications.enqueued")
+
+
+def resolve_reviews(review_ids, batch_size):
+    """
+    Загружает отзывы вместе с автором, объявлением и владельцем объявления — один запрос на пачку.
+    Удалённые к моменту сброса отзывы пропускаются.
+
+    :param review_ids: Идентификаторы отзывов в порядке журнала
+    :param batch_size: Размер пачки для запроса
+    :return: Список отзывов в порядке журнала
+    """
+    found = {}
+    for start in range(0, len(review_ids), batch_size):
+        batch = review_ids[start : start + batch_size]
+        reviews = (
+            Review.objects.select_related("author", "bulletin__author")
+            .only("text", "author__email", "bulletin__title", "bulletin__author__email")
+            .filter(pk__in=batch)
+        )
+        found.update((review.pk, review) for review in reviews)
+    return [found[review_id] for review_id in review_ids if review_id in found]
+
+
+def take_rate_slot(email, hour):
+    """
+    Учитывает письмо получателю в лимите текущего часа.
+
+    :param email: Получатель
+    :param hour: Номер часа (unix time // 3600)
+    :return: True, если письмо укладывается в лимит
+    """
+    key = RATE_KEY.format(email, hour)
+    cache.add(key, 0, timeout=60 * 60)
+    return cache.incr(key) <= settings.NOTIFICATION_MAX_EMAILS_PER_HOUR
+
+
+def build_digest(email, reviews):
+    """
+    Формирует письмо-дайджест для получателя.
+
+    :param email: Получатель
+    :param reviews: Новые отзывы к объявлениям получателя
+    :return: EmailMessage
+    """
+    if len(reviews) == 1:
+        subject = f"Новый отзыв на ваше объявление: {reviews[0].bulletin.title}"
+    else:
+        subject = f"Новые отзывы на ваши объявления: {len(reviews)}"
+
+    shown = reviews[: settings.NOTIFICATION_DIGEST_MAX_ITEMS]
+    parts = [f"Здравствуйте, {email}!\n\n"]
+    for review in shown:
+        parts.append(
+            f"Пользователь {review.author.email} оставил отзыв к объявлению «{review.bulletin.title}»:\n"
+            f"«{review.text}»\n"
+            f"Ссылка на объявление: {BULLETIN_URL.format(review.bulletin_id)}\n\n"
+        )
+    if len(reviews) > len(shown):
+        parts.append(f"…и ещё отзывов: {len(reviews) - len(shown)}\n\n")
+    parts.append("С уважением,\nКоманда сайта.")
+    return EmailMessage(subject, "".join(parts), FROM_EMAIL, [email])
+
+
+def flush(connection=None, batch_size=1000):
+    """
+    Отправляет накопленные уведомления дайджестами через одно SMTP-соединение.
+
+    Одновременно выполняется только один сброс (CacheJournal.flushing).
+
+    :param connection: Почтовое соединение (по умолчанию get_connection())
+    :param batch_size: Сколько записей журнала читать одним get_many
+    :return: Количество отправленных писем
+    """
+    with journal.flushing() as locked:
+        if not locked:
+            return 0
+        review_ids, position, cursor = journal.read_pending(batch_size)
+        if position == cursor:
+            return 0
+
+        reviews = resolve_reviews(review_ids, batch_size)
+        by_recipient = defaultdict(list)
+        for review in reviews:
+            by_recipient[review.bulletin.author.email].append(review)
+
+        hour = int(time.time() // 3600)
+        messages, deferred = [], []
+        for email, group in by_recipient.items():
+            if take_rate_slot(email, hour):
+                messages.append(build_digest(email, group))
+            else:
+                deferred.extend(group)
+
+        sent = 0
+        if messages:
+            with connection or get_connection() as smtp:
+                sent = smtp.send_messages(messages) or 0
+
+        # Отложенные по лимиту уведомления возвращаются в конец журнала
+        for review in deferred:
+            journal.append(review.pk)
+        journal.commit(position, cursor)
+
+        metrics.incr("notifications.sent", sent)
+        metrics.incr("notifications.digested", len(reviews) - len(deferred))
+        metrics.incr("notifications.deferred", len(deferred))
+        return sent
@@ -1,22 +1,269 @@
 # bulletin/paginators.py
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def encode_cursor(created_at, pk):
+    """
+    Кодирует позицию в ленте (created_at, id) в непрозрачный курсор.
+
+    :param created_at: Дата создания последней записи страницы
+    :param pk: Идентификатор последней записи страницы
+    :return: Строка курсора, безопасная для URL
+    """
+    payload = json.dumps([created_at.isoformat(), pk], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Декодирует курсор, полученный от клиента.
+
+    :param cursor: Строка курсора
+    :return: Кортеж (created_at, id)
+    :raises NotFound: Если курсор повреждён
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        created_at = parse_datetime(created_at)
+        pk = int(pk)
+    except (TypeError, ValueError, binascii.Error):
+        raise NotFound("Неверный курсор.")
+    if created_at is None:
+        raise NotFound("Неверный курсор.")
+    return created_at, pk
+
+
+class KeysetPaginationMixin:
+    """
+    Добавляет к PageNumberPagination режим keyset-пагинации (по курсору).
+
+    Режим включается явно: параметром запроса ?cursor= (пустое значение — первая страница)
+    или настройкой KEYSET_PAGINATION = True. Позиция кодируется парой (created_at, id), поэтому:
+    - не выполняется COUNT(*) и OFFSET — стоимость страницы не зависит от её глубины;
+    - новые записи, появившиеся во время просмотра, не сдвигают уже выданные страницы.
+
+    В режиме курсора порядок всегда (-created_at, -id), параметр ordering игнорируется.
+    """
+
+    cursor_query_param = "cursor"
+    keyset_ordering = ("-created_at", "-id")
+    keyset = False
+
+    def use_keyset(self, request):
+        """
+        Определяет, нужно ли использовать keyset-пагинацию для запроса.
+        """
+        if self.cursor_query_param in request.query_params:
+            return True
+        return getattr(settings, "KEYSET_PAGINATION", False)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.use_keyset(request)
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)  # type: ignore[misc]
+
+        queryset, page_size = self.get_keyset_queryset(queryset, request)
+        return self.set_keyset_rows(list(queryset[: page_size + 1]), page_size)
+
+    def get_keyset_queryset(self, queryset, request):
+        """
+        Применяет курсор запроса к queryset (без выполнения запроса).
+
+        :return: Кортеж (queryset, размер страницы); страница — первые page_size + 1 строк queryset
+        :raises NotFound: Если курсор повреждён
+        """
+        self.request = request
+        page_size = self.get_page_size(request)  # type: ignore[attr-defined]
+        queryset = queryset.order_by(*self.keyset_ordering)
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            created_at, pk = decode_cursor(cursor)
+            queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+        return queryset, page_size
+
+    def set_keyset_rows(self, rows, page_size):
+        """
+        Запоминает выбранные строки страницы.
+
+        :param rows: Строки queryset из get_keyset_queryset — на одну больше размера страницы, чтобы узнать,
+            есть ли следующая страница, без COUNT(*)
+        :param page_size: Размер страницы
+        :return: Строки страницы
+        """
+        self.has_next = len(rows) > page_size
+        self.page_rows = rows[:page_size]
+        return self.page_rows
+
+    def get_next_cursor(self):
+        """
+        Формирует курсор, указывающий на последнюю запись текущей страницы.
+        """
+        last = self.page_rows[-1]
+        if isinstance(last, dict):
+            return encode_cursor(last["created_at"], last["id"])
+        return encode_cursor(last.created_at, last.pk)
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()  # type: ignore[misc]
+        if not self.has_next:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)  # type: ignore
+        return replace_query_param(url, self.cursor_query_param, self.get_next_cursor())
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)  # type: ignore[misc]
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", None),
+                    ("results", data),
+                ]
+            )
+        )
+
+
+class CountedPaginator(DjangoPaginator):
+    """
+    Django Paginator, которому можно передать уже известное число строк, чтобы не выполнять COUNT(*).
+    """
+
+    def __init__(self, object_list, per_page, *args, count=None, **kwargs):
+        super().__init__(object_list, per_page, *args, **kwargs)
+        if count is not None:
+            # count — cached_property: значение в __dict__ экземпляра заменяет вычисление
+            self.__dict__["count"] = count
+
+
+class KnownCountPaginationMixin:
+    """
+    Позволяет вьюсету передать пагинатору число строк, уже посчитанное другим запросом (см. bulletin.conditional).
+    """
+
+    known_count = None
+
+    def django_paginator_class(self, queryset, page_size):
+        return CountedPaginator(queryset, page_size, count=self.known_count)
+
+
+APPROXIMATE_COUNT_KEY_PREFIX = "pagination:count:"
+
+
+def estimate_count(queryset):
+    """
+    Оценивает число строк таблицы queryset без COUNT(*).
+
+    PostgreSQL — по статистике планировщика pg_class.reltuples (обновляется VACUUM / ANALYZE, в том числе
+    autovacuum); остальные базы и ещё не анализированные таблицы (reltuples = -1) — точным числом строк,
+    закэшированным на APPROXIMATE_COUNT_CACHE_TIMEOUT секунд.
+
+    :param queryset: Queryset без фильтров
+    :return: Число строк (int)
+    """
+    table = queryset.model._meta.db_table
+    connection = connections[queryset.db]
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT reltuples FROM pg_class WHERE oid = %s::regclass", [table])
+            row = cursor.fetchone()
+        if row is not None and row[0] >= 0:
+            return int(row[0])
+    return cache.get_or_set(
+        APPROXIMATE_COUNT_KEY_PREFIX + table,
+        lambda: queryset.model._base_manager.using(queryset.db).count(),
+        settings.APPROXIMATE_COUNT_CACHE_TIMEOUT,
+    )
+
+
+class ApproximateCountPaginationMixin:
+    """
+    Приблизительное число строк для постраничного режима на больших таблицах (включается approximate_count).
+
+    Для списка без фильтров число строк берётся из estimate_count(); точный COUNT(*) выполняется, если список
+    отфильтрован или оценка меньше APPROXIMATE_COUNT_THRESHOLD (0 — всегда точное число). В ответе поле
+    count_is_approximate сообщает клиенту, что count — оценка: последняя страница по ней может оказаться
+    пустой или не последней.
+    """
+
+    approximate_count = False
+    count_is_approximate = False
+
+    def get_approximate_count(self, queryset):
+        """
+        Возвращает оценку числа строк, если для queryset допустимо приблизительное число.
+
+        :param queryset: Отфильтрованный queryset списка
+        :return: Число строк или None, если нужен точный COUNT(*)
+        """
+        threshold = settings.APPROXIMATE_COUNT_THRESHOLD
+        if not self.approximate_count or not threshold or queryset.query.where:
+            return None
+        count = estimate_count(queryset)
+        if count < threshold:
+            return None
+        self.count_is_approximate = True
+        return count
+
+    def get_paginated_response(self, data):
+        if not self.approximate_count:
+            return super().get_paginated_response(data)  # type: ignore[misc]
+        return Response(
+            OrderedDict(
+                [
+                    ("count", self.page.paginator.count),  # type: ignore[attr-defined]
+                    ("count_is_approximate", self.count_is_approximate),
+                    ("next", self.get_next_link()),  # type: ignore[attr-defined]
+                    ("previous", self.get_previous_link()),  # type: ignore[attr-defined]
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)  # type: ignore[misc]
+        if self.approximate_count:
+            schema["properties"]["count_is_approximate"] = {"type": "boolean", "example": False}
+        return schema
 
 
-class BulletinPagination(PageNumberPagination):
+class BulletinPagination(
+    KeysetPaginationMixin, ApproximateCountPaginationMixin, KnownCountPaginationMixin, PageNumberPagination
+):
     """
     Пагинатор для объявлений (bulletin).
     :param page_size: Значение по умолчанию — сколько объектов выводить на страницу, если клиент не указал явно.
     :param page_size_query_param: Позволяет клиенту (например, в Postman или фронте) переопределить page_size
         через URL, например: ?page_size=5.
     :param max_page_size: Ограничивает максимум, который может запросить клиент через ?page_size=...
+    :param approximate_count: Приблизительное число строк для списка без фильтров (см. ApproximateCountPaginationMixin)
     """
 
     page_size = 4
     page_size_query_param = "page_size"
     max_page_size = 10
+    approximate_count = True
 
 
-class ReviewPagination(PageNumberPagination):
+class ReviewPagination(KeysetPaginationMixin, KnownCountPaginationMixin, PageNumberPagination):
     """
     Пагинатор для отзывов (review).
     :param page_size: Значение по умолчанию — сколько объектов выводить на страницу, если клиент не указал явно.
@@ -11,11 +11,14 @@
 | Создать отзыв               | ❌      | ✅          | ✅            |
 | Редактировать/удалить свой  | ❌      | ✅          | ✅            |
 | Редактировать/удалить чужой | ❌      | ❌          | ✅            |
+| Выгрузка (export)           | ❌      | ❌          | ✅            |
 
 """
 
 from rest_framework import permissions
 
+from user.roles import request_is_admin
+
 
 class IsAuthorOrAdminOrReadOnlyForBulletins(permissions.BasePermission):
     """
@@ -47,7 +50,8 @@ class IsAuthorOrAdminOrReadOnlyForBulletins(permissions.BasePermission):
 
         Анонимным пользователям запрещён просмотр отдельных объявлений (только список).
         Безопасные методы (GET, HEAD, OPTIONS) разрешены только аутентифицированным пользователям.
-        Изменение и удаление разрешено только автору объявления или участнику группы 'Администраторы'.
+        Изменение и удаление разрешено только автору объявления или администратору (роль admin или участник
+        группы 'Администраторы', см. user.roles).
 
         :param request: объект запроса
         :param view: текущий view
@@ -57,7 +61,8 @@ class IsAuthorOrAdminOrReadOnlyForBulletins(permissions.BasePermission):
         # Просмотр конкретного объявления запрещён анонимам
         if request.method in permissions.SAFE_METHODS:
             return request.user.is_authenticated
-        return obj.author == request.user or request.user.groups.filter(name="Администраторы").exists()
+        # Сравниваем по author_id, чтобы не загружать автора отдельным запросом
+        return obj.author_id == request.user.pk or request_is_admin(request)
 
 
 class IsAuthenticatedOrReadOnlyForReviews(permissions.BasePermission):
@@ -89,7 +94,8 @@ class IsAuthenticatedOrReadOnlyForReviews(permissions.BasePermission):
 
         Анонимным пользователям запрещён просмотр отдельных запросов (только список).
         Безопасные методы (GET, HEAD, OPTIONS) разрешены только аутентифицированным пользователям.
-        Изменение и удаление разрешено только автору запроса или участнику группы 'Администраторы'.
+        Изменение и удаление разрешено только автору запроса или администратору (роль admin или участник
+        группы 'Администраторы', см. user.roles).
 
         :param request: объект запроса
         :param view: текущий view
@@ -98,4 +104,21 @@ class IsAuthenticatedOrReadOnlyForReviews(permissions.BasePermission):
         """
         if request.method in permissions.SAFE_METHODS:
             return request.user.is_authenticated
-        return obj.author == request.user or request.user.groups.filter(name="Администраторы").exists()
+        # Сравниваем по author_id, чтобы не загружать автора отдельным запросом
+        return obj.author_id == request.user.pk or request_is_admin(request)
+
+
+class IsAdmin(permissions.BasePermission):
+    """
+    Доступ только администраторам (роль admin или участник группы 'Администраторы', см. user.roles).
+    """
+
+    def has_permission(self, request, view):
+        """
+        Разрешает доступ аутентифицированному администратору.
+
+        :param request: объект запроса
+        :param view: текущий view
+        :return: True, если доступ разрешён, иначе False
+        """
+        return request.user.is_authenticated and request_is_admin(request)
@@ -0,0 +1,79 @@
+# bulletin/query_plans.py
+"""
+Проверка планов запросов для «горячих» выборок BulletinViewSet и ReviewViewSet.
+
+Каждая выборка строится так же, как во вьюсете (фильтр + сортировка + LIMIT страницы), и прогоняется через EXPLAIN.
+План считается плохим, если база читает всю таблицу и сортирует результат:
+- PostgreSQL: узлы "Seq Scan" и "Sort" в одном плане;
+- SQLite: "SCAN <таблица>" без индекса и "USE TEMP B-TREE FOR ORDER BY".
+"""
+
+import re
+
+from django.db import connections
+
+from .models import Bulletin
+from .views import BulletinViewSet, ReviewViewSet
+
+
+class QueryPlanError(AssertionError):
+    """План запроса использует полное чтение таблицы с сортировкой."""
+
+    pass
+
+
+def get_viewset_querysets(page_size=10):
+    """
+    Возвращает выборки вьюсетов в том виде, в каком они уходят в базу при запросе первой страницы.
+
+    :param page_size: Размер страницы (LIMIT)
+    :return: Словарь {название: queryset}
+    """
+    bulletin = Bulletin.objects.order_by("id").first()
+    author_id = bulletin.author_id if bulletin else 0
+    bulletin_id = bulletin.pk if bulletin else 0
+
+    bulletins = BulletinViewSet.queryset
+    review_view = ReviewViewSet(kwargs={"bulletin_pk": bulletin_id})
+    return {
+        "bulletins.list": bulletins.all()[:page_size],
+        "bulletins.me": bulletins.filter(author_id=author_id)[:page_size],
+        "bulletins.ordering=price": bulletins.order_by("price")[:page_size],
+        "bulletins.ordering=-price": bulletins.order_by("-price")[:page_size],
+        "bulletins.ordering=title": bulletins.order_by("title")[:page_size],
+        "reviews.list": review_view.get_queryset()[:page_size],
+    }
+
+
+def is_full_scan_with_sort(plan, vendor):
+    """
+    Определяет, содержит ли план полное чтение таблицы с последующей сортировкой.
+
+    :param plan: Текст плана (результат QuerySet.explain())
+    :param vendor: Тип базы данных (connection.vendor)
+    :return: True, если план плохой
+    """
+    if vendor == "postgresql":
+        return "Seq Scan" in plan and "Sort" in plan
+    if vendor == "sqlite":
+        full_scan = any(re.search(r"\bSCAN\b", line) and "USING" not in line for line in plan.splitlines())
+        return full_scan and "USE TEMP B-TREE FOR ORDER BY" in plan
+    return False
+
+
+def check_query_plans(page_size=10, using="default"):
+    """
+    Прогоняет EXPLAIN для всех выборок и возвращает планы.
+
+    :param page_size: Размер страницы (LIMIT)
+    :param using: Алиас базы данных
+    :return: Словарь {название: план}
+    :raises QueryPlanError: Если хотя бы одна выборка читает всю таблицу с сортировкой
+    """
+    vendor = connections[using].vendor
+    plans = {name: queryset.using(using).explain() for name, queryset in get_viewset_querysets(page_size).items()}
+    failed = [name for name, plan in plans.items() if is_full_scan_with_sort(plan, vendor)]
+    if failed:
+        details = "\n\n".join(f"{name}:\n{plans[name]}" for name in failed)
+        raise QueryPlanError(f"Полное чтение таблицы с сортировкой в выборках: {', '.join(failed)}\n\n{details}")
+    return plans
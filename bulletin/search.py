@@ -0,0 +1,79 @@
+# bulletin/search.py
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db import connections
+from django.db.models import Case, Exists, F, FloatField, Q, When
+
+from rest_framework.filters import BaseFilterBackend
+
+
+class BulletinFullTextSearchFilter(BaseFilterBackend):
+    """
+    Полнотекстовый поиск объявлений по наименованию и описанию: ?q=<запрос>.
+
+    На PostgreSQL ищет по колонке search_vector (GIN-индекс, словари russian и english, вес наименования выше
+    описания) и сортирует результат по релевантности. Если полнотекстовый поиск ничего не нашёл (опечатка,
+    часть слова), выполняется нечёткий поиск по триграммам наименования (индекс gin_trgm_ops).
+    На остальных базах (SQLite в тестах) используется простой поиск по вхождению подстроки.
+
+    Сортировка по релевантности не применяется в режиме курсора (?cursor=) — там порядок всегда по дате.
+    """
+
+    search_param = "q"
+    configs = ("russian", "english")
+
+    def get_search_term(self, request):
+        """
+        Возвращает поисковый запрос из параметров запроса.
+        """
+        return request.query_params.get(self.search_param, "").strip()
+
+    def filter_queryset(self, request, queryset, view):
+        term = self.get_search_term(request)
+        if not term:
+            return queryset
+        if connections[queryset.db].vendor != "postgresql":
+            return queryset.filter(Q(title__icontains=term) | Q(description__icontains=term))
+
+        return self.search(queryset, term)
+
+    def get_search_query(self, term):
+        """
+        Полнотекстовый запрос по всем словарям configs.
+        """
+        query = SearchQuery(term, config=self.configs[0], search_type="websearch")
+        for config in self.configs[1:]:
+            query |= SearchQuery(term, config=config, search_type="websearch")
+        return query
+
+    def search(self, queryset, term):
+        """
+        Полнотекстовый поиск с ранжированием по ts_rank, а если он ничего не нашёл — нечёткий поиск
+        по наименованию с ранжированием по сходству триграмм. Оба — одним запросом: условие «полнотекстовый
+        поиск пуст» — некоррелированный NOT EXISTS, PostgreSQL вычисляет его один раз (InitPlan).
+        """
+        query = self.get_search_query(term)
+        full_text = Q(search_vector=query)
+        return (
+            queryset.filter(
+                full_text | Q(title__trigram_word_similar=term) & ~Exists(queryset.filter(full_text).order_by())
+            )
+            .annotate(
+                rank=Case(
+                    When(full_text, then=SearchRank(F("search_vector"), query)),
+                    default=TrigramWordSimilarity(term, "title"),
+                    output_field=FloatField(),
+                )
+            )
+            .order_by("-rank", "-created_at", "-id")
+        )
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.search_param,
+                "required": False,
+                "in": "query",
+                "description": "Полнотекстовый поиск по наименованию и описанию",
+                "schema": {"type": "string"},
+            },
+        ]
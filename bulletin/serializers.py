@@ -1,20 +1,68 @@
 # bulletin/serializers.py
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
 from rest_framework import serializers
 
+from .cache import bump_list_generation
 from .models import Bulletin, Review
 
+# Строк в одном INSERT / UPDATE при массовых операциях
+BULK_BATCH_SIZE = 500
+
 
 class BulletinListSerializer(serializers.ModelSerializer):
     """
     Сериализатор для краткого представления объявлений (список).
 
     Используется при отображении списка объявлений. Не включает описание и отзывы.
+    Количество отзывов и время последнего берутся из денормализованных полей — без JOIN и GROUP BY.
     """
 
     class Meta:
         model = Bulletin
-        fields = ["id", "title", "price", "created_at"]
-        read_only_fields = ["id", "created_at"]
+        fields = ["id", "title", "price", "created_at", "review_count", "last_review_at"]
+        read_only_fields = ["id", "created_at", "review_count", "last_review_at"]
+
+
+class ValuesRowSerializer:
+    """
+    Быстрый путь чтения для сериализатора из простых полей модели.
+
+    Принимает строки QuerySet.values() и выдаёт ту же структуру, что и сериализатор, но без создания экземпляров
+    модели и без сборки полей сериализатора на каждый запрос: поля создаются один раз, а значения, которые
+    .values() уже возвращает в готовом для JSON виде (целые числа и строки), копируются как есть.
+    """
+
+    passthrough_fields = (serializers.IntegerField, serializers.CharField)
+
+    def __init__(self, serializer_class):
+        """
+        :param serializer_class: Класс сериализатора, формат которого нужно повторить
+        """
+        fields = serializer_class().fields
+        self.field_names = list(fields)
+        self.converters = [
+            (name, None if isinstance(field, self.passthrough_fields) else field.to_representation)
+            for name, field in fields.items()
+        ]
+
+    def to_representation(self, rows):
+        """
+        Преобразует строки из .values(*field_names) в данные ответа.
+
+        :param rows: Словари с полями модели
+        :return: Список словарей в формате сериализатора
+        """
+        data = []
+        for row in rows:
+            item = {}
+            for name, convert in self.converters:
+                value = row[name]
+                item[name] = value if convert is None or value is None else convert(value)
+            data.append(item)
+        return data
 
 
 class BulletinDetailSerializer(serializers.ModelSerializer):
@@ -30,6 +78,102 @@ class BulletinDetailSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "author", "created_at"]
 
 
+def bulk_item_id(item):
+    """
+    Возвращает id элемента массового обновления.
+
+    :param item: Элемент тела запроса
+    :return: id или None, если его нет или он не целое число (JSON true/false в Python — тоже int)
+    """
+    pk = item.get("id") if isinstance(item, dict) else None
+    return pk if type(pk) is int else None
+
+
+class BulletinBulkSerializer(serializers.ListSerializer):
+    """
+    Массовое создание (bulk_create) и частичное обновление по id (bulk_update) объявлений — list-сериализатор
+    BulletinCreateSerializer(many=True).
+
+    Атомарный режим (context["atomic"], по умолчанию) — как у ListSerializer: любая ошибка отклоняет весь список.
+    В неатомарном режиме невалидные элементы отбрасываются: их ошибки — в item_errors по номеру элемента,
+    а номера сохраняемых элементов — в item_positions (в порядке validated_data).
+
+    Для обновления instance — словарь {id: Bulletin} объявлений, которые пользователь может менять;
+    элемент с другим id получает ошибку «не найдено».
+
+    bulk_create и bulk_update не вызывают save() и сигналы, поэтому версия и время изменения (для ETag)
+    выставляются здесь, а кэш списка инвалидируется один раз на операцию. Поисковый вектор поддерживает
+    триггер PostgreSQL.
+    """
+
+    def to_internal_value(self, data):
+        self.item_errors = {}
+        self.seen_ids = set()
+        self.child_count = 0
+        validated = super().to_internal_value(data)
+        self.item_positions = [position for position, item in enumerate(validated) if item is not None]
+        return [item for item in validated if item is not None]
+
+    def run_child_validation(self, data):
+        position = self.child_count
+        self.child_count += 1
+        try:
+            if self.instance is not None:
+                self.child.instance = self.get_item_instance(data)
+                self.child.initial_data = data
+            return super().run_child_validation(data)
+        except serializers.ValidationError as exc:
+            if self.context.get("atomic", True):
+                raise
+            # Невалидный элемент пропускается (None убирает to_internal_value)
+            self.item_errors[position] = exc.detail
+            return None
+
+    def get_item_instance(self, data):
+        """
+        Находит обновляемое объявление по id элемента.
+
+        :raises ValidationError: Если id нет или он не целое число, объявление недоступно или id повторяется
+        """
+        pk = bulk_item_id(data)
+        if pk is None and isinstance(data, dict) and "id" in data:
+            raise serializers.ValidationError({"id": ["Ожидается целое число."]})
+        if pk in self.seen_ids:
+            raise serializers.ValidationError({"id": ["Объявление уже есть в запросе."]})
+        instance = self.instance.get(pk) if pk is not None else None
+        if instance is None:
+            raise serializers.ValidationError({"id": ["Объявление не найдено."]})
+        self.seen_ids.add(pk)
+        return instance
+
+    def create(self, validated_data):
+        bulletins = Bulletin.objects.bulk_create(
+            [Bulletin(**attrs) for attrs in validated_data], batch_size=BULK_BATCH_SIZE
+        )
+        transaction.on_commit(bump_list_generation)
+        return bulletins
+
+    def update(self, instances, validated_data):
+        bulletins = [instances[self.initial_data[position]["id"]] for position in self.item_positions]
+        fields = set()
+        now = timezone.now()
+        for bulletin, attrs in zip(bulletins, validated_data):
+            for name, value in attrs.items():
+                setattr(bulletin, name, value)
+            fields.update(attrs)
+        if fields:
+            Bulletin.objects.bulk_update(bulletins, sorted(fields), batch_size=BULK_BATCH_SIZE)
+        # Версия и время изменения — одним UPDATE, а не через CASE по каждой строке в bulk_update
+        updated = Bulletin.objects.filter(pk__in=[bulletin.pk for bulletin in bulletins])
+        updated.update(version=F("version") + 1, updated_at=now)
+        # Строка могла измениться после загрузки: версия перечитывается из базы, а не увеличивается в памяти
+        versions = dict(updated.values_list("pk", "version"))
+        for bulletin in bulletins:
+            bulletin.version, bulletin.updated_at = versions[bulletin.pk], now
+        transaction.on_commit(bump_list_generation)
+        return bulletins
+
+
 class BulletinCreateSerializer(serializers.ModelSerializer):
     """
     Сериализатор для создания нового объявления.
@@ -41,6 +185,7 @@ class BulletinCreateSerializer(serializers.ModelSerializer):
         model = Bulletin
         fields = ["id", "title", "price", "description", "author", "created_at"]
         read_only_fields = ["id", "author", "created_at"]
+        list_serializer_class = BulletinBulkSerializer
 
     def create(self, validated_data):
         """
@@ -0,0 +1,39 @@
+# bulletin/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import counters
+from .cache import bump_list_generation
+from .models import Bulletin, Review
+
+
+@receiver([post_save, post_delete], sender=Bulletin)
+def invalidate_bulletin_list_cache(sender, **kwargs):
+    """
+    Инвалидирует кэш списка объявлений после фиксации транзакции, в которой объявление изменилось.
+    """
+    transaction.on_commit(bump_list_generation)
+
+
+@receiver(post_save, sender=Review)
+def count_created_review(sender, instance, created, **kwargs):
+    """
+    Увеличивает счётчик отзывов объявления при создании отзыва.
+    """
+    if not created:
+        return
+    counters.review_added(instance.bulletin_id, instance.created_at)
+    transaction.on_commit(bump_list_generation)
+
+
+@receiver(post_delete, sender=Review)
+def count_deleted_review(sender, instance, origin=None, **kwargs):
+    """
+    Уменьшает счётчик отзывов объявления при удалении отзыва.
+    Если отзыв удаляется каскадно вместе с объявлением, счётчик не трогаем.
+    """
+    if isinstance(origin, Bulletin):
+        return
+    counters.review_removed(instance.bulletin_id)
+    transaction.on_commit(bump_list_generation)
@@ -0,0 +1,14 @@
+# bulletin/tasks.py
+from celery import shared_task
+
+from . import notifications
+
+
+@shared_task
+def flush_review_notifications():
+    """
+    Периодическая задача: отправляет накопленные уведомления об отзывах дайджестами (см. bulletin.notifications).
+
+    :return: Количество отправленных писем
+    """
+    return notifications.flush()
@@ -0,0 +1,113 @@
+# tests/test_approximate_count.py
+"""
+Что покрыто:
+список без фильтров от APPROXIMATE_COUNT_THRESHOLD строк — count из закэшированной оценки, без COUNT(*),
+    count_is_approximate = true
+точное число — для отфильтрованного списка, ниже порога и при выключенном пороге
+ETag — меняется при удалении объявления, хотя оценка числа строк та же
+асинхронная вьюха — тот же ответ и ETag, что у синхронного вьюсета
+"""
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+import pytest
+from asgiref.sync import async_to_sync
+from rest_framework.test import APIClient, APIRequestFactory
+
+from bulletin.async_views import ASYNC_READ_HANDLERS, async_read_view
+from bulletin.models import Bulletin
+from bulletin.views import BulletinViewSet
+from user.models import User
+
+URL = reverse("bulletin:bulletins-list")
+
+
+@pytest.fixture
+def bulletins(db):
+    """
+    Создаёт пять объявлений.
+
+    :return: Список Bulletin
+    """
+    user = User.objects.create_user(email="seller@example.com", password="password")
+    return [Bulletin.objects.create(title=f"Объявление {number}", price=number, author=user) for number in range(5)]
+
+
+@pytest.fixture
+def approximate(settings):
+    """
+    Включает приблизительное число строк с порогом ниже числа объявлений и выключает кэш списка анонимов.
+    """
+    settings.APPROXIMATE_COUNT_THRESHOLD = 3
+    settings.BULLETIN_LIST_CACHE_TIMEOUT = 0
+
+
+def count_queries(queries):
+    """
+    Возвращает число запросов COUNT среди выполненных.
+    """
+    return sum("COUNT(" in query["sql"].upper() for query in queries)
+
+
+def test_approximate_count(bulletins, approximate):
+    """
+    Оценка кэшируется: после первого запроса страница строится без COUNT(*), count помечен как приблизительный.
+    """
+    client = APIClient()
+    client.get(URL)
+
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(URL)
+
+    assert count_queries(context.captured_queries) == 0
+    assert list(response.data)[:2] == ["count", "count_is_approximate"]
+    assert response.data["count"] == 5
+    assert response.data["count_is_approximate"] is True
+
+
+@pytest.mark.parametrize("query, threshold", [("?search=Объявление 1", 3), ("", 6), ("", 0)])
+def test_exact_count(bulletins, approximate, settings, query, threshold):
+    """
+    Отфильтрованный список, список меньше порога и выключенный порог считаются точно.
+    """
+    settings.APPROXIMATE_COUNT_THRESHOLD = threshold
+
+    response = APIClient().get(URL + query)
+
+    assert response.data["count_is_approximate"] is False
+    assert response.data["count"] == (1 if query else 5)
+
+
+def test_etag_changes_on_delete(bulletins, approximate, django_capture_on_commit_callbacks):
+    """
+    Удаление не меняет оценку и MAX(updated_at), но меняет поколение списка, а с ним и ETag.
+    """
+    client = APIClient()
+    etag = client.get(URL)["ETag"]
+    assert client.get(URL, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    with django_capture_on_commit_callbacks(execute=True):
+        bulletins[1].delete()
+    response = client.get(URL, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 200
+    assert response.data["count"] == 5
+    assert response["ETag"] != etag
+
+
+def test_async_same_as_sync(bulletins, approximate):
+    """
+    Асинхронная вьюха отдаёт ту же оценку и тот же ETag.
+    """
+    factory = APIRequestFactory()
+    view = BulletinViewSet.as_view({"get": "list"})
+    async_view = async_read_view(view, *ASYNC_READ_HANDLERS["bulletins-list"])
+
+    sync_response = view(factory.get(URL)).render()
+    async_response = async_to_sync(async_view)(factory.get(URL)).render()
+
+    assert async_response.content == sync_response.content
+    assert async_response["ETag"] == sync_response["ETag"]
+    assert async_response.data["count_is_approximate"] is True
@@ -0,0 +1,249 @@
+# tests/test_async_views.py
+"""
+Что покрыто:
+список объявлений — асинхронный ответ совпадает с синхронным (тело, ETag, заголовки) для страниц и курсора
+карточка объявления — совпадение ответа, 304 по If-None-Match
+отзывы — совпадение ответа, 404 для несуществующего объявления и 401 для анонима через синхронный вьюсет
+кэш анонимов — общий с синхронным вьюсетом: асинхронный запрос попадает в закэшированный ответ
+сложные запросы — фильтры и Browsable API передаются синхронному вьюсету
+"""
+
+import functools
+from urllib.parse import urlsplit
+
+from django.urls import resolve, reverse
+
+import pytest
+from asgiref.sync import async_to_sync
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from bulletin.async_views import ASYNC_READ_HANDLERS, async_read_view
+from bulletin.models import Bulletin, Review
+from user.models import User
+
+COMPARED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Allow", "Vary", "X-Cache")
+
+
+@pytest.fixture
+def user(db):
+    """
+    Создаёт и возвращает пользователя.
+
+    :return: User
+    """
+    return User.objects.create_user(email="async@example.com", password="password")
+
+
+@pytest.fixture
+def auth_headers(user):
+    """
+    Возвращает заголовок Authorization с JWT пользователя.
+
+    :return: dict
+    """
+    return {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(user)}"}
+
+
+@pytest.fixture
+def bulletins(user):
+    """
+    Создаёт пять объявлений, у первого — два отзыва.
+
+    :return: Список Bulletin
+    """
+    items = [
+        Bulletin.objects.create(title=f"Объявление {number}", price=number, description="...", author=user)
+        for number in range(5)
+    ]
+    Review.objects.create(text="Первый", author=user, bulletin=items[0])
+    Review.objects.create(text="Второй", author=user, bulletin=items[0])
+    return items
+
+
+@pytest.fixture
+def no_list_cache(settings):
+    """
+    Выключает кэш списка для анонимов, чтобы оба вьюсета строили ответ сами.
+    """
+    settings.BULLETIN_LIST_CACHE_TIMEOUT = 0
+
+
+def call_both(url, **headers):
+    """
+    Выполняет запрос синхронным вьюсетом из роутера и асинхронной вьюхой поверх него.
+
+    :return: Кортеж (синхронный ответ, асинхронный ответ, был ли асинхронный запрос передан синхронному вьюсету)
+    """
+    match = resolve(urlsplit(url).path)
+    action, handler = ASYNC_READ_HANDLERS[match.url_name]
+    fallbacks = []
+
+    def sync_view(request, *args, **kwargs):
+        fallbacks.append(request)
+        return match.func(request, *args, **kwargs)
+
+    async_view = async_read_view(functools.update_wrapper(sync_view, match.func), action, handler)
+    factory = APIRequestFactory()
+
+    sync_response = match.func(factory.get(url, **headers), **match.kwargs)
+    async_response = async_to_sync(async_view)(factory.get(url, **headers), **match.kwargs)
+    # Ответы DRF рендерит обработчик Django; здесь вьюхи вызываются напрямую
+    for response in (sync_response, async_response):
+        if hasattr(response, "render"):
+            response.render()
+    return sync_response, async_response, bool(fallbacks)
+
+
+def assert_same(sync_response, async_response):
+    """
+    Проверяет, что ответы совпадают побайтно вместе с заголовками.
+    """
+    assert async_response.status_code == sync_response.status_code
+    assert async_response.content == sync_response.content
+    for header in COMPARED_HEADERS:
+        assert async_response.get(header) == sync_response.get(header), header
+
+
+@pytest.mark.parametrize("query", ["", "?page=2&page_size=2", "?page=last&page_size=2", "?cursor=", "?page_size=3"])
+def test_bulletin_list_same_as_sync(bulletins, no_list_cache, query):
+    """
+    Асинхронный список объявлений совпадает с синхронным для постраничного и keyset-режимов.
+    """
+    sync_response, async_response, fallback = call_both(reverse("bulletin:bulletins-list") + query)
+
+    assert not fallback
+    assert_same(sync_response, async_response)
+    assert "ETag" in async_response
+
+
+def test_bulletin_list_next_cursor(bulletins, no_list_cache):
+    """
+    Курсор следующей страницы из асинхронного ответа ведёт туда же, что и у синхронного.
+    """
+    url = reverse("bulletin:bulletins-list")
+    sync_response, async_response, _ = call_both(f"{url}?cursor=&page_size=2")
+    next_url = sync_response.data["next"]
+
+    sync_response, async_response, fallback = call_both(next_url.replace("http://testserver", ""))
+
+    assert not fallback
+    assert_same(sync_response, async_response)
+
+
+def test_bulletin_list_queries(bulletins, no_list_cache, django_assert_num_queries):
+    """
+    Страница списка строится двумя запросами: агрегат валидаторов (он же число строк) и строки страницы.
+    """
+    match = resolve(reverse("bulletin:bulletins-list"))
+    view = async_read_view(match.func, *ASYNC_READ_HANDLERS[match.url_name])
+    request = APIRequestFactory().get(reverse("bulletin:bulletins-list"))
+
+    with django_assert_num_queries(2):
+        response = async_to_sync(view)(request)
+
+    assert response.status_code == 200
+
+
+def test_bulletin_list_cursor_queries(bulletins, no_list_cache, django_assert_num_queries):
+    """
+    Страница по курсору — тоже два запроса, без COUNT(*): строки страницы для валидаторов и строки ответа.
+    """
+    match = resolve(reverse("bulletin:bulletins-list"))
+    view = async_read_view(match.func, *ASYNC_READ_HANDLERS[match.url_name])
+    request = APIRequestFactory().get(reverse("bulletin:bulletins-list") + "?cursor=")
+
+    with django_assert_num_queries(2) as captured:
+        response = async_to_sync(view)(request)
+
+    assert response.status_code == 200
+    assert not [query for query in captured.captured_queries if "COUNT(" in query["sql"].upper()]
+
+
+def test_retrieve_same_as_sync_and_not_modified(bulletins, auth_headers):
+    """
+    Карточка объявления совпадает с синхронной, повторный запрос с ETag получает 304.
+    """
+    url = reverse("bulletin:bulletins-detail", args=[bulletins[0].id])
+    sync_response, async_response, fallback = call_both(url, **auth_headers)
+
+    assert not fallback
+    assert_same(sync_response, async_response)
+
+    sync_response, async_response, fallback = call_both(url, HTTP_IF_NONE_MATCH=async_response["ETag"], **auth_headers)
+
+    assert not fallback
+    assert async_response.status_code == 304
+    assert_same(sync_response, async_response)
+
+
+def test_retrieve_errors_fall_back(bulletins, auth_headers):
+    """
+    Аноним (401) и несуществующее объявление (404) обслуживаются синхронным вьюсетом.
+    """
+    url = reverse("bulletin:bulletins-detail", args=[bulletins[0].id])
+    sync_response, async_response, fallback = call_both(url)
+    assert fallback
+    assert async_response.status_code == 401
+    assert_same(sync_response, async_response)
+
+    url = reverse("bulletin:bulletins-detail", args=[10**6])
+    sync_response, async_response, fallback = call_both(url, **auth_headers)
+    assert fallback
+    assert async_response.status_code == 404
+
+
+def test_review_list_same_as_sync(bulletins, auth_headers):
+    """
+    Список отзывов совпадает с синхронным; пустой список существующего объявления — тоже асинхронный.
+    """
+    for bulletin in bulletins[:2]:
+        url = reverse("bulletin:bulletin-reviews-list", args=[bulletin.id])
+        sync_response, async_response, fallback = call_both(url, **auth_headers)
+
+        assert not fallback
+        assert_same(sync_response, async_response)
+
+
+def test_review_list_missing_bulletin_falls_back(user, auth_headers):
+    """
+    Отзывы несуществующего объявления — 404 от синхронного вьюсета.
+    """
+    url = reverse("bulletin:bulletin-reviews-list", args=[10**6])
+    sync_response, async_response, fallback = call_both(url, **auth_headers)
+
+    assert fallback
+    assert async_response.status_code == 404
+    assert_same(sync_response, async_response)
+
+
+def test_shared_anonymous_cache(bulletins):
+    """
+    Ответ, закэшированный синхронным вьюсетом, отдаётся асинхронной вьюхой из кэша.
+    """
+    sync_response, async_response, fallback = call_both(reverse("bulletin:bulletins-list"))
+
+    assert not fallback
+    assert sync_response["X-Cache"] == "MISS"
+    assert async_response["X-Cache"] == "HIT"
+    assert async_response.content == sync_response.content
+    assert async_response["ETag"] == sync_response["ETag"]
+
+
+@pytest.mark.parametrize(
+    "query, headers",
+    [
+        ("?search=Объявление", {}),
+        ("?ordering=price", {}),
+        ("?format=json", {}),
+        ("", {"HTTP_ACCEPT": "text/html"}),
+    ],
+)
+def test_complex_requests_fall_back(bulletins, no_list_cache, query, headers):
+    """
+    Запросы с фильтрами, сортировкой, ?format= и не-JSON Accept обслуживает синхронный вьюсет.
+    """
+    sync_response, async_response, fallback = call_both(reverse("bulletin:bulletins-list") + query, **headers)
+
+    assert fallback
+    assert_same(sync_response, async_response)
@@ -0,0 +1,225 @@
+# tests/test_bulk.py
+"""
+Что покрыто:
+массовое создание — одним INSERT, автор — текущий пользователь, результат по каждому элементу
+ошибки — в неатомарном режиме валидные элементы сохраняются, в атомарном (?atomic=true) — ничего
+ограничения — не больше BULLETIN_BULK_MAX_ITEMS элементов, только список, только авторизованным
+массовое обновление — частичное по id, версия и время изменения растут (ETag) и в памяти совпадают с базой,
+чужие, несуществующие и нецелые (true) id — ошибки
+кэш списка — инвалидируется после массовых операций
+"""
+
+from django.urls import reverse
+
+import pytest
+from rest_framework.test import APIClient
+
+from bulletin.models import Bulletin
+from bulletin.serializers import BulletinCreateSerializer
+from user.models import User
+
+URL = reverse("bulletin:bulletins-bulk")
+
+
+@pytest.fixture
+def user(db):
+    """
+    Создаёт и возвращает пользователя.
+
+    :return: User
+    """
+    return User.objects.create_user(email="seller@example.com", password="password")
+
+
+@pytest.fixture
+def client(user):
+    """
+    Возвращает APIClient, авторизованный пользователем.
+
+    :return: APIClient
+    """
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def items(count, start=0):
+    """
+    Возвращает список валидных объявлений для запроса.
+    """
+    return [{"title": f"Товар {number}", "price": number, "description": "..."} for number in range(start, count)]
+
+
+def test_bulk_create(client, user, django_assert_max_num_queries):
+    """
+    Все элементы создаются пачкой (без запроса на каждый), с автором — текущим пользователем.
+    """
+    with django_assert_max_num_queries(4):
+        response = client.post(URL, items(50), format="json")
+
+    assert response.status_code == 201
+    assert response.data["saved"] == 50
+    assert response.data["failed"] == 0
+    ids = [result["id"] for result in response.data["results"]]
+    bulletins = Bulletin.objects.in_bulk(ids)
+    assert len(bulletins) == 50
+    assert bulletins[ids[3]].title == "Товар 3"
+    assert {bulletin.author_id for bulletin in bulletins.values()} == {user.id}
+
+
+def test_bulk_create_partial(client):
+    """
+    Без атомарности валидные элементы сохраняются, ошибки возвращаются на местах невалидных.
+    """
+    payload = items(3)
+    payload[1] = {"title": "", "price": -1, "description": "..."}
+
+    response = client.post(URL, payload, format="json")
+
+    assert response.status_code == 201
+    assert response.data["saved"] == 2
+    assert response.data["failed"] == 1
+    results = response.data["results"]
+    assert set(results[1]["errors"]) == {"title", "price"}
+    assert "id" in results[0] and "id" in results[2]
+    assert Bulletin.objects.count() == 2
+
+
+def test_bulk_create_atomic(client):
+    """
+    В атомарном режиме одна ошибка отклоняет весь запрос.
+    """
+    payload = items(3)
+    payload[2] = {"title": "Без цены"}
+
+    response = client.post(f"{URL}?atomic=true", payload, format="json")
+
+    assert response.status_code == 400
+    assert response.data[:2] == [{}, {}]
+    assert "price" in response.data[2]
+    assert not Bulletin.objects.exists()
+
+
+def test_bulk_create_all_invalid(client):
+    """
+    Если сохранить нечего — 400 с ошибками по элементам.
+    """
+    response = client.post(URL, [{"title": ""}], format="json")
+
+    assert response.status_code == 400
+    assert response.data["saved"] == 0
+    assert "title" in response.data["results"][0]["errors"]
+
+
+def test_bulk_limits(client, settings):
+    """
+    Больше BULLETIN_BULK_MAX_ITEMS элементов и не список — 400; аноним — 401.
+    """
+    settings.BULLETIN_BULK_MAX_ITEMS = 5
+
+    assert client.post(URL, items(6), format="json").status_code == 400
+    assert client.post(URL, {"title": "Одно"}, format="json").status_code == 400
+    assert not Bulletin.objects.exists()
+    assert APIClient().post(URL, items(1), format="json").status_code == 401
+
+
+def test_bulk_update(client, user, django_assert_max_num_queries):
+    """
+    Частичное обновление по id: меняются только переданные поля, версия растёт.
+    """
+    bulletins = [Bulletin.objects.create(title=f"Старое {number}", price=number, author=user) for number in range(3)]
+    payload = [{"id": bulletin.id, "price": 100 + bulletin.price} for bulletin in bulletins]
+    payload[0]["title"] = "Новое"
+
+    # Проверка роли, выборка объявлений, bulk_update, UPDATE версии, перечитывание версий и две команды savepoint
+    with django_assert_max_num_queries(7):
+        response = client.patch(URL, payload, format="json")
+
+    assert response.status_code == 200
+    assert response.data["saved"] == 3
+    updated = Bulletin.objects.in_bulk([bulletin.id for bulletin in bulletins])
+    assert [updated[bulletin.id].price for bulletin in bulletins] == [100, 101, 102]
+    assert updated[bulletins[0].id].title == "Новое"
+    assert updated[bulletins[1].id].title == "Старое 1"
+    assert all(updated[bulletin.id].version == 2 for bulletin in bulletins)
+    assert all(updated[bulletin.id].updated_at > bulletin.updated_at for bulletin in bulletins)
+
+
+def test_bulk_update_version_from_db(user):
+    """
+    Версия обновлённого объявления в памяти совпадает с базой, даже если строка изменилась после загрузки.
+    """
+    bulletin = Bulletin.objects.create(title="Старое", price=1, author=user)
+    instances = {bulletin.pk: Bulletin.objects.get(pk=bulletin.pk)}
+    bulletin.save()  # строка изменилась после загрузки: версия 2
+    serializer = BulletinCreateSerializer(instances, data=[{"id": bulletin.pk, "price": 5}], many=True, partial=True)
+    serializer.is_valid(raise_exception=True)
+
+    [updated] = serializer.save()
+
+    assert updated.version == Bulletin.objects.get(pk=bulletin.pk).version == 3
+
+
+def test_bulk_update_foreign_and_missing(client, user):
+    """
+    Чужие, несуществующие, повторяющиеся id и элементы без id — ошибки; остальные элементы обновляются.
+    """
+    own = Bulletin.objects.create(title="Своё", price=1, author=user)
+    other = User.objects.create_user(email="other@example.com", password="password")
+    foreign = Bulletin.objects.create(title="Чужое", price=1, author=other)
+    payload = [{"id": foreign.id, "price": 5}, {"id": own.id, "price": 5}, {"id": own.id}, {"id": 10**6}, {"price": 5}]
+
+    response = client.patch(URL, payload, format="json")
+
+    results = response.data["results"]
+    assert results[1] == {"id": own.id}
+    assert [("errors" in result) for result in results] == [True, False, True, True, True]
+    foreign.refresh_from_db()
+    own.refresh_from_db()
+    assert foreign.price == 1
+    assert own.price == 5
+
+
+def test_bulk_update_boolean_id(client, user):
+    """
+    id true/false — ошибка элемента, а не объявление с id 1/0.
+    """
+    first = Bulletin.objects.create(id=1, title="Первое", price=1, author=user)
+
+    response = client.patch(URL, [{"id": True, "price": 5}, {"id": "1", "price": 5}], format="json")
+
+    assert response.status_code == 400
+    assert [result["errors"]["id"] for result in response.data["results"]] == [["Ожидается целое число."]] * 2
+    first.refresh_from_db()
+    assert first.price == 1
+
+
+def test_bulk_update_admin(user):
+    """
+    Администратор может массово менять чужие объявления.
+    """
+    bulletin = Bulletin.objects.create(title="Чужое", price=1, author=user)
+    client = APIClient()
+    client.force_authenticate(User.objects.create_user(email="admin@example.com", password="password", role="admin"))
+
+    response = client.patch(URL, [{"id": bulletin.id, "price": 7}], format="json")
+
+    assert response.status_code == 200
+    bulletin.refresh_from_db()
+    assert bulletin.price == 7
+
+
+def test_bulk_invalidates_list_cache(client, django_capture_on_commit_callbacks):
+    """
+    После массового создания анонимный список не отдаётся из старого кэша.
+    """
+    anonymous = APIClient()
+    list_url = reverse("bulletin:bulletins-list")
+    anonymous.get(list_url)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        client.post(URL, items(2), format="json")
+    response = anonymous.get(list_url)
+
+    assert response["X-Cache"] == "MISS"
+    assert response.data["count"] == 2
@@ -0,0 +1,207 @@
+# tests/test_conditional.py
+"""
+Что покрыто:
+retrieve — 304 по If-None-Match и If-Modified-Since одним запросом к базе, новый ETag после изменения;
+одновременные сохранения получают разные версии
+list — 304 по ETag списка, новый ETag после отзыва и удаления объявления
+reviews — 304 для списка отзывов, новый ETag после нового отзыва
+курсор — страница по курсору без COUNT(*) (с фильтром и без, отзывы), новый ETag после удаления строки
+кэш анонимов — 304 по закэшированным валидаторам без запросов к базе
+метрики — счётчики 304 и сэкономленных байт
+"""
+
+from django.urls import reverse
+
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from bulletin.models import Bulletin, Review
+from config import metrics
+from user.models import User
+
+
+@pytest.fixture
+def user(db):
+    """
+    Создаёт и возвращает пользователя.
+
+    :return: User
+    """
+    return User.objects.create_user(email="etag@example.com", password="password")
+
+
+@pytest.fixture
+def auth_client(user):
+    """
+    Возвращает APIClient, авторизованный как user.
+
+    :return: APIClient
+    """
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def bulletin(user):
+    """
+    Создаёт тестовое объявление.
+
+    :return: Bulletin
+    """
+    return Bulletin.objects.create(title="Велосипед", price=100, description="...", author=user)
+
+
+def test_retrieve_not_modified(auth_client, bulletin, django_assert_num_queries):
+    """
+    Повторный запрос с If-None-Match получает 304 за один запрос валидаторов, без тела.
+    """
+    url = reverse("bulletin:bulletins-detail", args=[bulletin.id])
+    first = auth_client.get(url)
+
+    with django_assert_num_queries(1):
+        second = auth_client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+
+    assert first.status_code == status.HTTP_200_OK
+    assert second.status_code == status.HTTP_304_NOT_MODIFIED
+    assert second.content == b""
+    assert second["ETag"] == first["ETag"]
+    assert metrics.snapshot()["conditional.not_modified"] == 1
+    assert metrics.snapshot()["conditional.bytes_saved"] == len(first.content)
+
+
+def test_retrieve_if_modified_since(auth_client, bulletin):
+    """
+    If-Modified-Since с датой из Last-Modified даёт 304.
+    """
+    url = reverse("bulletin:bulletins-detail", args=[bulletin.id])
+    first = auth_client.get(url)
+
+    response = auth_client.get(url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+def test_retrieve_changed_after_update(auth_client, bulletin):
+    """
+    После изменения объявления версия растёт, и старый ETag больше не совпадает.
+    """
+    url = reverse("bulletin:bulletins-detail", args=[bulletin.id])
+    first = auth_client.get(url)
+    auth_client.patch(url, {"price": 200}, format="json")
+
+    response = auth_client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+
+    bulletin.refresh_from_db()
+    assert bulletin.version == 2
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["price"] == 200
+
+
+def test_concurrent_saves_get_distinct_versions(auth_client, bulletin):
+    """
+    Два сохранения одной строки из копий, загруженных до обоих, получают разные версии и разные ETag.
+    """
+    url = reverse("bulletin:bulletins-detail", args=[bulletin.id])
+    first, second = Bulletin.objects.get(pk=bulletin.pk), Bulletin.objects.get(pk=bulletin.pk)
+
+    first.title = "Самокат"
+    first.save()
+    etag = auth_client.get(url)["ETag"]
+    second.price = 200
+    second.save()
+
+    assert (first.version, second.version) == (2, 3)
+    assert Bulletin.objects.values_list("version", flat=True).get(pk=bulletin.pk) == 3
+    assert auth_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
+
+
+def test_list_not_modified_and_invalidated(auth_client, bulletin, user, django_assert_num_queries):
+    """
+    Список отвечает 304 по ETag; новый отзыв (счётчики в списке) и удаление объявления меняют ETag.
+    """
+    url = reverse("bulletin:bulletins-list")
+    etag = auth_client.get(url)["ETag"]
+
+    with django_assert_num_queries(1):
+        assert auth_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_304_NOT_MODIFIED
+
+    Review.objects.create(text="Отзыв", author=user, bulletin=bulletin)
+    response = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["results"][0]["review_count"] == 1
+
+    other = Bulletin.objects.create(title="Второе", price=1, description="...", author=user)
+    etag = auth_client.get(url)["ETag"]
+    other.delete()
+    assert auth_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
+
+
+def test_reviews_list_not_modified(auth_client, bulletin, user):
+    """
+    Список отзывов отвечает 304, пока не появится новый отзыв.
+    """
+    Review.objects.create(text="Первый", author=user, bulletin=bulletin)
+    url = reverse("bulletin:bulletin-reviews-list", args=[bulletin.id])
+    etag = auth_client.get(url)["ETag"]
+
+    assert auth_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_304_NOT_MODIFIED
+
+    Review.objects.create(text="Второй", author=user, bulletin=bulletin)
+    response = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["results"]) == 2
+
+
+@pytest.mark.parametrize(
+    "route, query", [("bulletins", "?cursor="), ("bulletins", "?cursor=&title=Велосипед"), ("reviews", "?cursor=")]
+)
+def test_cursor_list_without_count(auth_client, bulletin, user, route, query, django_assert_num_queries):
+    """
+    Страница по курсору строится без COUNT(*): валидаторы — по строкам страницы, затем сами строки.
+    """
+    Review.objects.create(text="Отзыв", author=user, bulletin=bulletin)
+    if route == "bulletins":
+        url = reverse("bulletin:bulletins-list")
+    else:
+        url = reverse("bulletin:bulletin-reviews-list", args=[bulletin.id])
+
+    with django_assert_num_queries(2) as captured:
+        response = auth_client.get(url + query)
+
+    assert response.status_code == status.HTTP_200_OK and "ETag" in response
+    assert not [query for query in captured.captured_queries if "COUNT(" in query["sql"].upper()]
+
+
+def test_cursor_list_invalidated(auth_client, bulletin, user):
+    """
+    Страница по курсору отвечает 304, пока её строки не изменились; удаление строки страницы меняет ETag.
+    """
+    other = Bulletin.objects.create(title="Второе", price=1, description="...", author=user)
+    url = reverse("bulletin:bulletins-list") + "?cursor="
+    etag = auth_client.get(url)["ETag"]
+
+    assert auth_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_304_NOT_MODIFIED
+
+    other.delete()
+    response = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["id"] for item in response.data["results"]] == [bulletin.id]
+
+
+def test_anonymous_cache_hit_not_modified(bulletin, django_assert_num_queries):
+    """
+    При попадании в кэш анонимов 304 отдаётся по закэшированным валидаторам без запросов к базе.
+    """
+    client = APIClient()
+    url = reverse("bulletin:bulletins-list")
+    first = client.get(url)
+
+    with django_assert_num_queries(0):
+        response = client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response["X-Cache"] == "HIT"
+    assert metrics.snapshot()["conditional.bytes_saved"] == len(first.content)
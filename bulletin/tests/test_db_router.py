@@ -0,0 +1,170 @@
+# tests/test_db_router.py
+"""
+Что покрыто (реплика — вторая SQLite-база с копией части данных, поэтому видно, из какой базы пришёл ответ):
+чтение — список, карточка, отзывы и /users/me/ читают с реплики, в том числе асинхронные вьюхи
+запись — идёт в default и закрепляет клиента за default (cookie и заголовок X-DB-Pin)
+отставание — реплика с большим отставанием не используется, проверка кэшируется; счётчик db_router.lag_fallbacks
+без реплик — cookie не ставится, чтение из default
+"""
+
+from django.urls import resolve, reverse
+
+import pytest
+from asgiref.sync import async_to_sync
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from bulletin.async_views import ASYNC_READ_HANDLERS, async_read_view
+from bulletin.models import Bulletin, Review
+from config import db_router, metrics
+from user.models import User
+
+pytestmark = pytest.mark.django_db(databases=["default", "replica"])
+
+
+@pytest.fixture(autouse=True)
+def replicas(settings, monkeypatch):
+    """
+    Включает чтение с реплики и сбрасывает результаты проверки отставания.
+    """
+    settings.DATABASE_REPLICAS = ["replica"]
+    settings.BULLETIN_LIST_CACHE_TIMEOUT = 0
+    monkeypatch.setattr(db_router, "_replica_health", {})
+
+
+@pytest.fixture
+def user():
+    """
+    Создаёт пользователя в default и его копию на реплике (с другим именем — чтобы отличать ответы).
+
+    :return: User
+    """
+    user = User.objects.create_user(email="replica@example.com", password="password", first_name="Основная")
+    User.objects.using("replica").create(
+        pk=user.pk, email=user.email, password=user.password, first_name="Реплика", is_active=True
+    )
+    return user
+
+
+@pytest.fixture
+def client(user):
+    """
+    Возвращает APIClient с JWT пользователя.
+
+    :return: APIClient
+    """
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+    return client
+
+
+@pytest.fixture
+def bulletin(user):
+    """
+    Создаёт объявление с отзывом только в default — на реплику они «ещё не доехали».
+
+    :return: Bulletin
+    """
+    bulletin = Bulletin.objects.create(title="Новое", price=100, description="...", author=user)
+    Review.objects.create(text="Отзыв", author=user, bulletin=bulletin)
+    return bulletin
+
+
+def test_safe_requests_read_replica(client, bulletin):
+    """
+    Список, карточка, отзывы и профиль читаются с реплики.
+    """
+    assert client.get(reverse("bulletin:bulletins-list")).data["results"] == []
+    assert client.get(reverse("bulletin:bulletins-detail", args=[bulletin.id])).status_code == 404
+    assert client.get(reverse("bulletin:bulletin-reviews-list", args=[bulletin.id])).status_code == 404
+    assert client.get(reverse("user:user-me")).data["first_name"] == "Реплика"
+
+
+def test_async_view_reads_replica(user, bulletin):
+    """
+    Асинхронная вьюха чтения (режим ASGI) тоже читает с реплики.
+    """
+    match = resolve(reverse("bulletin:bulletins-list"))
+    view = async_read_view(match.func, *ASYNC_READ_HANDLERS[match.url_name])
+    request = APIRequestFactory().get(reverse("bulletin:bulletins-list"))
+
+    response = async_to_sync(view)(request)
+    response.render()
+
+    assert response.status_code == 200
+    assert response.data["results"] == []
+
+
+def test_write_goes_to_primary_and_pins(client, user):
+    """
+    Запись идёт в default, после неё клиент читает свои данные из default — по cookie или заголовку X-DB-Pin.
+    """
+    response = client.post(
+        reverse("bulletin:bulletins-list"), {"title": "Моё", "price": 10, "description": "..."}, format="json"
+    )
+
+    assert response.status_code == 201
+    assert Bulletin.objects.using("default").filter(title="Моё").exists()
+    assert not Bulletin.objects.using("replica").exists()
+    pin = response[db_router.PIN_HEADER]
+    assert response.cookies["db_pin"].value == pin
+
+    url = reverse("bulletin:bulletins-detail", args=[response.data["id"]])
+    assert client.get(url).status_code == 200  # cookie
+
+    header_client = APIClient()
+    header_client.credentials(HTTP_AUTHORIZATION=client._credentials["HTTP_AUTHORIZATION"], HTTP_X_DB_PIN=pin)
+    assert header_client.get(url).status_code == 200
+
+    client.cookies["db_pin"] = "1"  # срок закрепления истёк
+    assert client.get(url).status_code == 404
+
+
+def test_failed_write_does_not_pin(client):
+    """
+    Неуспешная запись не закрепляет клиента за default.
+    """
+    response = client.post(reverse("bulletin:bulletins-list"), {"title": ""}, format="json")
+
+    assert response.status_code == 400
+    assert "db_pin" not in response.cookies
+
+
+def test_lagging_replica_skipped(client, bulletin, monkeypatch):
+    """
+    Реплика с отставанием больше DB_REPLICA_MAX_LAG не используется; отставание проверяется раз в интервал.
+    """
+    checks = []
+
+    def replica_lag(alias):
+        checks.append(alias)
+        return 60.0
+
+    monkeypatch.setattr(db_router, "replica_lag", replica_lag)
+    url = reverse("bulletin:bulletins-detail", args=[bulletin.id])
+
+    assert client.get(url).status_code == 200
+    assert client.get(url).status_code == 200
+    assert checks == ["replica"]
+    assert metrics.snapshot()["db_router.lag_fallbacks"] == 1
+
+
+def test_unavailable_replica_skipped(client, bulletin, monkeypatch):
+    """
+    Недоступная реплика (None вместо отставания) не используется.
+    """
+    monkeypatch.setattr(db_router, "replica_lag", lambda alias: None)
+
+    assert client.get(reverse("bulletin:bulletins-detail", args=[bulletin.id])).status_code == 200
+
+
+def test_no_replicas(client, bulletin, settings):
+    """
+    Без реплик чтение идёт из default, а запись не ставит cookie.
+    """
+    settings.DATABASE_REPLICAS = []
+
+    assert client.get(reverse("bulletin:bulletins-detail", args=[bulletin.id])).status_code == 200
+    response = client.patch(reverse("user:user-me"), {"first_name": "Новое"}, format="json")
+    assert response.status_code == 200
+    assert "db_pin" not in response.cookies
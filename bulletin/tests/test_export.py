@@ -0,0 +1,179 @@
+# tests/test_export.py
+"""
+Что покрыто:
+выгрузка объявлений — NDJSON по умолчанию, CSV по ?format=csv и Accept: text/csv, порядок (created_at, id)
+потоковость — ответ StreamingHttpResponse, строки приходят пачками по EXPORT_CHUNK_SIZE
+инкрементальная выгрузка — since и since_id, ошибка на некорректные since (в том числе несуществующую дату) и since_id
+отзывы — выгрузка отзывов объявления, 404 для несуществующего объявления
+доступ — только администраторам: 401 для анонима, 403 для пользователя
+"""
+
+import csv
+import io
+import json
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+
+import pytest
+from rest_framework.test import APIClient
+
+from bulletin.models import Bulletin, Review
+from user.models import User
+
+
+@pytest.fixture
+def admin(db):
+    """
+    Создаёт и возвращает администратора.
+
+    :return: User
+    """
+    return User.objects.create_user(email="admin@example.com", password="password", role="admin")
+
+
+@pytest.fixture
+def admin_client(admin):
+    """
+    Возвращает APIClient, авторизованный администратором.
+
+    :return: APIClient
+    """
+    client = APIClient()
+    client.force_authenticate(admin)
+    return client
+
+
+@pytest.fixture
+def bulletins(admin):
+    """
+    Создаёт пять объявлений: у двух последних одинаковое время создания, у первого — два отзыва.
+
+    :return: Список Bulletin в порядке выгрузки
+    """
+    start = timezone.now() - timedelta(days=1)
+    created = [start, start + timedelta(hours=1), start + timedelta(hours=2), start + timedelta(hours=3)]
+    created.append(created[-1])
+    items = []
+    for number, created_at in enumerate(created):
+        bulletin = Bulletin.objects.create(title=f"Объявление {number}", price=number, author=admin)
+        Bulletin.objects.filter(pk=bulletin.pk).update(created_at=created_at)
+        items.append(Bulletin.objects.get(pk=bulletin.pk))
+    Review.objects.create(text="Первый", author=admin, bulletin=items[0])
+    Review.objects.create(text="Второй, с запятой", author=admin, bulletin=items[0])
+    return items
+
+
+def read_ndjson(response):
+    """
+    Собирает потоковый ответ и разбирает строки NDJSON.
+
+    :return: Список словарей
+    """
+    return [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+
+
+def test_export_ndjson(admin_client, bulletins):
+    """
+    Объявления выгружаются потоком в NDJSON в порядке (created_at, id) с полями export_fields.
+    """
+    response = admin_client.get(reverse("bulletin:bulletins-export"))
+
+    assert response.status_code == 200
+    assert response.streaming
+    assert response["Content-Type"] == "application/x-ndjson"
+    assert response["Content-Disposition"] == 'attachment; filename="bulletins.ndjson"'
+    rows = read_ndjson(response)
+    assert [row["id"] for row in rows] == [bulletin.id for bulletin in bulletins]
+    assert rows[0]["review_count"] == 2
+    assert rows[0]["author_id"] == bulletins[0].author_id
+    assert rows[0]["created_at"].endswith("Z")
+
+
+def test_export_in_chunks(admin_client, bulletins, settings):
+    """
+    Строки читаются и отдаются пачками по EXPORT_CHUNK_SIZE.
+    """
+    settings.EXPORT_CHUNK_SIZE = 2
+
+    response = admin_client.get(reverse("bulletin:bulletins-export"))
+    chunks = list(response.streaming_content)
+
+    assert [chunk.count(b"\n") for chunk in chunks] == [2, 2, 1]
+
+
+@pytest.mark.parametrize("query, headers", [("?format=csv", {}), ("", {"HTTP_ACCEPT": "text/csv"})])
+def test_export_csv(admin_client, bulletins, query, headers):
+    """
+    CSV выгружается с заголовком; формат выбирается параметром или заголовком Accept.
+    """
+    response = admin_client.get(reverse("bulletin:bulletins-export") + query, **headers)
+
+    assert response["Content-Type"] == "text/csv; charset=utf-8"
+    rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+    assert [int(row["id"]) for row in rows] == [bulletin.id for bulletin in bulletins]
+    assert rows[1]["last_review_at"] == ""
+
+
+def test_export_since(admin_client, bulletins):
+    """
+    since — строки, созданные позже; since и since_id — строки после позиции, в том числе с тем же created_at.
+    """
+    url = reverse("bulletin:bulletins-export")
+    since = bulletins[3].created_at.isoformat()
+
+    rows = read_ndjson(admin_client.get(url, {"since": since}))
+    assert rows == []
+
+    rows = read_ndjson(admin_client.get(url, {"since": since, "since_id": bulletins[3].id}))
+    assert [row["id"] for row in rows] == [bulletins[4].id]
+
+    rows = read_ndjson(admin_client.get(url, {"since": bulletins[1].created_at.isoformat(), "since_id": 0}))
+    assert [row["id"] for row in rows] == [bulletin.id for bulletin in bulletins[1:]]
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"since": "вчера"},
+        {"since": "2024-13-45T00:00:00"},
+        {"since": "2024-02-30T10:00"},
+        {"since": "2024-01-01T00:00:00Z", "since_id": "x"},
+        {"since": "2024-01-01T00:00:00Z", "since_id": "²"},
+    ],
+)
+def test_export_since_invalid(admin_client, bulletins, params):
+    """
+    Некорректные since и since_id — 400 с описанием ошибки в формате выгрузки.
+    """
+    response = admin_client.get(reverse("bulletin:bulletins-export"), params)
+
+    assert response.status_code == 400
+    assert set(json.loads(response.content)) <= {"since", "since_id"}
+
+
+def test_export_reviews(admin_client, bulletins):
+    """
+    Выгружаются отзывы объявления; для несуществующего объявления — 404.
+    """
+    response = admin_client.get(reverse("bulletin:bulletin-reviews-export", args=[bulletins[0].id]), {"format": "csv"})
+    rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+
+    assert [row["text"] for row in rows] == ["Первый", "Второй, с запятой"]
+    assert {row["bulletin_id"] for row in rows} == {str(bulletins[0].id)}
+
+    response = admin_client.get(reverse("bulletin:bulletin-reviews-export", args=[10**6]))
+    assert response.status_code == 404
+
+
+def test_export_admin_only(bulletins):
+    """
+    Аноним получает 401, обычный пользователь — 403.
+    """
+    client = APIClient()
+    url = reverse("bulletin:bulletins-export")
+    assert client.get(url).status_code == 401
+
+    client.force_authenticate(User.objects.create_user(email="user@example.com", password="password"))
+    assert client.get(url).status_code == 403
@@ -0,0 +1,73 @@
+# tests/test_fast_list.py
+"""
+Что покрыто:
+ValuesRowSerializer — контракт: тот же JSON побайтно, что и у BulletinListSerializer
+list / me — быстрый путь отдаёт те же данные, что и сериализатор
+"""
+
+import json
+
+from django.urls import reverse
+
+import pytest
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from bulletin.models import Bulletin, Review
+from bulletin.serializers import BulletinListSerializer, ValuesRowSerializer
+from config.renderers import ORJSONRenderer
+from user.models import User
+
+
+@pytest.fixture
+def user(db):
+    """
+    Создаёт и возвращает пользователя.
+
+    :return: User
+    """
+    return User.objects.create(email="fast@example.com", password="!")
+
+
+@pytest.fixture
+def bulletins(user):
+    """
+    Создаёт объявления, у части из которых есть отзывы.
+
+    :return: Список объявлений
+    """
+    created = [
+        Bulletin.objects.create(title=f"Товар «{i}»", price=i * 1000, description="...", author=user) for i in range(5)
+    ]
+    Review.objects.create(text="Отзыв", author=user, bulletin=created[0])
+    return created
+
+
+@pytest.mark.parametrize("renderer", [JSONRenderer(), ORJSONRenderer()])
+def test_values_rows_byte_identical(bulletins, renderer):
+    """
+    Быстрый путь и BulletinListSerializer дают побайтно одинаковый JSON.
+    """
+    queryset = Bulletin.objects.order_by("-created_at", "-id")
+    fast = ValuesRowSerializer(BulletinListSerializer)
+
+    expected = renderer.render(BulletinListSerializer(queryset, many=True).data)
+    actual = renderer.render(fast.to_representation(queryset.values(*fast.field_names)))
+
+    assert actual == expected
+
+
+@pytest.mark.parametrize("url_name", ["bulletin:bulletins-list", "bulletin:bulletins-me"])
+def test_list_endpoints_match_serializer(bulletins, user, url_name):
+    """
+    list и me отдают те же данные, что и BulletinListSerializer.
+    """
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    response = client.get(reverse(url_name), {"page_size": 10})
+
+    expected = BulletinListSerializer(Bulletin.objects.order_by("-created_at", "-id"), many=True).data
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["results"] == json.loads(ORJSONRenderer().render(expected))
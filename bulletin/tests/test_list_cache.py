@@ -0,0 +1,89 @@
+# tests/test_list_cache.py
+"""
+Что покрыто:
+кэш списка — повторный анонимный запрос отдаётся из кэша, порядок параметров не важен
+инвалидация — создание объявления сбрасывает кэш через номер поколения
+авторизованные — ответы не кэшируются
+метрики — счётчики попаданий и промахов
+"""
+
+from django.urls import reverse
+
+import pytest
+from rest_framework.test import APIClient
+
+from bulletin.models import Bulletin
+from config import metrics
+from user.models import User
+
+
+@pytest.fixture
+def api_client():
+    """
+    Возвращает экземпляр APIClient без авторизации.
+
+    :return: APIClient
+    """
+    return APIClient()
+
+
+@pytest.fixture
+def user(db):
+    """
+    Создаёт и возвращает пользователя.
+
+    :return: User
+    """
+    return User.objects.create_user(email="cache@example.com", password="password")
+
+
+@pytest.fixture
+def bulletin(user):
+    """
+    Создаёт тестовое объявление.
+
+    :return: Bulletin
+    """
+    return Bulletin.objects.create(title="Кэшируемое", price=100, description="...", author=user)
+
+
+def test_anonymous_list_cached(api_client, bulletin):
+    """
+    Второй запрос с теми же параметрами (в другом порядке) отдаётся из кэша с тем же телом.
+    """
+    url = reverse("bulletin:bulletins-list")
+    first = api_client.get(f"{url}?page=1&page_size=4")
+    second = api_client.get(f"{url}?page_size=4&page=1")
+
+    assert first["X-Cache"] == "MISS"
+    assert second["X-Cache"] == "HIT"
+    assert first.content == second.content
+    assert metrics.snapshot()["bulletin_list_cache.hit"] == 1
+    assert metrics.snapshot()["bulletin_list_cache.miss"] == 1
+
+
+def test_create_invalidates_cache(api_client, bulletin, user, django_capture_on_commit_callbacks):
+    """
+    Новое объявление появляется в списке сразу после создания.
+    """
+    url = reverse("bulletin:bulletins-list")
+    api_client.get(url)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Bulletin.objects.create(title="Новое", price=1, description="...", author=user)
+    response = api_client.get(url)
+
+    assert response["X-Cache"] == "MISS"
+    assert response.json()["count"] == 2
+
+
+def test_authenticated_not_cached(api_client, bulletin, user):
+    """
+    Ответы авторизованным пользователям не кэшируются.
+    """
+    api_client.force_authenticate(user=user)
+    url = reverse("bulletin:bulletins-list")
+    api_client.get(url)
+    response = api_client.get(url)
+
+    assert "X-Cache" not in response
@@ -0,0 +1,160 @@
+# tests/test_notifications.py
+"""
+Что покрыто:
+создание отзыва — уведомление попадает в журнал после фиксации транзакции, письмо сразу не отправляется
+сброс — дайджест на получателя, все письма через одно соединение, повторный сброс ничего не отправляет
+лимит — уведомления сверх лимита откладываются и остаются в журнале
+журнал — недописанная запись ждёт один сброс, затем пропускается
+пачки — отзывы загружаются одним запросом на пачку, удалённые отзывы пропускаются
+"""
+
+from unittest.mock import patch
+
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail import get_connection
+from django.urls import reverse
+
+import pytest
+from rest_framework.test import APIClient
+
+from bulletin import notifications
+from bulletin.models import Bulletin, Review
+from config import metrics
+from user.models import User
+
+
+@pytest.fixture
+def owner(db):
+    """
+    Создаёт и возвращает владельца объявлений.
+
+    :return: User
+    """
+    return User.objects.create(email="owner@example.com", password="!")
+
+
+@pytest.fixture
+def bulletin(owner):
+    """
+    Создаёт тестовое объявление.
+
+    :return: Bulletin
+    """
+    return Bulletin.objects.create(title="Велосипед", price=100, description="...", author=owner)
+
+
+@pytest.fixture
+def reviewer(db):
+    """
+    Создаёт и возвращает автора отзывов.
+
+    :return: User
+    """
+    return User.objects.create(email="reviewer@example.com", password="!")
+
+
+def enqueue(bulletin, reviewer, text):
+    """
+    Создаёт отзыв к объявлению и добавляет уведомление о нём в журнал.
+
+    :return: Review
+    """
+    review = Review.objects.create(text=text, author=reviewer, bulletin=bulletin)
+    notifications.enqueue_review_notification(review.id)
+    return review
+
+
+def other_bulletin(email):
+    """
+    Создаёт объявление другого владельца.
+
+    :return: Bulletin
+    """
+    owner = User.objects.create(email=email, password="!")
+    return Bulletin.objects.create(title="Самокат", price=100, description="...", author=owner)
+
+
+def test_review_create_enqueues_notification(bulletin, reviewer, django_capture_on_commit_callbacks):
+    """
+    Создание отзыва кладёт в журнал только идентификатор отзыва, письмо уходит только при сбросе.
+    """
+    client = APIClient()
+    client.force_authenticate(user=reviewer)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        client.post(reverse("bulletin:bulletin-reviews-list", args=[bulletin.id]), {"text": "Отличный!"})
+
+    assert mail.outbox == []
+    assert cache.get(notifications.journal.item_key.format(1)) == Review.objects.get().id
+    assert notifications.flush() == 1
+    assert mail.outbox[0].to == ["owner@example.com"]
+    assert mail.outbox[0].subject == "Новый отзыв на ваше объявление: Велосипед"
+    assert "reviewer@example.com" in mail.outbox[0].body
+
+
+def test_flush_sends_digest_per_recipient_over_one_connection(bulletin, reviewer):
+    """
+    Несколько отзывов одному получателю объединяются в одно письмо; все письма уходят через одно соединение.
+    """
+    for number in range(3):
+        enqueue(bulletin, reviewer, f"Отзыв {number}")
+    enqueue(other_bulletin("second@example.com"), reviewer, "Отзыв")
+
+    with patch("bulletin.notifications.get_connection", wraps=get_connection) as connect:
+        sent = notifications.flush()
+
+    assert sent == 2
+    assert connect.call_count == 1
+    digest = next(message for message in mail.outbox if message.to == ["owner@example.com"])
+    assert digest.subject == "Новые отзывы на ваши объявления: 3"
+    assert all(f"Отзыв {number}" in digest.body for number in range(3))
+    assert notifications.flush() == 0
+    assert metrics.snapshot()["notifications.digested"] == 4
+
+
+def test_flush_resolves_reviews_per_batch(bulletin, reviewer, django_assert_num_queries):
+    """
+    Отзывы загружаются одним запросом на пачку; удалённый до сброса отзыв пропускается.
+    """
+    reviews = [enqueue(other_bulletin(f"owner-{number}@example.com"), reviewer, "Отзыв") for number in range(5)]
+    reviews[0].delete()
+
+    with django_assert_num_queries(2):
+        sent = notifications.flush(batch_size=3)
+
+    assert sent == 4
+    assert sorted(message.to[0] for message in mail.outbox) == [
+        f"owner-{number}@example.com" for number in range(1, 5)
+    ]
+
+
+def test_rate_cap_defers_notifications(bulletin, reviewer, settings):
+    """
+    Сверх лимита писем в час уведомления откладываются и не теряются.
+    """
+    settings.NOTIFICATION_MAX_EMAILS_PER_HOUR = 1
+    enqueue(bulletin, reviewer, "Первый")
+    notifications.flush()
+    review = enqueue(bulletin, reviewer, "Второй")
+
+    assert notifications.flush() == 0
+    assert len(mail.outbox) == 1
+    assert metrics.snapshot()["notifications.deferred"] == 1
+    review_ids, _, _ = notifications.journal.read_pending(100)
+    assert review_ids == [review.id]
+
+
+def test_missing_item_waits_one_flush(bulletin, reviewer):
+    """
+    Запись, номер которой выдан, но которая ещё не записана, задерживает сброс один раз, затем пропускается.
+    """
+    enqueue(bulletin, reviewer, "Первый")
+    notifications.journal.next_sequence()  # номер выдан, запись не сделана
+    enqueue(bulletin, reviewer, "Третий")
+
+    assert notifications.flush() == 1
+    assert "Третий" not in mail.outbox[0].body
+    assert notifications.flush() == 1
+    assert "Третий" in mail.outbox[1].body
+    assert cache.get(notifications.journal.cursor_key) == 3
@@ -0,0 +1,127 @@
+# tests/test_pagination.py
+"""
+Что покрыто:
+keyset — первая страница без COUNT(*), переход по курсору, устойчивость к новым записям
+me — курсор в экшене /bulletins/me/
+reviews — курсор во вложенном списке отзывов
+"""
+
+from django.urls import reverse
+
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from bulletin.models import Bulletin, Review
+from user.models import User
+
+
+@pytest.fixture
+def api_client():
+    """
+    Возвращает экземпляр APIClient без авторизации.
+
+    :return: APIClient
+    """
+    return APIClient()
+
+
+@pytest.fixture
+def user(db):
+    """
+    Создаёт и возвращает пользователя.
+
+    :return: User
+    """
+    return User.objects.create_user(email="pager@example.com", password="password")
+
+
+@pytest.fixture
+def bulletins(user):
+    """
+    Создаёт 6 объявлений пользователя.
+
+    :param user: Автор объявлений
+    :return: Список объявлений от новых к старым
+    """
+    created = [
+        Bulletin.objects.create(title=f"Объявление {i}", price=100 * i, description="...", author=user)
+        for i in range(6)
+    ]
+    return list(reversed(created))
+
+
+def test_keyset_first_and_next_page(api_client, bulletins):
+    """
+    Тест перехода по страницам курсором.
+
+    Проверяет:
+    - в ответе нет count
+    - страницы не пересекаются и идут от новых к старым
+    - на последней странице next отсутствует
+    """
+    url = reverse("bulletin:bulletins-list")
+    response = api_client.get(url, {"cursor": "", "page_size": 4})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "count" not in response.data
+    assert [b["id"] for b in response.data["results"]] == [b.id for b in bulletins[:4]]
+
+    response = api_client.get(response.data["next"])
+
+    assert [b["id"] for b in response.data["results"]] == [b.id for b in bulletins[4:]]
+    assert response.data["next"] is None
+
+
+def test_keyset_stable_under_inserts(api_client, bulletins, user):
+    """
+    Новое объявление, созданное между запросами, не сдвигает вторую страницу.
+    """
+    url = reverse("bulletin:bulletins-list")
+    response = api_client.get(url, {"cursor": "", "page_size": 3})
+    Bulletin.objects.create(title="Свежее", price=1, description="...", author=user)
+
+    response = api_client.get(response.data["next"])
+
+    assert [b["id"] for b in response.data["results"]] == [b.id for b in bulletins[3:]]
+
+
+def test_keyset_invalid_cursor(api_client, bulletins):
+    """
+    Повреждённый курсор возвращает 404.
+    """
+    url = reverse("bulletin:bulletins-list")
+    response = api_client.get(url, {"cursor": "не-курсор"})
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_keyset_me(api_client, bulletins, user):
+    """
+    Курсор работает в экшене /bulletins/me/.
+    """
+    api_client.force_authenticate(user=user)
+    url = reverse("bulletin:bulletins-me")
+    response = api_client.get(url, {"cursor": "", "page_size": 5})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["results"]) == 5
+    response = api_client.get(response.data["next"])
+    assert [b["id"] for b in response.data["results"]] == [bulletins[5].id]
+
+
+def test_keyset_reviews(api_client, bulletins, user):
+    """
+    Курсор работает во вложенном списке отзывов.
+    """
+    bulletin = bulletins[0]
+    reviews = [Review.objects.create(text=f"Отзыв {i}", author=user, bulletin=bulletin) for i in range(3)]
+    api_client.force_authenticate(user=user)
+    url = reverse("bulletin:bulletin-reviews-list", args=[bulletin.id])
+
+    response = api_client.get(url, {"cursor": "", "page_size": 2})
+    assert [r["id"] for r in response.data["results"]] == [reviews[2].id, reviews[1].id]
+
+    response = api_client.get(response.data["next"])
+    assert [r["id"] for r in response.data["results"]] == [reviews[0].id]
+    assert response.data["next"] is None
@@ -0,0 +1,137 @@
+# tests/test_profiling.py
+"""
+Что покрыто:
+Server-Timing — число и время запросов к базе, стадии вьюхи (аутентификация, права, сериализатор, рендеринг)
+и общее время для объявлений, отзывов и /users/me/
+лог — строка с замерами на запрос; медленный запрос (порог времени или числа запросов) — со списком SQL
+без параметров
+выключено — без middleware заголовка нет, запросы не учитываются
+"""
+
+import logging
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+import pytest
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from bulletin.models import Bulletin, Review
+from config import profiling
+from user.models import User
+
+
+@pytest.fixture
+def enabled(settings):
+    """
+    Включает ProfilingMiddleware (как PROFILING=True).
+    """
+    settings.MIDDLEWARE = ["config.profiling.ProfilingMiddleware", *settings.MIDDLEWARE]
+    settings.BULLETIN_LIST_CACHE_TIMEOUT = 0
+
+
+@pytest.fixture
+def user(db):
+    """
+    Создаёт пользователя.
+
+    :return: User
+    """
+    return User.objects.create_user(email="profile@example.com", password="secure1234")
+
+
+@pytest.fixture
+def bulletin(user):
+    """
+    Создаёт объявление с отзывом.
+
+    :return: Bulletin
+    """
+    bulletin = Bulletin.objects.create(title="Велосипед", price=1000, author=user)
+    Review.objects.create(text="Отличный", author=user, bulletin=bulletin)
+    return bulletin
+
+
+def client_for(user):
+    """
+    Возвращает APIClient с JWT пользователя.
+    """
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+    return client
+
+
+def timings(response):
+    """
+    Разбирает Server-Timing в словарь {имя: (длительность, описание)}.
+    """
+    result = {}
+    for entry in response["Server-Timing"].split(", "):
+        name, *params = entry.split(";")
+        values = dict(param.split("=", 1) for param in params)
+        result[name] = (float(values["dur"]), values.get("desc", "").strip('"'))
+    return result
+
+
+def test_server_timing(enabled, bulletin):
+    """
+    Список объявлений: число запросов в заголовке совпадает с фактическим, стадии замерены.
+    """
+    client = APIClient()
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(reverse("bulletin:bulletins-list"))
+
+    entries = timings(response)
+    assert entries["db"][1] == f"{len(queries)} queries"
+    assert {"serializer", "render", "total"} <= entries.keys()
+    assert entries["total"][0] >= entries["db"][0]
+
+
+@pytest.mark.parametrize("method", ["get", "patch"])
+def test_views(enabled, bulletin, user, method):
+    """
+    Отзывы и /users/me/: аутентификация, права и сериализатор попадают в заголовок.
+    """
+    client = client_for(user)
+    reviews = client.get(reverse("bulletin:bulletin-reviews-list", args=[bulletin.pk]))
+    me = getattr(client, method)(reverse("user:user-me"), {"first_name": "Иван"})
+
+    for response in (reviews, me):
+        assert response.status_code == 200
+        assert {"db", "auth", "permissions", "serializer", "render", "total"} <= timings(response).keys()
+
+
+def test_log(enabled, bulletin, user, settings, caplog):
+    """
+    Обычный запрос — строка INFO без списка SQL; запрос сверх порога числа запросов — WARNING со списком.
+    """
+    caplog.set_level(logging.INFO, logger="config.profiling")
+    client = client_for(user)
+    url = reverse("bulletin:bulletins-detail", args=[bulletin.pk])
+    client.get(url)
+
+    record = caplog.records[-1]
+    assert record.levelno == logging.INFO
+    assert record.profile["path"] == url and record.profile["status"] == 200
+    assert "query_log" not in record.profile
+
+    settings.PROFILING_MAX_QUERIES = 0
+    client.get(url)
+
+    record = caplog.records[-1]
+    assert record.levelno == logging.WARNING
+    query_log = record.profile["query_log"]
+    assert len(query_log) == record.profile["queries"] > 0
+    assert all(query["db"] == "default" and "%s" in query["sql"] for query in query_log)
+
+
+def test_disabled(bulletin):
+    """
+    Без middleware заголовка нет, профиль запроса не заводится.
+    """
+    response = APIClient().get(reverse("bulletin:bulletins-list"))
+
+    assert "Server-Timing" not in response
+    assert profiling.current_profile.get() is None
@@ -0,0 +1,70 @@
+# tests/test_query_plans.py
+"""
+Что покрыто:
+EXPLAIN — выборки вьюсетов используют индексы и не сортируют всю таблицу
+check_query_plans — проверка падает на выборке без подходящего индекса
+
+Размер набора задаётся переменной окружения QUERY_PLAN_ROWS (по умолчанию 5000 объявлений).
+"""
+
+import os
+
+from django.db import connection
+
+import pytest
+
+from bulletin.models import Bulletin, Review
+from bulletin.query_plans import QueryPlanError, check_query_plans, is_full_scan_with_sort
+from user.models import User
+
+
+@pytest.fixture
+def seeded(db):
+    """
+    Наполняет базу объявлениями и отзывами.
+
+    :return: Количество созданных объявлений
+    """
+    rows = int(os.environ.get("QUERY_PLAN_ROWS", 5000))
+    authors = User.objects.bulk_create([User(email=f"plan-{i}@example.com", password="!") for i in range(10)])
+    bulletins = Bulletin.objects.bulk_create(
+        [Bulletin(title=f"Товар {i}", price=i % 1000, description="...", author=authors[i % 10]) for i in range(rows)],
+        batch_size=5000,
+    )
+    Review.objects.bulk_create(
+        [Review(text="Отзыв", author=authors[i % 10], bulletin=bulletins[i % 50]) for i in range(rows // 10)]
+    )
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    return rows
+
+
+def test_viewset_querysets_use_indexes(seeded):
+    """
+    Ни одна из выборок вьюсетов не читает всю таблицу с сортировкой.
+    """
+    plans = check_query_plans()
+
+    assert set(plans) >= {"bulletins.list", "bulletins.me", "reviews.list"}
+
+
+def test_full_scan_with_sort_detected(seeded):
+    """
+    Сортировка по неиндексированному полю распознаётся как плохой план.
+    """
+    plan = Bulletin.objects.order_by("description")[:10].explain()
+
+    assert is_full_scan_with_sort(plan, connection.vendor)
+
+
+def test_check_query_plans_raises(seeded, monkeypatch):
+    """
+    check_query_plans выбрасывает QueryPlanError, если выборка без индекса.
+    """
+    monkeypatch.setattr(
+        "bulletin.query_plans.get_viewset_querysets",
+        lambda page_size: {"bulletins.description": Bulletin.objects.order_by("description")[:page_size]},
+    )
+
+    with pytest.raises(QueryPlanError):
+        check_query_plans()
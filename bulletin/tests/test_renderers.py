@@ -0,0 +1,68 @@
+# tests/test_renderers.py
+"""
+Что покрыто:
+ORJSONRenderer — тот же JSON, что у стандартного JSONRenderer; Decimal и datetime
+ORJSONParser — разбор тела запроса и ошибка на некорректном JSON
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from io import BytesIO
+
+from django.urls import reverse
+
+import pytest
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from bulletin.models import Bulletin
+from bulletin.serializers import BulletinListSerializer
+from config.parsers import ORJSONParser
+from config.renderers import ORJSONRenderer
+from user.models import User
+
+
+def test_renderer_matches_drf_renderer(db):
+    """
+    Вывод ORJSONRenderer для списка объявлений побайтно совпадает со стандартным.
+    """
+    user = User.objects.create(email="render@example.com", password="!")
+    Bulletin.objects.create(title="Гитара «Fender»", price=100, description="...", author=user)
+    data = BulletinListSerializer(Bulletin.objects.all(), many=True).data
+
+    assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+def test_renderer_native_types():
+    """
+    datetime выводится в ISO 8601 с 'Z', Decimal — числом.
+    """
+    data = {"at": datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc), "price": Decimal("10.5")}
+
+    assert ORJSONRenderer().render(data) == b'{"at":"2025-01-02T03:04:05Z","price":10.5}'
+
+
+def test_parser():
+    """
+    Парсер разбирает JSON и выбрасывает ParseError на некорректном теле.
+    """
+    assert ORJSONParser().parse(BytesIO('{"title": "Тест"}'.encode())) == {"title": "Тест"}
+    with pytest.raises(ParseError):
+        ORJSONParser().parse(BytesIO(b"{oops"))
+
+
+def test_api_json_request(db):
+    """
+    API принимает JSON-тело запроса и отвечает 400 на некорректный JSON.
+    """
+    client = APIClient()
+    client.force_authenticate(user=User.objects.create(email="json@example.com", password="!"))
+    url = reverse("bulletin:bulletins-list")
+
+    response = client.post(url, {"title": "JSON", "price": 1, "description": "..."}, format="json")
+    assert response.status_code == status.HTTP_201_CREATED
+
+    response = client.post(url, "{oops", content_type="application/json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
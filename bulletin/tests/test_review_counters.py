@@ -0,0 +1,87 @@
+# tests/test_review_counters.py
+"""
+Что покрыто:
+create — создание отзыва увеличивает review_count и обновляет last_review_at
+destroy — удаление отзыва уменьшает счётчик и пересчитывает last_review_at
+reconcile_review_counters — команда исправляет расхождения
+list — счётчики отдаются в списке без дополнительных запросов
+"""
+
+from django.core.management import call_command
+from django.urls import reverse
+
+import pytest
+from rest_framework.test import APIClient
+
+from bulletin.models import Bulletin, Review
+from user.models import User
+
+
+@pytest.fixture
+def user(db):
+    """
+    Создаёт и возвращает пользователя.
+
+    :return: User
+    """
+    return User.objects.create_user(email="counter@example.com", password="password")
+
+
+@pytest.fixture
+def bulletin(user):
+    """
+    Создаёт тестовое объявление.
+
+    :return: Bulletin
+    """
+    return Bulletin.objects.create(title="Со счётчиком", price=100, description="...", author=user)
+
+
+def test_review_create_and_delete_update_counters(bulletin, user):
+    """
+    Счётчики следуют за созданием и удалением отзывов.
+    """
+    first = Review.objects.create(text="Первый", author=user, bulletin=bulletin)
+    second = Review.objects.create(text="Второй", author=user, bulletin=bulletin)
+    bulletin.refresh_from_db()
+    assert bulletin.review_count == 2
+    assert bulletin.last_review_at == second.created_at
+
+    second.delete()
+    bulletin.refresh_from_db()
+    assert bulletin.review_count == 1
+    assert bulletin.last_review_at == first.created_at
+
+    first.delete()
+    bulletin.refresh_from_db()
+    assert bulletin.review_count == 0
+    assert bulletin.last_review_at is None
+
+
+def test_reconcile_fixes_drift(bulletin, user):
+    """
+    Команда reconcile_review_counters исправляет расхождения.
+    """
+    review = Review.objects.create(text="Отзыв", author=user, bulletin=bulletin)
+    Bulletin.objects.filter(pk=bulletin.pk).update(review_count=10, last_review_at=None)
+
+    call_command("reconcile_review_counters", batch_size=1)
+
+    bulletin.refresh_from_db()
+    assert bulletin.review_count == 1
+    assert bulletin.last_review_at == review.created_at
+
+
+def test_list_exposes_counters_without_extra_queries(bulletin, user, django_assert_num_queries):
+    """
+    Список объявлений отдаёт счётчики за два запроса (COUNT и выборка страницы).
+    """
+    Review.objects.create(text="Отзыв", author=user, bulletin=bulletin)
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    with django_assert_num_queries(2):
+        response = client.get(reverse("bulletin:bulletins-list"))
+
+    assert response.data["results"][0]["review_count"] == 1
+    assert response.data["results"][0]["last_review_at"] is not None
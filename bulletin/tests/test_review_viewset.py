@@ -1,12 +1,13 @@
 # tests/test_review_viewset.py
 """
 Что покрыто:
-list — получение списка отзывов
+list — получение списка отзывов; плоский маршрут /reviews/ — пустой список
 retrieve — получение одного отзыва
 create — создание отзыва
 update — полное обновление отзыва
 partial_update — частичное обновление отзыва
 destroy — удаление отзыва
+бюджет запросов — количество SQL-запросов каждого действия зафиксировано
 """
 
 from django.urls import reverse
@@ -238,3 +239,65 @@ def test_bulletin_me_returns_user_bulletins(auth_client, user):
     assert "Моё 1" in titles
     assert "Моё 2" in titles
     assert "Чужое" not in titles
+
+
+@pytest.mark.parametrize(
+    "method, detail, data, queries",
+    [
+        ("get", False, None, 2),  # COUNT + страница
+        ("post", False, {"text": "Новый"}, 3),  # объявление + INSERT + счётчик отзывов
+        ("get", True, None, 1),  # отзыв
+        ("put", True, {"text": "Изменён"}, 2),  # отзыв + UPDATE
+        ("patch", True, {"text": "Изменён"}, 2),  # отзыв + UPDATE
+        ("delete", True, None, 3),  # отзыв + DELETE + счётчик отзывов
+    ],
+)
+def test_review_actions_query_budget(
+    api_client, bulletin, review, user2, django_assert_num_queries, method, detail, data, queries
+):
+    """
+    Фиксирует количество SQL-запросов каждого действия с отзывами (автор отзыва — user2).
+    """
+    api_client.force_authenticate(user=user2)
+    if detail:
+        url = reverse("bulletin:bulletin-reviews-detail", args=[bulletin.id, review.id])
+    else:
+        url = reverse("bulletin:bulletin-reviews-list", args=[bulletin.id])
+
+    with django_assert_num_queries(queries):
+        response = getattr(api_client, method)(url, data)
+
+    assert response.status_code < 300
+
+
+def test_list_reviews_of_missing_bulletin(auth_client):
+    """
+    Список отзывов несуществующего объявления возвращает 404.
+    """
+    url = reverse("bulletin:bulletin-reviews-list", args=[999999])
+
+    response = auth_client.get(url)
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_list_reviews_flat_route(auth_client, review):
+    """
+    Плоский маршрут /reviews/ объявления не указывает: пустой список, а не 404.
+    """
+    response = auth_client.get(reverse("bulletin:reviews-list"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["results"] == []
+
+
+def test_create_review_for_missing_bulletin(auth_client):
+    """
+    Отзыв к несуществующему объявлению не создаётся.
+    """
+    url = reverse("bulletin:bulletin-reviews-list", args=[999999])
+
+    response = auth_client.post(url, {"text": "Отзыв"})
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert not Review.objects.exists()
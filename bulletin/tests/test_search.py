@@ -0,0 +1,79 @@
+# tests/test_search.py
+"""
+Что покрыто:
+q — поиск по наименованию и описанию (на SQLite — запасной поиск по вхождению)
+search — поиск по вхождению в наименование через SearchFilter
+один поиск на запрос — фильтрация общая для валидаторов и страницы
+"""
+
+from unittest.mock import patch
+
+from django.urls import reverse
+
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from bulletin.models import Bulletin
+from bulletin.search import BulletinFullTextSearchFilter
+from user.models import User
+
+filter_queryset = BulletinFullTextSearchFilter.filter_queryset
+
+
+@pytest.fixture
+def api_client():
+    """
+    Возвращает экземпляр APIClient без авторизации.
+
+    :return: APIClient
+    """
+    return APIClient()
+
+
+@pytest.fixture
+def bulletins(db):
+    """
+    Создаёт объявления с разными наименованиями и описаниями.
+
+    :return: Словарь объявлений по ключам
+    """
+    user = User.objects.create_user(email="search@example.com", password="password")
+    return {
+        "bike": Bulletin.objects.create(title="Велосипед Trek", price=1, description="Горный", author=user),
+        "guitar": Bulletin.objects.create(title="Гитара", price=2, description="Есть царапины", author=user),
+    }
+
+
+def test_q_searches_description(api_client, bulletins):
+    """
+    ?q= находит объявление по описанию.
+    """
+    response = api_client.get(reverse("bulletin:bulletins-list"), {"q": "царапины"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [b["id"] for b in response.data["results"]] == [bulletins["guitar"].id]
+
+
+def test_search_param_searches_title(api_client, bulletins):
+    """
+    ?search= ищет только по наименованию.
+    """
+    response = api_client.get(reverse("bulletin:bulletins-list"), {"search": "Велосипед"})
+
+    assert [b["id"] for b in response.data["results"]] == [bulletins["bike"].id]
+
+
+def test_q_filters_once(api_client, bulletins, django_assert_num_queries):
+    """
+    Поиск выполняется один раз на запрос: отфильтрованный queryset общий для валидаторов и страницы,
+    отдельной проверки «нашёл ли полнотекстовый поиск» нет.
+    """
+    with patch.object(
+        BulletinFullTextSearchFilter, "filter_queryset", autospec=True, side_effect=filter_queryset
+    ) as search:
+        with django_assert_num_queries(2):
+            response = api_client.get(reverse("bulletin:bulletins-list"), {"q": "Гитара"})
+
+    assert search.call_count == 1
+    assert [b["id"] for b in response.data["results"]] == [bulletins["guitar"].id]
@@ -1,8 +1,11 @@
 # bulletin/urls.py
+from django.conf import settings
+
 from rest_framework.routers import DefaultRouter
 from rest_framework_nested.routers import NestedDefaultRouter
 
 from .apps import BulletinConfig
+from .async_views import wrap_async_read_views
 from .views import BulletinViewSet, ReviewViewSet
 
 app_name = BulletinConfig.name
@@ -19,3 +22,7 @@ bulletins_router.register(
 )  # /api/bulletin/bulletins/<id>/reviews/
 
 urlpatterns = router.urls + bulletins_router.urls
+
+# В режиме ASGI чтение списка и карточки объявления и списка отзывов обслуживают асинхронные вьюхи
+if settings.ASYNC_READ_VIEWS:
+    wrap_async_read_views(urlpatterns)
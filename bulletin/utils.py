@@ -8,6 +8,9 @@ from celery import shared_task
 def send_review_notification_email(email, bulletin_id, bulletin_title, bulletin_author, review_author, review_text):
     """
     Отправляет уведомительное письмо владельцу объявления о новом отзыве.
+    Оставлена для задач, уже поставленных в очередь: новые уведомления записываются в журнал
+    (bulletin.notifications.enqueue_review_notification) и отправляются дайджестами периодической задачей
+    bulletin.tasks.flush_review_notifications.
 
     :param email: Email-адрес владельца объявления, на который отправляется письмо.
     :param bulletin_id: Идентификатор объявления.
@@ -1,37 +1,109 @@
 # bulletin/views.py
 
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+
 from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import filters, status
 from rest_framework.decorators import action
 from rest_framework.exceptions import NotFound
-from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
+from config.db_router import ReplicaReadMixin
+from config.profiling import ProfilingMixin, measure
+from user.roles import request_is_admin
+
+from .cache import AnonymousListCacheMixin
+from .conditional import ConditionalListMixin, ConditionalRetrieveMixin
+from .export import ExportMixin
 from .models import Bulletin, Review
+from .notifications import enqueue_review_notification
 from .paginators import BulletinPagination, ReviewPagination
 from .permissions import IsAuthenticatedOrReadOnlyForReviews, IsAuthorOrAdminOrReadOnlyForBulletins
-from .serializers import BulletinCreateSerializer, BulletinDetailSerializer, BulletinListSerializer, ReviewSerializer
-from .utils import send_review_notification_email
+from .search import BulletinFullTextSearchFilter
+from .serializers import (
+    BulletinCreateSerializer,
+    BulletinDetailSerializer,
+    BulletinListSerializer,
+    ReviewSerializer,
+    ValuesRowSerializer,
+    bulk_item_id,
+)
 
 
-class BulletinViewSet(ModelViewSet):
+class ValuesListMixin:
+    """
+    Быстрый путь для списков только на чтение: строки выбираются через .values() и сериализуются
+    ValuesRowSerializer, который выдаёт тот же JSON, что и сериализатор списка, без создания моделей.
+    """
+
+    values_serializer: ValuesRowSerializer
+
+    def values_list_response(self, queryset):
+        """
+        Возвращает (постраничный) ответ со строками queryset.
+
+        :param queryset: Отфильтрованный и отсортированный queryset
+        :return: Response
+        """
+        rows = queryset.values(*self.values_serializer.field_names)
+        page = self.paginate_queryset(rows)  # type: ignore[attr-defined]
+        with measure("serializer"):
+            data = self.values_serializer.to_representation(page if page is not None else rows)
+        if page is not None:
+            return self.get_paginated_response(data)  # type: ignore[attr-defined]
+        return Response(data)
+
+    def list(self, request, *args, **kwargs):
+        return self.values_list_response(self.filter_queryset(self.get_queryset()))  # type: ignore[attr-defined]
+
+
+class BulletinViewSet(
+    ProfilingMixin,
+    ReplicaReadMixin,
+    ExportMixin,
+    AnonymousListCacheMixin,
+    ConditionalRetrieveMixin,
+    ConditionalListMixin,
+    ValuesListMixin,
+    ModelViewSet,
+):
     """
     API endpoint, который позволяет просматривать, редактировать и удалять объявления.
+    Список объявлений для анонимов отдаётся из кэша (см. bulletin.cache), list и me строятся без создания
+    моделей (см. ValuesListMixin), list и retrieve отвечают 304 на условные запросы (см. bulletin.conditional).
+    Безопасные запросы читают с реплики (см. config.db_router), администраторам доступна потоковая выгрузка
+    /bulletins/export/ (см. bulletin.export).
     :param queryset: объекты Bulletin
     :param serializer_class: сериализатор класса Bulletin
     :param permission_classes: классы уровней доступа
     :param pagination_class: пагинатор
-    :filter_backends: фильтры
+    :filter_backends: фильтры; полнотекстовый поиск — ?q=, поиск по вхождению в наименование — ?search=
     :filterset_fields: поля для фильтрации
     """
 
-    queryset = Bulletin.objects.all().order_by("-created_at")
+    queryset = Bulletin.objects.defer("search_vector").order_by("-created_at", "-id")
     permission_classes = [IsAuthorOrAdminOrReadOnlyForBulletins]
     pagination_class = BulletinPagination
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter, BulletinFullTextSearchFilter, filters.OrderingFilter]
     filterset_fields = ["title"]
     search_fields = ["title"]
     ordering_fields = ["title", "price", "created_at"]
+    values_serializer = ValuesRowSerializer(BulletinListSerializer)
+    export_fields = (
+        "id",
+        "title",
+        "price",
+        "description",
+        "author_id",
+        "created_at",
+        "review_count",
+        "last_review_at",
+    )
+    export_name = "bulletins"
 
     def get_serializer_class(self):  # type: ignore
         if self.action == "list" or self.action == "me":
@@ -40,25 +112,86 @@ class BulletinViewSet(ModelViewSet):
             return BulletinDetailSerializer
         return BulletinCreateSerializer
 
+    def list_response(self, queryset):
+        """
+        Ответ списка строится из строк .values() (см. ValuesListMixin).
+        """
+        return self.values_list_response(queryset)
+
+    def get_export_queryset(self):
+        """
+        Все объявления для выгрузки.
+        """
+        return Bulletin.objects.all()
+
     @action(detail=False, methods=["get"], permission_classes=[IsAuthorOrAdminOrReadOnlyForBulletins])
     def me(self, request):
         """
         Возвращает объявления текущего пользователя.
         URL: /api/bulletin/bulletins/me/
         """
-        bulletins = self.queryset.filter(author=request.user)
-        page = self.paginate_queryset(bulletins)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+        return self.values_list_response(self.queryset.filter(author=request.user))
 
-        serializer = self.get_serializer(bulletins, many=True)
-        return Response(serializer.data)
+    @action(detail=False, methods=["post", "patch"])
+    def bulk(self, request):
+        """
+        Массовое создание (POST) и частичное обновление по id (PATCH) объявлений (см. BulletinBulkSerializer).
+        URL: /api/bulletin/bulletins/bulk/
+        Тело — список объявлений, не больше BULLETIN_BULK_MAX_ITEMS. Параметр ?atomic=true|false (по умолчанию
+        BULLETIN_BULK_ATOMIC): при false валидные элементы сохраняются, а ошибки остальных возвращаются в results.
+        Ответ: {"saved": N, "failed": M, "results": [{"id": ...} или {"errors": {...}} — по элементу запроса]}.
+        """
+        creating = request.method == "POST"
+        atomic = request.query_params.get("atomic", str(settings.BULLETIN_BULK_ATOMIC)).lower() in ("true", "1")
+        serializer = self.get_serializer(
+            None if creating else self.get_bulk_instances(request.data),
+            data=request.data,
+            many=True,
+            partial=not creating,
+            max_length=settings.BULLETIN_BULK_MAX_ITEMS,
+            context={**self.get_serializer_context(), "atomic": atomic},
+        )
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            bulletins = serializer.save(author=request.user) if creating else serializer.save()
+
+        # Результат по каждому элементу запроса, в его порядке
+        results = [None] * len(request.data)
+        for position, bulletin in zip(serializer.item_positions, bulletins):
+            results[position] = {"id": bulletin.pk}
+        for position, errors in serializer.item_errors.items():
+            results[position] = {"errors": errors}
+
+        if not bulletins:
+            response_status = status.HTTP_400_BAD_REQUEST
+        else:
+            response_status = status.HTTP_201_CREATED if creating else status.HTTP_200_OK
+        return Response(
+            {"saved": len(bulletins), "failed": len(serializer.item_errors), "results": results},
+            status=response_status,
+        )
 
+    def get_bulk_instances(self, data):
+        """
+        Загружает одним запросом объявления из списка на обновление, которые пользователь может менять.
 
-class ReviewViewSet(ModelViewSet):
+        :param data: Тело запроса
+        :return: Словарь {id: Bulletin}
+        """
+        if not isinstance(data, list):
+            return {}
+        ids = [pk for pk in map(bulk_item_id, data[: settings.BULLETIN_BULK_MAX_ITEMS]) if pk is not None]
+        queryset = self.queryset.filter(pk__in=ids)
+        if not request_is_admin(self.request):
+            queryset = queryset.filter(author=self.request.user)
+        return {bulletin.pk: bulletin for bulletin in queryset}
+
+
+class ReviewViewSet(ProfilingMixin, ReplicaReadMixin, ExportMixin, ConditionalListMixin, ModelViewSet):
     """
     API endpoint, который позволяет просматривать, редактировать и удалять отзывы.
+    Список отзывов отвечает 304 на условные запросы (см. bulletin.conditional), безопасные запросы читают с реплики.
+    Администраторам доступна потоковая выгрузка отзывов объявления /bulletins/<id>/reviews/export/.
     :param queryset: Объекты Review
     :param serializer_class: сериализатор класса Review
     :param permission_classes: классы уровней доступа
@@ -70,30 +203,54 @@ class ReviewViewSet(ModelViewSet):
     pagination_class = ReviewPagination
     search_fields = ["text", "created_at"]
     ordering_fields = ["created_at"]
+    export_fields = ("id", "bulletin_id", "author_id", "text", "created_at")
+    export_name = "reviews"
 
     def get_queryset(self):  # type: ignore
+        """
+        Возвращает отзывы объявления. Существование объявления здесь не проверяется отдельным запросом:
+        для retrieve/update/destroy отсутствие объявления даёт 404 при поиске отзыва,
+        для list — см. get_list_validators().
+        """
         bulletin_id = self.kwargs.get("bulletin_pk")
         if not bulletin_id:
             return Review.objects.none()
+        return Review.objects.filter(bulletin_id=bulletin_id).order_by("-created_at", "-id")
+
+    def get_bulletin(self):
+        """
+        Возвращает объявление из URL (только id — данные для уведомления загружаются при сбросе журнала)
+        или выбрасывает NotFound.
+        """
         try:
-            Bulletin.objects.get(pk=bulletin_id)
+            return Bulletin.objects.only("id").get(pk=self.kwargs.get("bulletin_pk"))
         except Bulletin.DoesNotExist:
             raise NotFound("Объявление не найдено.")
-        return Review.objects.filter(bulletin_id=bulletin_id).order_by("-created_at")
+
+    def get_export_queryset(self):
+        """
+        Отзывы объявления для выгрузки; для несуществующего объявления — 404.
+        """
+        return Review.objects.filter(bulletin=self.get_bulletin())
+
+    def get_list_validators(self, queryset):
+        """
+        Вычисляет валидаторы списка отзывов.
+        Проверка существования объявления выполняется только для пустой выдачи — иначе отзывы уже её доказывают —
+        и только на вложенном маршруте: плоский /reviews/ объявления не указывает.
+        """
+        validators = super().get_list_validators(queryset)
+        bulletin_id = self.kwargs.get("bulletin_pk")
+        if validators is None and bulletin_id and not Bulletin.objects.filter(pk=bulletin_id).exists():
+            raise NotFound("Объявление не найдено.")
+        return validators
 
     def perform_create(self, serializer):  # type: ignore
         """
         Сохраняет новый отзыв, устанавливая текущего пользователя автором и передавая bulletin.
         """
-        bulletin = get_object_or_404(Bulletin, pk=self.kwargs["bulletin_pk"])
+        bulletin = self.get_bulletin()
         review = serializer.save(author=self.request.user, bulletin=bulletin)
 
-        # Отправляем письмо владельцу объявления
-        send_review_notification_email.delay(  # type: ignore
-            email=bulletin.author.email,
-            bulletin_id=bulletin.id,
-            bulletin_title=bulletin.title,
-            bulletin_author=bulletin.author.email,
-            review_author=review.author.email,
-            review_text=review.text,
-        )
+        # Уведомление владельцу объявления уйдёт в ближайшем дайджесте (см. bulletin.notifications)
+        transaction.on_commit(partial(enqueue_review_notification, review.pk))
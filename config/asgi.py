@@ -12,5 +12,12 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+# Приложение ASGI включает асинхронные вьюхи чтения (см. bulletin.async_views)
+os.environ.setdefault("SERVER_MODE", "asgi")
 
 application = get_asgi_application()
+
+# Импорт после создания приложения: модулю нужны загруженные настройки
+from config.db_pool import start_stats_publisher  # noqa: E402
+
+start_stats_publisher()
@@ -1,9 +1,21 @@
 import os
 
 from celery import Celery
+from celery.signals import worker_process_init
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 app = Celery("bulletin_board")
 app.config_from_object("django.conf:settings", namespace="CELERY")
 app.autodiscover_tasks()
+
+
+@worker_process_init.connect
+def start_db_pool_stats(**kwargs):
+    """
+    Запускает публикацию статистики пула подключений в дочернем процессе воркера (см. config.db_pool).
+    Модуль импортируется здесь: config.celery загружается раньше настроек Django.
+    """
+    from config.db_pool import start_stats_publisher
+
+    start_stats_publisher()
@@ -0,0 +1,89 @@
+# config/db_pool.py
+"""
+Метрики пула подключений к PostgreSQL (встроенный пул Django на psycopg 3, см. DATABASES в config/settings.py).
+
+У каждого процесса — воркера Gunicorn/uvicorn или дочернего процесса Celery — свой пул. Фоновый поток процесса
+раз в DB_POOL_STATS_INTERVAL секунд забирает накопленную статистику пула (pop_stats) и добавляет её к общим
+счётчикам config.metrics с ролью процесса в имени — db_pool.web.* или db_pool.celery.*:
+- requests — выдачи подключения из пула;
+- requests_queued — выдачи, которым пришлось ждать свободного подключения (признак насыщения пула);
+- wait_ms — суммарное время этого ожидания;
+- timeouts — запросы, не дождавшиеся подключения за DB_POOL_TIMEOUT;
+- connections_opened, connect_ms — новые подключения к базе и время на их установку;
+- returns_bad, connections_lost — подключения, отброшенные при возврате в пул и при проверке перед выдачей.
+"""
+
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections
+
+from config import metrics
+
+# Ключ статистики psycopg_pool → имя счётчика
+STATS_METRICS = {
+    "requests_num": "requests",
+    "requests_queued": "requests_queued",
+    "requests_wait_ms": "wait_ms",
+    "requests_errors": "timeouts",
+    "connections_num": "connections_opened",
+    "connections_ms": "connect_ms",
+    "returns_bad": "returns_bad",
+    "connections_lost": "connections_lost",
+}
+
+logger = logging.getLogger(__name__)
+
+metrics.register(*(f"db_pool.{settings.DB_ROLE}.{name}" for name in STATS_METRICS.values()))
+
+_publisher_pid = None
+
+
+def get_pools():
+    """
+    Возвращает пулы подключений процесса (объект пула создаётся без открытия подключений).
+    """
+    return [
+        connection.pool
+        for connection in connections.all()
+        if connection.vendor == "postgresql" and connection.settings_dict["OPTIONS"].get("pool")
+    ]
+
+
+def publish_pool_stats():
+    """
+    Переносит накопленную с прошлого вызова статистику пулов процесса в общие счётчики.
+    """
+    for pool in get_pools():
+        stats = pool.pop_stats()
+        for key, name in STATS_METRICS.items():
+            if stats.get(key):
+                metrics.incr(f"db_pool.{settings.DB_ROLE}.{name}", stats[key])
+
+
+def start_stats_publisher():
+    """
+    Запускает фоновый поток публикации статистики пула в текущем процессе (один раз на процесс).
+    Вызывается при старте веб-приложения (config/wsgi.py, config/asgi.py) и дочернего процесса Celery.
+    """
+    global _publisher_pid
+    if not settings.DB_POOL or _publisher_pid == os.getpid():
+        return
+    _publisher_pid = os.getpid()
+    threading.Thread(target=run_publisher, name="db-pool-stats", daemon=True).start()
+
+
+def run_publisher():
+    """
+    Цикл фонового потока: публикует статистику раз в DB_POOL_STATS_INTERVAL секунд.
+    """
+    while True:
+        time.sleep(settings.DB_POOL_STATS_INTERVAL)
+        try:
+            publish_pool_stats()
+        except Exception:
+            # Недоступный кэш не должен останавливать поток; статистика этого интервала теряется
+            logger.exception("Не удалось опубликовать статистику пула подключений")
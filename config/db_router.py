@@ -0,0 +1,206 @@
+# config/db_router.py
+"""
+Чтение с реплик PostgreSQL (алиасы из DATABASE_REPLICAS, см. DB_REPLICA_HOSTS в config/settings.py).
+
+Запись всегда идёт в default. Чтение уходит на реплику только внутри reading_from() — его включают
+безопасные запросы (GET/HEAD/OPTIONS) вьюх с ReplicaReadMixin и асинхронные вьюхи чтения (bulletin.async_views).
+Всё остальное, включая фоновые задачи Celery, читает из default.
+
+Чтение своих записей: после успешного небезопасного запроса ReplicaPinMiddleware ставит cookie DB_PIN_COOKIE
+и заголовок X-DB-Pin со временем (unix), до которого клиент читает из default. Клиенты без cookie могут вернуть
+значение в заголовке X-DB-Pin следующих запросов.
+
+Отставание реплик проверяется не чаще раза в DB_REPLICA_LAG_CHECK_INTERVAL секунд на процесс; реплика,
+отставшая больше чем на DB_REPLICA_MAX_LAG секунд или недоступная, не используется до следующей проверки.
+Если подходящей реплики нет, чтение идёт в default.
+"""
+
+import contextlib
+import logging
+import random
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.utils.decorators import sync_and_async_middleware
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from rest_framework.permissions import SAFE_METHODS
+
+from config import metrics
+
+PIN_HEADER = "X-DB-Pin"
+
+# Отставание реплики PostgreSQL, секунды; 0, если реплика применила всё полученное
+LAG_QUERY = (
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+logger = logging.getLogger(__name__)
+
+metrics.register("db_router.lag_fallbacks")
+
+# Алиас базы для чтения в текущем запросе (None — default)
+read_alias: ContextVar[str | None] = ContextVar("read_alias", default=None)
+
+# Результаты проверки отставания процесса: {алиас: (время проверки по monotonic, годна ли реплика)}
+_replica_health: dict[str, tuple[float, bool]] = {}
+
+
+class ReplicaRouter:
+    """
+    Роутер баз данных: чтение — из алиаса read_alias (реплика запроса), запись — в default.
+    """
+
+    def db_for_read(self, model, **hints):
+        return read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики — копии default: объекты, прочитанные с реплики, можно связывать с записанными в default
+        databases = {"default", *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+def replica_lag(alias):
+    """
+    Возвращает отставание реплики в секундах или None, если реплика недоступна.
+
+    :param alias: Алиас реплики
+    """
+    connection = connections[alias]
+    if connection.vendor != "postgresql":
+        return 0.0
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(LAG_QUERY)
+            return float(cursor.fetchone()[0])
+    except DatabaseError:
+        logger.warning("Реплика %s недоступна", alias, exc_info=True)
+        return None
+
+
+def health_check_due(alias):
+    """
+    Проверяет, пора ли заново измерить отставание реплики.
+
+    :param alias: Алиас реплики
+    """
+    checked_at = _replica_health.get(alias, (None, False))[0]
+    return checked_at is None or time.monotonic() - checked_at >= settings.DB_REPLICA_LAG_CHECK_INTERVAL
+
+
+def is_replica_healthy(alias):
+    """
+    Проверяет (с кэшированием на DB_REPLICA_LAG_CHECK_INTERVAL секунд), можно ли читать с реплики.
+
+    :param alias: Алиас реплики
+    """
+    if health_check_due(alias):
+        lag = replica_lag(alias)
+        healthy = lag is not None and lag <= settings.DB_REPLICA_MAX_LAG
+        if not healthy:
+            metrics.incr("db_router.lag_fallbacks")
+        _replica_health[alias] = (time.monotonic(), healthy)
+    return _replica_health[alias][1]
+
+
+def is_pinned(request):
+    """
+    Проверяет, читает ли клиент из default после своей записи (cookie или заголовок X-DB-Pin).
+
+    :param request: HttpRequest
+    """
+    value = request.COOKIES.get(settings.DB_PIN_COOKIE) or request.headers.get(PIN_HEADER)
+    try:
+        return float(value) > time.time()
+    except (TypeError, ValueError):
+        return False
+
+
+def choose_replica(request):
+    """
+    Выбирает реплику для чтения в запросе.
+
+    :param request: HttpRequest
+    :return: Алиас реплики или None, если читать нужно из default
+    """
+    if not settings.DATABASE_REPLICAS or request.method not in SAFE_METHODS or is_pinned(request):
+        return None
+    replicas = [alias for alias in settings.DATABASE_REPLICAS if is_replica_healthy(alias)]
+    return random.choice(replicas) if replicas else None
+
+
+async def achoose_replica(request):
+    """
+    Асинхронный choose_replica: проверка отставания (запрос к реплике) выполняется в потоке.
+    """
+    if any(health_check_due(alias) for alias in settings.DATABASE_REPLICAS):
+        return await sync_to_async(choose_replica)(request)
+    return choose_replica(request)
+
+
+@contextlib.contextmanager
+def reading_from(alias):
+    """
+    Направляет чтение ORM внутри блока в базу alias (None — default).
+
+    :param alias: Алиас базы
+    """
+    token = read_alias.set(alias)
+    try:
+        yield
+    finally:
+        read_alias.reset(token)
+
+
+class ReplicaReadMixin:
+    """
+    Миксин вьюхи DRF: безопасные запросы читают с реплики (аутентификация — тоже).
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        with reading_from(choose_replica(request)):
+            return super().dispatch(request, *args, **kwargs)  # type: ignore[misc]
+
+
+def pin_to_primary(request, response):
+    """
+    После успешной записи закрепляет клиента за default на DB_REPLICA_PIN_SECONDS секунд.
+    """
+    if not settings.DATABASE_REPLICAS or request.method in SAFE_METHODS or response.status_code >= 400:
+        return response
+    pinned_until = str(int(time.time() + settings.DB_REPLICA_PIN_SECONDS) + 1)
+    response.set_cookie(
+        settings.DB_PIN_COOKIE,
+        pinned_until,
+        max_age=settings.DB_REPLICA_PIN_SECONDS + 1,
+        httponly=True,
+        samesite="Lax",
+    )
+    response[PIN_HEADER] = pinned_until
+    return response
+
+
+@sync_and_async_middleware
+def ReplicaPinMiddleware(get_response):
+    """
+    Middleware чтения своих записей (см. pin_to_primary). Работает без переключения потоков и в режиме ASGI.
+    """
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            return pin_to_primary(request, await get_response(request))
+
+    else:
+
+        def middleware(request):
+            return pin_to_primary(request, get_response(request))
+
+    return middleware
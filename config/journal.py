@@ -0,0 +1,106 @@
+# config/journal.py
+"""
+Журнал в общем кэше (Redis) для записей, которые копятся в запросах и сбрасываются периодической задачей пачками.
+
+Номер записи берётся из атомарного счётчика <префикс>:seq, запись хранится под ключом <префикс>:item:<номер>.
+Сброс читает журнал от курсора <префикс>:cursor, обрабатывает прочитанное и сдвигает курсор (commit) только
+после успешной обработки, поэтому при сбое записи будут обработаны повторно (доставка «хотя бы один раз»).
+Одновременно выполняется только один сброс (блокировка <префикс>:flush:lock).
+
+Используется уведомлениями об отзывах (bulletin.notifications) и учётом входов (user.logins).
+"""
+
+import contextlib
+
+from django.core.cache import cache
+
+ITEM_TIMEOUT = 7 * 24 * 60 * 60
+FLUSH_LOCK_TIMEOUT = 10 * 60
+
+
+class CacheJournal:
+    """
+    Журнал с нумерованными записями в кэше (см. модуль).
+
+    :param prefix: Префикс ключей журнала
+    """
+
+    def __init__(self, prefix):
+        self.seq_key = f"{prefix}:seq"
+        self.cursor_key = f"{prefix}:cursor"
+        self.gap_key = f"{prefix}:gap"
+        self.flush_lock_key = f"{prefix}:flush:lock"
+        self.item_key = f"{prefix}:item:{{}}"
+
+    def next_sequence(self):
+        """
+        Возвращает следующий номер записи журнала.
+        """
+        try:
+            return cache.incr(self.seq_key)
+        except ValueError:
+            cache.add(self.seq_key, 0, timeout=None)
+            return cache.incr(self.seq_key)
+
+    def append(self, value):
+        """
+        Записывает значение в конец журнала.
+
+        :param value: Значение записи (не None)
+        """
+        cache.set(self.item_key.format(self.next_sequence()), value, ITEM_TIMEOUT)
+
+    def read_pending(self, batch_size):
+        """
+        Читает записи журнала от курсора до текущего номера.
+
+        Номер выдаётся до записи элемента, поэтому отсутствующая запись может быть ещё не дописана: чтение
+        останавливается на ней до следующего сброса. Если запись отсутствует и при следующем сбросе
+        (истекла или процесс упал между двумя операциями), она пропускается.
+
+        :param batch_size: Сколько записей читать одним get_many
+        :return: Кортеж (значения записей, номер последней прочитанной записи, номер курсора до чтения)
+        """
+        cursor = cache.get(self.cursor_key, 0)
+        end = cache.get(self.seq_key, 0)
+        if cursor > end:
+            # Счётчик потерян (например, Redis перезапущен без данных) — начинаем журнал заново
+            cursor = 0
+
+        values = []
+        position = cursor
+        for start in range(cursor + 1, end + 1, batch_size):
+            numbers = range(start, min(start + batch_size, end + 1))
+            found = cache.get_many([self.item_key.format(number) for number in numbers])
+            for number in numbers:
+                value = found.get(self.item_key.format(number))
+                if value is None and cache.get(self.gap_key) != number:
+                    cache.set(self.gap_key, number, timeout=None)
+                    return values, position, cursor
+                if value is not None:
+                    values.append(value)
+                position = number
+        return values, position, cursor
+
+    def commit(self, position, cursor):
+        """
+        Сдвигает курсор на обработанную позицию и удаляет прочитанные записи.
+
+        :param position: Номер последней обработанной записи (из read_pending)
+        :param cursor: Номер курсора до чтения (из read_pending)
+        """
+        cache.set(self.cursor_key, position, timeout=None)
+        cache.delete_many([self.item_key.format(number) for number in range(cursor + 1, position + 1)])
+
+    @contextlib.contextmanager
+    def flushing(self):
+        """
+        Блокировка сброса: отдаёт True, если блокировка взята, и False, если сброс уже выполняется.
+        """
+        if not cache.add(self.flush_lock_key, 1, timeout=FLUSH_LOCK_TIMEOUT):
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            cache.delete(self.flush_lock_key)
@@ -0,0 +1,64 @@
+# config/metrics.py
+"""
+Простые счётчики метрик в общем кэше (Redis), видимые всем процессам web и celery.
+
+Имена счётчиков регистрируются при импорте модулей, которые их используют, поэтому снимок метрик
+(эндпоинт /api/metrics/) знает обо всех счётчиках без сканирования ключей Redis.
+"""
+
+from django.core.cache import cache
+
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+KEY_PREFIX = "metrics:"
+
+_registry: set[str] = set()
+
+
+def register(*names):
+    """
+    Регистрирует имена счётчиков, чтобы они попадали в снимок метрик.
+
+    :param names: Имена счётчиков
+    """
+    _registry.update(names)
+
+
+def incr(name, delta=1):
+    """
+    Атомарно увеличивает счётчик.
+
+    :param name: Имя счётчика
+    :param delta: Величина увеличения
+    """
+    register(name)
+    key = KEY_PREFIX + name
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        # Счётчика ещё нет: создаём без срока жизни, add не затрёт значение, созданное параллельно
+        cache.add(key, 0, timeout=None)
+        cache.incr(key, delta)
+
+
+def snapshot():
+    """
+    Возвращает текущие значения всех зарегистрированных счётчиков.
+
+    :return: Словарь {имя: значение}
+    """
+    values = cache.get_many([KEY_PREFIX + name for name in _registry])
+    return {name: values.get(KEY_PREFIX + name, 0) for name in sorted(_registry)}
+
+
+class MetricsAPIView(APIView):
+    """
+    Возвращает снимок счётчиков метрик. Доступно только сотрудникам (is_staff).
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(snapshot())
@@ -0,0 +1,25 @@
+# config/parsers.py
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+
+class ORJSONParser(JSONParser):
+    """
+    Быстрый JSON-парсер на orjson для тел запросов application/json.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """
+        Разбирает тело запроса.
+
+        :param stream: Поток с телом запроса
+        :param media_type: Тип содержимого
+        :param parser_context: Контекст парсера
+        :return: Разобранные данные
+        :raises ParseError: Если тело запроса — некорректный JSON
+        """
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
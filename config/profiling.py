@@ -0,0 +1,246 @@
+# config/profiling.py
+"""
+Профилирование запросов: число и время запросов к базе, время аутентификации, проверки прав, сериализатора
+и рендеринга ответа.
+
+Включается переменной окружения PROFILING=True: тогда первым в MIDDLEWARE стоит ProfilingMiddleware. Он
+заводит на запрос объект Profile (в ContextVar, поэтому его видят и потоки sync_to_async в режиме ASGI) и
+добавляет к ответу заголовок Server-Timing, а в лог config.profiling — строку с замерами. Если запрос
+дольше PROFILING_SLOW_MS или сделал больше PROFILING_MAX_QUERIES запросов к базе, в лог (уровень WARNING)
+попадает и список его запросов — SQL без параметров, не больше PROFILING_QUERY_LOG_LIMIT.
+
+Запросы к базе считает обёртка execute_wrapper, которую middleware ставит на каждое подключение процесса
+(сигнал connection_created; подключения, открытые раньше, — ProfilingMixin.initial). Стадии вьюхи замеряет
+ProfilingMixin. Без PROFILING обёртки не ставятся,
+а методы миксина сводятся к одному ContextVar.get().
+
+Отрезки Server-Timing перекрываются: время сериализатора включает запросы ленивых queryset, которые он выполнил.
+"""
+
+import contextlib
+import logging
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template.response import SimpleTemplateResponse
+from django.utils.decorators import sync_and_async_middleware
+
+import orjson
+from asgiref.sync import iscoroutinefunction
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("auth", "permissions", "serializer", "render")
+
+# Профиль текущего запроса (None — запрос не профилируется)
+current_profile: ContextVar["Profile | None"] = ContextVar("current_profile", default=None)
+
+_not_profiled = contextlib.nullcontext()
+
+
+class Profile:
+    """
+    Замеры одного запроса. Время — в секундах.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = dict.fromkeys(STAGES, 0.0)
+        self.query_count = 0
+        self.db_time = 0.0
+        self.queries = []
+
+    def add_query(self, alias, sql, duration):
+        self.query_count += 1
+        self.db_time += duration
+        if len(self.queries) < settings.PROFILING_QUERY_LOG_LIMIT:
+            self.queries.append({"db": alias, "sql": sql, "ms": round(duration * 1000, 3)})
+
+    @contextlib.contextmanager
+    def measure(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[stage] += time.perf_counter() - started
+
+
+def measure(stage):
+    """
+    Замеряет блок как стадию stage профиля текущего запроса; без профиля ничего не делает.
+
+    :param stage: Стадия из STAGES
+    :return: Контекстный менеджер
+    """
+    profile = current_profile.get()
+    return profile.measure(stage) if profile is not None else _not_profiled
+
+
+def profile_query(execute, sql, params, many, context):
+    """
+    Обёртка execute_wrapper: учитывает запрос в профиле текущего запроса.
+    """
+    profile = current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.add_query(context["connection"].alias, sql, time.perf_counter() - started)
+
+
+def install_query_wrapper(connection, **kwargs):
+    """
+    Ставит profile_query на подключение. Обёртка ставится первой в списке — ближе всего к базе, — чтобы
+    контекстные execute_wrapper() других модулей снимали свои обёртки, а не эту.
+    """
+    if profile_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, profile_query)
+
+
+def install_query_wrappers():
+    """
+    Ставит profile_query на уже открытые подключения текущего потока — их сигнал connection_created не застал.
+    """
+    for connection in connections.all(initialized_only=True):
+        install_query_wrapper(connection)
+
+
+def server_timing(profile, total):
+    """
+    Возвращает значение заголовка Server-Timing.
+    """
+    entries = [f'db;dur={profile.db_time * 1000:.1f};desc="{profile.query_count} queries"']
+    entries += [f"{stage};dur={duration * 1000:.1f}" for stage, duration in profile.stages.items() if duration]
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+
+def finish(request, response, profile):
+    """
+    Дописывает Server-Timing к ответу и пишет замеры запроса в лог.
+    """
+    total = time.perf_counter() - profile.started
+    response["Server-Timing"] = server_timing(profile, total)
+
+    record = {
+        "method": request.method,
+        "path": request.path,
+        "status": response.status_code,
+        "total_ms": round(total * 1000, 1),
+        "db_ms": round(profile.db_time * 1000, 1),
+        "queries": profile.query_count,
+        **{f"{stage}_ms": round(duration * 1000, 1) for stage, duration in profile.stages.items()},
+    }
+    slow = total * 1000 > settings.PROFILING_SLOW_MS or profile.query_count > settings.PROFILING_MAX_QUERIES
+    if slow:
+        record["query_log"] = profile.queries
+    logger.log(logging.WARNING if slow else logging.INFO, orjson.dumps(record).decode(), extra={"profile": record})
+    return response
+
+
+@sync_and_async_middleware
+def ProfilingMiddleware(get_response):
+    """
+    Middleware профилирования запросов (см. модуль). Ставится первым в MIDDLEWARE при PROFILING=True.
+    """
+    connection_created.connect(install_query_wrapper, dispatch_uid="config.profiling")
+    install_query_wrappers()
+
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            profile = Profile()
+            token = current_profile.set(profile)
+            try:
+                return finish(request, await get_response(request), profile)
+            finally:
+                current_profile.reset(token)
+
+    else:
+
+        def middleware(request):
+            profile = Profile()
+            token = current_profile.set(profile)
+            try:
+                return finish(request, get_response(request), profile)
+            finally:
+                current_profile.reset(token)
+
+    return middleware
+
+
+class ProfilingMixin:
+    """
+    Миксин вьюхи DRF: замеряет аутентификацию, проверку прав, сериализатор и рендеринг ответа в профиле
+    запроса (см. ProfilingMiddleware). Ставится первым в списке базовых классов.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        if current_profile.get() is not None:
+            install_query_wrappers()
+        super().initial(request, *args, **kwargs)  # type: ignore[misc]
+
+    def perform_authentication(self, request):
+        with measure("auth"):
+            super().perform_authentication(request)  # type: ignore[misc]
+
+    def check_permissions(self, request):
+        with measure("permissions"):
+            super().check_permissions(request)  # type: ignore[misc]
+
+    def check_object_permissions(self, request, obj):
+        with measure("permissions"):
+            super().check_object_permissions(request, obj)  # type: ignore[misc]
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)  # type: ignore[misc]
+        if current_profile.get() is not None:
+            serializer.__class__ = profiled_serializer_class(serializer.__class__)
+        return serializer
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)  # type: ignore[misc]
+        profile = current_profile.get()
+        if profile is not None and isinstance(response, SimpleTemplateResponse) and not response.is_rendered:
+            # Ответ DRF рендерится после выхода из вьюхи — замер от этой точки до конца рендеринга
+            started = time.perf_counter()
+
+            def rendered(response):
+                profile.stages["render"] += time.perf_counter() - started
+
+            response.add_post_render_callback(rendered)
+        return response
+
+
+class ProfiledSerializerMixin:
+    """
+    Замеряет валидацию и получение data сериализатора.
+    """
+
+    def is_valid(self, *args, **kwargs):
+        with measure("serializer"):
+            return super().is_valid(*args, **kwargs)  # type: ignore[misc]
+
+    @property
+    def data(self):
+        with measure("serializer"):
+            return super().data  # type: ignore[misc]
+
+
+_profiled_serializer_classes: dict[type, type] = {}
+
+
+def profiled_serializer_class(serializer_class):
+    """
+    Возвращает подкласс сериализатора с замерами (ProfiledSerializerMixin), создавая его один раз.
+    """
+    profiled = _profiled_serializer_classes.get(serializer_class)
+    if profiled is None:
+        profiled = type(serializer_class.__name__, (ProfiledSerializerMixin, serializer_class), {})
+        _profiled_serializer_classes[serializer_class] = profiled
+    return profiled
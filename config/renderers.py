@@ -0,0 +1,34 @@
+# config/renderers.py
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Быстрый JSON-рендерер на orjson. Выдаёт тот же JSON, что и стандартный JSONRenderer DRF
+    (компактный, UTF-8 без экранирования, datetime в ISO 8601 с 'Z' для UTC), но в разы быстрее.
+
+    datetime, date, time и UUID сериализуются самим orjson; Decimal, ленивые строки, timedelta и прочие типы,
+    которые orjson не знает, передаются стандартному JSONEncoder DRF.
+    """
+
+    options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+    encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Рендерит данные в байты JSON.
+
+        :param data: Данные ответа
+        :param accepted_media_type: Согласованный тип содержимого (может содержать indent=...)
+        :param renderer_context: Контекст рендеринга
+        :return: JSON в виде bytes
+        """
+        if data is None:
+            return b""
+
+        option = self.options
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=self.encoder.default, option=option)
@@ -4,12 +4,13 @@ Django settings for config project.
 Generated by 'django-admin startproject' using Django 5.2.1.
 """
 
+import copy
 import os
 import sys
 from datetime import timedelta
 from pathlib import Path
 
-from config.utils import get_env
+from config.utils import get_env, get_role_env
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -25,6 +26,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 ]  # Встроенные приложения
 INSTALLED_APPS += [
     "corsheaders",
@@ -45,6 +47,7 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 MIDDLEWARE += ["corsheaders.middleware.CorsMiddleware"]  # Сторонние приложения
+MIDDLEWARE += ["config.db_router.ReplicaPinMiddleware"]  # Чтение своих записей при чтении с реплик
 
 ROOT_URLCONF = "config.urls"
 
@@ -68,18 +71,94 @@ WSGI_APPLICATION = "config.wsgi.application"
 
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql_psycopg2",
+        "ENGINE": "django.db.backends.postgresql",
         "NAME": get_env("DB_NAME", required=True),
         "USER": get_env("DB_USER", required=True),
         "PASSWORD": get_env("DB_PASSWORD", required=True),
         "HOST": get_env("DB_HOST", required=True),
         "PORT": get_env("DB_PORT", required=True),
+        # Проверка подключения перед выдачей запросу (для пула — check при выдаче из пула)
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
-# Настройка лёгкой БД для тестов
+# Подключения к базе. Веб-процессы и воркеры Celery настраиваются раздельно: в воркере Celery переменные
+# читаются с префиксом CELERY_ (CELERY_DB_POOL_MAX_SIZE и т. д.), а если он не задан — без префикса.
+# Пул (psycopg 3) — на процесс: число подключений к PostgreSQL не превысит
+# (воркеры web × DB_POOL_MAX_SIZE) + (процессы Celery × CELERY_DB_POOL_MAX_SIZE).
+# Воркер sync Gunicorn и процесс Celery выполняют один запрос или задачу за раз — им хватает пары подключений;
+# у воркера gthread (WEB_THREADS > 1) запросов одновременно столько, сколько потоков, — пул по умолчанию не меньше;
+# в режиме ASGI запросы идут параллельно в потоках sync_to_async, и размер пула стоит увеличить.
+WEB_THREADS = int(get_env("WEB_THREADS", default=1))  # потоков на воркер Gunicorn (см. entrypoint-web.sh)
+DB_ROLE = "celery" if "celery" in sys.argv[0] else "web"
+DB_ENV_PREFIX = "CELERY_" if DB_ROLE == "celery" else ""
+DB_POOL = get_role_env("DB_POOL", DB_ENV_PREFIX, default="True") == "True"
+if DB_POOL:
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "name": DB_ROLE,
+            "min_size": int(get_role_env("DB_POOL_MIN_SIZE", DB_ENV_PREFIX, default=1)),
+            "max_size": int(
+                get_role_env(
+                    "DB_POOL_MAX_SIZE", DB_ENV_PREFIX, default=2 if DB_ROLE == "celery" else max(4, WEB_THREADS)
+                )
+            ),
+            # Сколько секунд запрос ждёт свободного подключения, прежде чем получить ошибку
+            "timeout": float(get_role_env("DB_POOL_TIMEOUT", DB_ENV_PREFIX, default=10)),
+            # Простаивающие сверх min_size подключения закрываются, все — пересоздаются раз в max_lifetime
+            "max_idle": float(get_role_env("DB_POOL_MAX_IDLE", DB_ENV_PREFIX, default=300)),
+            "max_lifetime": float(get_role_env("DB_POOL_MAX_LIFETIME", DB_ENV_PREFIX, default=1800)),
+        }
+    }
+else:
+    # Без пула — постоянные подключения: одно на поток, переиспользуется запросами до DB_CONN_MAX_AGE секунд
+    DATABASES["default"]["CONN_MAX_AGE"] = int(get_role_env("DB_CONN_MAX_AGE", DB_ENV_PREFIX, default=60))
+# Как часто процесс добавляет статистику пула к общим метрикам, секунды (см. config.db_pool)
+DB_POOL_STATS_INTERVAL = int(get_env("DB_POOL_STATS_INTERVAL", default=30))
+
+# Реплики только для чтения: DB_REPLICA_HOSTS=host1,host2:5433 — алиасы replica_1, replica_2 с остальными
+# параметрами default. С реплик читают безопасные запросы списков и карточек (см. config.db_router).
+DATABASE_REPLICAS = []
+for number, replica in enumerate(filter(None, get_env("DB_REPLICA_HOSTS", default="").split(",")), 1):
+    host, _, port = replica.strip().partition(":")
+    alias = f"replica_{number}"
+    DATABASES[alias] = {
+        **copy.deepcopy(DATABASES["default"]),
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+    }
+    if DB_POOL:
+        DATABASES[alias]["OPTIONS"]["pool"]["name"] = f"{DB_ROLE}-{alias}"
+    DATABASE_REPLICAS.append(alias)
+DATABASE_ROUTERS = ["config.db_router.ReplicaRouter"]
+# Реплика, отставшая больше чем на DB_REPLICA_MAX_LAG секунд, не используется; отставание проверяется
+# не чаще раза в DB_REPLICA_LAG_CHECK_INTERVAL секунд на процесс
+DB_REPLICA_MAX_LAG = float(get_env("DB_REPLICA_MAX_LAG", default=5))
+DB_REPLICA_LAG_CHECK_INTERVAL = float(get_env("DB_REPLICA_LAG_CHECK_INTERVAL", default=5))
+# После записи клиент DB_REPLICA_PIN_SECONDS секунд читает из default (cookie DB_PIN_COOKIE / заголовок X-DB-Pin)
+DB_REPLICA_PIN_SECONDS = int(get_env("DB_REPLICA_PIN_SECONDS", default=10))
+DB_PIN_COOKIE = "db_pin"
+
+REDIS_HOST = get_env("REDIS_HOST", default="localhost")
+REDIS_PORT = get_env("REDIS_PORT", default=6379)
+
+# Кэш (Redis, база 1 — база 0 занята брокером Celery)
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": get_env("REDIS_CACHE_URL", default=f"redis://{REDIS_HOST}:{REDIS_PORT}/1"),
+    }
+}
+
+# Настройка лёгкой БД и кэша для тестов
 if "pytest" in sys.argv[0]:
-    DATABASES["default"] = {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+    # Вторая база — отдельная реплика для тестов роутера; чтение с неё включают сами тесты (DATABASE_REPLICAS)
+    DATABASES = {
+        "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"},
+        "replica": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"},
+    }
+    DATABASE_REPLICAS = []
+    CACHES["default"] = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
 
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
@@ -88,6 +167,27 @@ AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.NumericPasswordValidator"},
 ]
 
+# Хеширование паролей (см. user.hashers): PASSWORD_HASHER — алгоритм новых хешей (argon2, scrypt или pbkdf2).
+# Хеши остальных алгоритмов и прежней стоимости проверяются и пересчитываются при входе.
+# Стоимость по умолчанию — минимальные рекомендации OWASP (для scrypt — N = 2**15 вместо 2**17: втрое дешевле
+# по процессору и вчетверо по памяти); время проверки пароля при разных значениях:
+# python manage.py bench_password_hashing
+PASSWORD_HASHER_CLASSES = {
+    "argon2": "user.hashers.Argon2PasswordHasher",
+    "scrypt": "user.hashers.ScryptPasswordHasher",
+    "pbkdf2": "user.hashers.PBKDF2PasswordHasher",
+}
+PASSWORD_HASHER = get_env("PASSWORD_HASHER", default="argon2")
+PASSWORD_HASHERS = [PASSWORD_HASHER_CLASSES[PASSWORD_HASHER]] + [
+    path for name, path in PASSWORD_HASHER_CLASSES.items() if name != PASSWORD_HASHER
+]
+PASSWORD_ARGON2_TIME_COST = int(get_env("PASSWORD_ARGON2_TIME_COST", default=2))  # проходы
+PASSWORD_ARGON2_MEMORY_COST = int(get_env("PASSWORD_ARGON2_MEMORY_COST", default=19456))  # КиБ
+PASSWORD_ARGON2_PARALLELISM = int(get_env("PASSWORD_ARGON2_PARALLELISM", default=1))  # потоков на один хеш
+PASSWORD_SCRYPT_WORK_FACTOR = int(get_env("PASSWORD_SCRYPT_WORK_FACTOR", default=2**15))  # N, 32 МиБ на хеш
+PASSWORD_SCRYPT_BLOCK_SIZE = int(get_env("PASSWORD_SCRYPT_BLOCK_SIZE", default=8))  # r
+PASSWORD_PBKDF2_ITERATIONS = int(get_env("PASSWORD_PBKDF2_ITERATIONS", default=600000))
+
 LANGUAGE_CODE = "en-us"
 TIME_ZONE = "Asia/Almaty"
 USE_I18N = True
@@ -117,7 +217,12 @@ CORS_ALLOW_ALL_ORIGINS = False
 # Media files
 MEDIA_ROOT = BASE_DIR / "media"
 MEDIA_URL = "/media/"
-FILE_UPLOAD_MAX_MEMORY_SIZE = 2 * 1024 * 1024  # max 2 MB
+# Загружаемые файлы пишутся во временный файл на диске по мере приёма, а не собираются в памяти
+FILE_UPLOAD_HANDLERS = ["django.core.files.uploadhandler.TemporaryFileUploadHandler"]
+
+# Производные аватаров (см. user.avatars): размеры квадратных копий, пиксели, и качество WebP/JPEG
+AVATAR_SIZES = [int(size) for size in get_env("AVATAR_SIZES", default="64,128,256").split(",")]
+AVATAR_QUALITY = int(get_env("AVATAR_QUALITY", default=80))
 
 REST_FRAMEWORK = {
     "DEFAULT_FILTER_BACKENDS": [  # Настройка фильтрации данных
@@ -126,25 +231,111 @@ REST_FRAMEWORK = {
         "rest_framework.filters.OrderingFilter",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user.authentication.CachedJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
     # Настройка прав доступа для всех контроллеров
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
-    # Настройка сериализаторов DRF Browsable API
+    # Быстрые JSON-рендерер и парсер на orjson; Browsable API — только в режиме отладки
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
-        "rest_framework.renderers.BrowsableAPIRenderer",
+        "config.renderers.ORJSONRenderer",
     ],
+    "DEFAULT_PARSER_CLASSES": [
+        "config.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+    # Сколько прокси перед приложением (nginx) — IP клиента для троттлинга берётся из X-Forwarded-For с их учётом
+    "NUM_PROXIES": int(get_env("NUM_PROXIES", default=1)),
 }
+if DEBUG:
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"].append("rest_framework.renderers.BrowsableAPIRenderer")
+# Время жизни кэша списка объявлений для анонимов, секунды (0 — кэш выключен)
+BULLETIN_LIST_CACHE_TIMEOUT = int(get_env("BULLETIN_LIST_CACHE_TIMEOUT", default=60))
+
+# Время жизни закэшированного признака администратора (членство в группе), секунды
+USER_ROLE_CACHE_TIMEOUT = int(get_env("USER_ROLE_CACHE_TIMEOUT", default=300))
+
+# Режим сервера: wsgi (gunicorn, по умолчанию) или asgi (uvicorn, см. config/asgi.py). В режиме asgi простые
+# запросы чтения объявлений и отзывов и /healthz обслуживаются асинхронными вьюхами (см. bulletin.async_views)
+SERVER_MODE = get_env("SERVER_MODE", default="wsgi")
+ASYNC_READ_VIEWS = SERVER_MODE == "asgi"
+
+# Keyset-пагинация (по курсору) для лент объявлений и отзывов по умолчанию, без параметра ?cursor=
+KEYSET_PAGINATION = get_env("KEYSET_PAGINATION", default=False) == "True"
+
+# Приблизительное число строк в списке объявлений без фильтров (см. bulletin.paginators): с какого числа строк
+# COUNT(*) заменяется оценкой (0 — всегда точное число) и сколько секунд кэшируется точное число там, где нет
+# статистики pg_class.reltuples
+APPROXIMATE_COUNT_THRESHOLD = int(get_env("APPROXIMATE_COUNT_THRESHOLD", default=100000))
+APPROXIMATE_COUNT_CACHE_TIMEOUT = int(get_env("APPROXIMATE_COUNT_CACHE_TIMEOUT", default=300))
+if "pytest" in sys.argv[0]:
+    # В тестах число строк точное; приблизительное включают сами тесты (bulletin/tests/test_approximate_count.py)
+    APPROXIMATE_COUNT_THRESHOLD = 0
+
+# Профилирование запросов (см. config.profiling): заголовок Server-Timing и замеры в логе config.profiling.
+# Запрос дольше PROFILING_SLOW_MS миллисекунд или с числом запросов к базе больше PROFILING_MAX_QUERIES
+# логируется со списком запросов (SQL без параметров, не больше PROFILING_QUERY_LOG_LIMIT)
+PROFILING = get_env("PROFILING", default=False) == "True"
+PROFILING_SLOW_MS = int(get_env("PROFILING_SLOW_MS", default=500))
+PROFILING_MAX_QUERIES = int(get_env("PROFILING_MAX_QUERIES", default=30))
+PROFILING_QUERY_LOG_LIMIT = 200
+if PROFILING:
+    MIDDLEWARE.insert(0, "config.profiling.ProfilingMiddleware")
+    LOGGING = {
+        "version": 1,
+        "disable_existing_loggers": False,
+        "handlers": {"console": {"class": "logging.StreamHandler"}},
+        "loggers": {"config.profiling": {"handlers": ["console"], "level": "INFO", "propagate": False}},
+    }
+
+# Потоковая выгрузка (см. bulletin.export): строк на чтение курсора и на кусок ответа
+EXPORT_CHUNK_SIZE = int(get_env("EXPORT_CHUNK_SIZE", default=2000))
+
+# Массовое создание и обновление объявлений (/bulletins/bulk/): максимум элементов в запросе и режим по умолчанию
+# (True — любая ошибка отклоняет весь запрос, False — валидные элементы сохраняются)
+BULLETIN_BULK_MAX_ITEMS = int(get_env("BULLETIN_BULK_MAX_ITEMS", default=1000))
+BULLETIN_BULK_ATOMIC = get_env("BULLETIN_BULK_ATOMIC", default=False) == "True"
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "AUTH_HEADER_TYPES": ("Bearer",),
+    # Токены с версией пользователя (auth_version) — и для /login/
+    "TOKEN_OBTAIN_SERIALIZER": "user.serializers.EmailTokenObtainPairSerializer",
 }
 
+# Кэш пользователя JWT-аутентификации (см. user.authentication): время жизни в Redis и в памяти процесса,
+# секунды, и максимум записей в памяти процесса
+AUTH_USER_CACHE_TIMEOUT = int(get_env("AUTH_USER_CACHE_TIMEOUT", default=60))
+AUTH_USER_LOCAL_TIMEOUT = int(get_env("AUTH_USER_LOCAL_TIMEOUT", default=5))
+AUTH_USER_LOCAL_MAX_ENTRIES = 10000
+
+# Троттлинг входа, регистрации и сброса пароля (см. config.throttling): корзины токенов по IP, по учётной записи
+# (email или uid из тела запроса) и общая на эндпоинт. Ставка «ёмкость/период» (s, m, h, d): столько запросов
+# подряд, дальше — столько же за период. Переопределение: THROTTLE_RATES="login.ip=60/m,register.global="
+# (пустая ставка отключает корзину)
+THROTTLE_RATES = {
+    "register.ip": "10/h",
+    "register.global": "300/m",
+    "login.ip": "30/m",
+    "login.account": "10/m",
+    "login.global": "1200/m",
+    "password_reset.ip": "10/h",
+    "password_reset.account": "3/h",
+    "password_reset.global": "120/m",
+    "password_reset_confirm.ip": "30/h",
+    "password_reset_confirm.account": "10/h",
+    "password_reset_confirm.global": "300/m",
+}
+THROTTLE_RATES.update(
+    (name.strip(), rate.strip())
+    for name, _, rate in (item.partition("=") for item in get_env("THROTTLE_RATES", default="").split(","))
+    if name.strip()
+)
+
 FRONTEND_RESET_PASSWORD_URL = "http://localhost:3000/reset-password"  # фронт может обработать ссылку
 
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
@@ -161,6 +352,32 @@ CELERY_RESULT_BACKEND = get_env("CELERY_RESULT_BACKEND", required=True)
 CELERY_TIME_ZONE = TIME_ZONE
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60
+# Письма сброса пароля — в отдельной очереди со своим воркером, чтобы не ждать за фоновыми задачами
+CELERY_TASK_ROUTES = {
+    "user.utils.send_password_reset_email": {"queue": "password_reset"},
+}
+# Повторные запросы сброса пароля в этом окне не порождают второго письма (см. user.utils)
+PASSWORD_RESET_RESEND_INTERVAL = int(get_env("PASSWORD_RESET_RESEND_INTERVAL", default=5))  # минуты
+
+# Уведомления об отзывах копятся в кэше и отправляются дайджестами (см. bulletin.notifications)
+NOTIFICATION_FLUSH_INTERVAL = int(get_env("NOTIFICATION_FLUSH_INTERVAL", default=60))  # секунды
+NOTIFICATION_MAX_EMAILS_PER_HOUR = int(get_env("NOTIFICATION_MAX_EMAILS_PER_HOUR", default=4))  # на получателя
+NOTIFICATION_DIGEST_MAX_ITEMS = 20  # сколько отзывов показывать в одном письме
+
+# Входы пользователей копятся в кэше и записываются в last_login пачками (см. user.logins)
+LOGIN_RECORD_INTERVAL = int(get_env("LOGIN_RECORD_INTERVAL", default=15))  # минуты, не чаще на пользователя
+LOGIN_FLUSH_INTERVAL = int(get_env("LOGIN_FLUSH_INTERVAL", default=60))  # секунды
+
+CELERY_BEAT_SCHEDULE = {
+    "flush-review-notifications": {
+        "task": "bulletin.tasks.flush_review_notifications",
+        "schedule": NOTIFICATION_FLUSH_INTERVAL,
+    },
+    "flush-logins": {
+        "task": "user.tasks.flush_logins",
+        "schedule": LOGIN_FLUSH_INTERVAL,
+    },
+}
 
 # Усовершенствованное отображение форм Bootstrap
 CRISPY_TEMPLATE_PACK = "bootstrap4"
@@ -0,0 +1,89 @@
+# config/smtp_sink.py
+"""
+Локальный SMTP-сервер-заглушка для бенчмарков почты.
+
+Принимает письма и ничего не отправляет, считая соединения и письма. Задержка при подключении
+(connect_latency) имитирует TCP + TLS-рукопожатие с настоящим SMTP-сервером.
+"""
+
+import socketserver
+import threading
+import time
+
+
+class SMTPSinkHandler(socketserver.StreamRequestHandler):
+    """
+    Минимальный диалог SMTP: EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT.
+    """
+
+    def handle(self):
+        server = self.server
+        time.sleep(server.connect_latency)  # type: ignore[attr-defined]
+        with server.lock:  # type: ignore[attr-defined]
+            server.connections += 1  # type: ignore[attr-defined]
+        self.wfile.write(b"220 sink ESMTP\r\n")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line[:4].upper()
+            if command == b"EHLO":
+                self.wfile.write(b"250-sink\r\n250 8BITMIME\r\n")
+            elif command == b"DATA":
+                self.wfile.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                with server.lock:  # type: ignore[attr-defined]
+                    server.messages += 1  # type: ignore[attr-defined]
+                self.wfile.write(b"250 OK\r\n")
+            elif command == b"QUIT":
+                self.wfile.write(b"221 Bye\r\n")
+                return
+            else:
+                self.wfile.write(b"250 OK\r\n")
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    """
+    SMTP-заглушка на свободном порту 127.0.0.1, работающая в фоновом потоке.
+
+    Использование:
+        with SMTPSink(connect_latency=0.05) as sink:
+            ... EMAIL_HOST="127.0.0.1", EMAIL_PORT=sink.port ...
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, connect_latency=0.0):
+        super().__init__(("127.0.0.1", 0), SMTPSinkHandler)
+        self.connect_latency = connect_latency
+        self.connections = 0
+        self.messages = 0
+        self.lock = threading.Lock()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def email_settings(self):
+        """
+        Возвращает настройки Django для отправки писем в заглушку (для override_settings).
+        """
+        return {
+            "EMAIL_BACKEND": "django.core.mail.backends.smtp.EmailBackend",
+            "EMAIL_HOST": "127.0.0.1",
+            "EMAIL_PORT": self.port,
+            "EMAIL_USE_TLS": False,
+            "EMAIL_USE_SSL": False,
+            "EMAIL_HOST_USER": "",
+            "EMAIL_HOST_PASSWORD": "",
+        }
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,161 @@
+# config/throttling.py
+"""
+Ограничение частоты запросов корзинами токенов (token bucket) в общем кэше (Redis).
+
+Корзина ёмкостью N и периодом T пропускает N запросов подряд, а дальше — в среднем N за T: токены
+пополняются непрерывно. У эндпоинта (throttle_scope вьюхи) до трёх корзин — по IP клиента, по учётной записи
+(поле тела запроса, по умолчанию email) и общая; ставки — в THROTTLE_RATES под ключами «<scope>.ip»,
+«<scope>.account» и «<scope>.global», корзина без ставки не проверяется.
+
+Все корзины запроса проверяются одним Lua-скриптом в Redis атомарно: токен списывается из всех сразу и только
+если он есть в каждой, поэтому отклонённый запрос не расходует общую корзину и корзину учётной записи.
+Проверка — один запрос к Redis до аутентификации по паролю и запросов к базе. Отказы считаются в метриках
+throttle.<scope>.<корзина>.rejected (см. config.metrics).
+"""
+
+import hashlib
+import time
+from collections.abc import Mapping
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.redis import RedisCache
+
+from rest_framework.throttling import BaseThrottle
+
+from config import metrics
+
+KEY_PREFIX = "throttle:"
+KINDS = ("ip", "account", "global")
+PERIODS = {"s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60}
+
+# KEYS — ключи корзин, ARGV — пары (ёмкость, токенов в секунду) в том же порядке.
+# Возвращает {0, 0}, если токен списан, или {ожидание в секундах, номер исчерпанной корзины с 1}.
+TOKEN_BUCKET_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local levels = {}
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[2 * i - 1])
+    local rate = tonumber(ARGV[2 * i])
+    local state = redis.call('HMGET', key, 'tokens', 'at')
+    local tokens = capacity
+    if state[1] then
+        tokens = math.min(capacity, tonumber(state[1]) + math.max(0, now - tonumber(state[2])) * rate)
+    end
+    if tokens < 1 then
+        return {tostring((1 - tokens) / rate), i}
+    end
+    levels[i] = tokens - 1
+end
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[2 * i])
+    redis.call('HSET', key, 'tokens', tostring(levels[i]), 'at', tostring(now))
+    redis.call('EXPIRE', key, math.ceil((tonumber(ARGV[2 * i - 1]) - levels[i]) / rate) + 1)
+end
+return {0, 0}
+"""
+
+metrics.register(*(f"throttle.{name}.rejected" for name in settings.THROTTLE_RATES))
+
+_script = None
+
+
+def parse_rate(rate):
+    """
+    Разбирает ставку «ёмкость/период», период — s, m, h или d (допускается «10/min», как в DRF).
+
+    :return: Кортеж (ёмкость, токенов в секунду)
+    """
+    capacity, period = rate.split("/")
+    return int(capacity), int(capacity) / PERIODS[period[0]]
+
+
+def consume(buckets):
+    """
+    Списывает по токену из каждой корзины, если токен есть во всех.
+
+    :param buckets: Список (ключ, ёмкость, токенов в секунду)
+    :return: Кортеж (ожидание в секундах — 0, если токен списан; индекс исчерпанной корзины или None)
+    """
+    if isinstance(cache, RedisCache):
+        return consume_redis(buckets)
+    return consume_local(buckets)
+
+
+def consume_redis(buckets):
+    """
+    Списывает токены Lua-скриптом в Redis (атомарно для всех процессов).
+    """
+    global _script
+    keys = [cache.make_and_validate_key(key) for key, _, _ in buckets]
+    client = cache._cache.get_client(keys[0], write=True)
+    if _script is None:
+        _script = client.register_script(TOKEN_BUCKET_SCRIPT)
+    wait, index = _script(keys=keys, args=[value for _, *bucket in buckets for value in bucket], client=client)
+    return float(wait), int(index) - 1 if index else None
+
+
+def consume_local(buckets):
+    """
+    Списывает токены через обычные операции кэша — для кэшей без Lua (тесты, разработка); не атомарно.
+    """
+    now = time.time()
+    states = cache.get_many([key for key, _, _ in buckets])
+    levels = {}
+    for index, (key, capacity, rate) in enumerate(buckets):
+        tokens, at = states.get(key, (capacity, now))
+        tokens = min(capacity, tokens + max(0.0, now - at) * rate)
+        if tokens < 1:
+            return (1 - tokens) / rate, index
+        levels[key] = (tokens - 1, now)
+    for key, capacity, rate in buckets:
+        cache.set(key, levels[key], timeout=int((capacity - levels[key][0]) / rate) + 1)
+    return 0.0, None
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    DRF-троттлинг корзинами токенов для эндпоинтов без аутентификации (вход, регистрация, сброс пароля).
+
+    Атрибуты вьюхи: throttle_scope — префикс ставок в THROTTLE_RATES; throttle_account_field — поле тела
+    запроса, по которому считается корзина учётной записи (по умолчанию email). IP клиента определяется
+    с учётом NUM_PROXIES (см. BaseThrottle.get_ident).
+    """
+
+    def allow_request(self, request, view):
+        scope = getattr(view, "throttle_scope", None)
+        buckets, kinds = [], []
+        for kind in KINDS:
+            rate = settings.THROTTLE_RATES.get(f"{scope}.{kind}")
+            ident = rate and self.get_bucket_ident(kind, request, view)
+            if ident:
+                buckets.append((f"{KEY_PREFIX}{scope}:{kind}:{ident}", *parse_rate(rate)))
+                kinds.append(kind)
+        if not buckets:
+            return True
+
+        self.wait_seconds, index = consume(buckets)
+        if index is None:
+            return True
+        metrics.incr(f"throttle.{scope}.{kinds[index]}.rejected")
+        return False
+
+    def get_bucket_ident(self, kind, request, view):
+        """
+        Возвращает идентификатор корзины вида kind или None, если корзину проверять не нужно
+        (например, в теле запроса нет поля учётной записи).
+        """
+        if kind == "ip":
+            return self.get_ident(request)
+        if kind == "global":
+            return "all"
+        data = request.data
+        value = data.get(getattr(view, "throttle_account_field", "email")) if isinstance(data, Mapping) else None
+        if not isinstance(value, str) or not value.strip():
+            return None
+        # В ключ не попадает сам email: в Redis хранится только хеш
+        return hashlib.sha256(value.strip().lower().encode()).hexdigest()[:32]
+
+    def wait(self):
+        return self.wait_seconds
@@ -1,4 +1,5 @@
 # config/urls.py
+from django.conf import settings
 from django.contrib import admin
 from django.http import HttpResponse, HttpResponseRedirect
 from django.urls import include, path
@@ -7,6 +8,8 @@ from drf_yasg import openapi
 from drf_yasg.views import get_schema_view
 from rest_framework import permissions
 
+from config.metrics import MetricsAPIView
+
 schema_view = get_schema_view(
     openapi.Info(
         title="API Documentation",
@@ -25,6 +28,10 @@ def health_check(request):
     return HttpResponse("ok")
 
 
+async def async_health_check(request):
+    return HttpResponse("ok")
+
+
 urlpatterns = [
     path("api/admin/", admin.site.urls),
     #
@@ -35,11 +42,14 @@ urlpatterns = [
     path("api/user/", include("user.urls", namespace="user")),
     path("api/bulletin/", include("bulletin.urls", namespace="bulletin")),
     #
+    path("api/metrics/", MetricsAPIView.as_view(), name="metrics"),  # счётчики метрик (только для is_staff)
+    #
     path("api-auth/", include("rest_framework.urls")),  # login/logout через browsable API
     # Чтобы при заходе на / не было 404, редирект на /api/swagger/
     path("", lambda request: HttpResponseRedirect("/api/swagger/")),
 ]
 
 urlpatterns += [
-    path("healthz", health_check),
+    # В режиме ASGI — асинхронная проверка, чтобы не занимать поток пула sync_to_async
+    path("healthz", async_health_check if settings.ASYNC_READ_VIEWS else health_check),
 ]
@@ -18,3 +18,11 @@ def get_env(var_name: str, default=None, required=False):
     if required and value is None:
         raise ImproperlyConfigured(f"Переменная окружения '{var_name}' обязательна, но не установлена.")
     return value
+
+
+def get_role_env(var_name: str, prefix: str, default=None):
+    """
+    Получить переменную окружения роли процесса (с префиксом, например CELERY_DB_POOL_MAX_SIZE),
+    а если она не задана — общую (DB_POOL_MAX_SIZE).
+    """
+    return get_env(prefix + var_name, default=get_env(var_name, default=default))
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 application = get_wsgi_application()
+
+# Импорт после создания приложения: модулю нужны загруженные настройки
+from config.db_pool import start_stats_publisher  # noqa: E402
+
+start_stats_publisher()
@@ -0,0 +1,14 @@
+# conftest.py
+from django.core.cache import cache
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """
+    Очищает кэш перед каждым тестом, чтобы закэшированные ответы и счётчики не переходили между тестами.
+    """
+    cache.clear()
+    yield
+    cache.clear()
@@ -9,6 +9,10 @@ done
 
 echo "PostgreSQL started"
 
-# Запускаем Celery
+# Отдельный воркер для очереди писем сброса пароля
+echo "Starting Celery password reset worker..."
+celery -A config worker -Q password_reset -n password_reset@%h --concurrency=2 --loglevel=info &
+
+# Запускаем Celery вместе с планировщиком (-B): периодический сброс уведомлений об отзывах
 echo "Starting Celery worker..."
-celery -A config worker --loglevel=info
+celery -A config worker -Q celery -B --loglevel=info
@@ -32,6 +32,12 @@ echo "Fixtures loaded"
 echo "Собираем статику..."
 python manage.py collectstatic --noinput
 
-# Запускаем Gunicorn
+# Запускаем сервер: SERVER_MODE=asgi — uvicorn (асинхронные вьюхи чтения), иначе — Gunicorn (WSGI)
+if [ "$SERVER_MODE" = "asgi" ]; then
+  echo "Запускаем Uvicorn..."
+  exec uvicorn config.asgi:application --host 0.0.0.0 --port 8000 --workers ${WEB_WORKERS:-1} --no-access-log
+fi
+# WEB_THREADS > 1 — воркеры gthread: пока поток ждёт хеширования пароля при входе (argon2, scrypt и PBKDF2
+# отпускают GIL) или ответа базы, остальные потоки воркера обслуживают другие запросы
 echo "Запускаем Gunicorn..."
-exec gunicorn config.wsgi:application --bind 0.0.0.0:8000
+exec gunicorn config.wsgi:application --bind 0.0.0.0:8000 --workers ${WEB_WORKERS:-1} --threads ${WEB_THREADS:-1}
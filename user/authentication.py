@@ -0,0 +1,132 @@
+# user/authentication.py
+"""
+JWT-аутентификация с кэшированием пользователя.
+
+Стандартный JWTAuthentication загружает пользователя из базы на каждый запрос. CachedJWTAuthentication
+ищет его сначала в памяти процесса (AUTH_USER_LOCAL_TIMEOUT секунд), затем в Redis (AUTH_USER_CACHE_TIMEOUT),
+и только потом в базе — с теми же проверками, что у JWTAuthentication (пользователь существует и активен).
+
+Ключ кэша — id пользователя и версия токена (claim auth_version, поле User.auth_version). Версия растёт
+при смене пароля, поэтому токены, выданные до смены, перестают приниматься (у токенов без claim версия 1).
+Сохранение пользователя (изменение профиля, деактивация, смена пароля) удаляет его из Redis и из памяти
+текущего процесса (см. user.signals); в памяти других процессов пользователь остаётся не дольше
+AUTH_USER_LOCAL_TIMEOUT секунд.
+
+Хэш пароля в кэш не попадает: у кэшируемой копии поле password отложено (deferred), как после .defer("password").
+Обращение к нему загружает поле из базы, а save() такого объекта сохраняет только загруженные поля.
+"""
+
+import copy
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+AUTH_VERSION_CLAIM = "auth_version"
+
+# Ключ кэша → (момент истечения по time.monotonic(), пользователь)
+local_users: dict[str, tuple[float, object]] = {}
+
+
+def user_cache_key(user_id, version):
+    """
+    Возвращает ключ кэша пользователя для версии токена.
+    """
+    return f"auth:user:{user_id}:{version}"
+
+
+def token_cache_key(validated_token):
+    """
+    Возвращает ключ кэша пользователя из токена.
+
+    :raises InvalidToken: Если в токене нет id пользователя
+    """
+    try:
+        user_id = validated_token[jwt_settings.USER_ID_CLAIM]
+    except KeyError:
+        raise InvalidToken("Token contained no recognizable user identification")
+    return user_cache_key(user_id, validated_token.get(AUTH_VERSION_CLAIM, 1))
+
+
+def cacheable_user(user):
+    """
+    Возвращает копию пользователя без хэша пароля (поле password становится отложенным).
+    """
+    user = copy.copy(user)
+    vars(user).pop("password", None)
+    return user
+
+
+def get_local_user(key):
+    """
+    Возвращает копию пользователя из памяти процесса или None, если его нет или запись устарела.
+    """
+    entry = local_users.get(key)
+    if entry is None or entry[0] < time.monotonic():
+        return None
+    return copy.copy(entry[1])
+
+
+def set_local_user(key, user):
+    """
+    Запоминает пользователя в памяти процесса. При переполнении память очищается целиком.
+    """
+    if settings.AUTH_USER_LOCAL_TIMEOUT <= 0:
+        return
+    if len(local_users) >= settings.AUTH_USER_LOCAL_MAX_ENTRIES:
+        local_users.clear()
+    local_users[key] = (time.monotonic() + settings.AUTH_USER_LOCAL_TIMEOUT, user)
+
+
+def invalidate_user(user):
+    """
+    Удаляет пользователя из кэша для текущей и предыдущей версии токена (после смены пароля
+    запись под старой версией тоже не должна находиться).
+
+    :param user: Пользователь
+    """
+    keys = [user_cache_key(user.pk, version) for version in (user.auth_version, user.auth_version - 1)]
+    for key in keys:
+        local_users.pop(key, None)
+    cache.delete_many(keys)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication, который берёт пользователя из кэша (см. описание модуля).
+    """
+
+    def get_user(self, validated_token):
+        """
+        Возвращает пользователя токена: из памяти процесса, из Redis или из базы.
+        Каждый запрос получает свою копию объекта, общий экземпляр из памяти не изменяется.
+
+        :raises InvalidToken, AuthenticationFailed: Если токен неверен или пользователь недоступен
+        """
+        key = token_cache_key(validated_token)
+        user = get_local_user(key)
+        if user is not None:
+            return user
+
+        user = cache.get(key)
+        if user is None:
+            user = cacheable_user(self.load_user(validated_token))
+            cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+        set_local_user(key, user)
+        return copy.copy(user)
+
+    def load_user(self, validated_token):
+        """
+        Загружает пользователя из базы с проверками JWTAuthentication и проверкой версии токена.
+
+        :raises AuthenticationFailed: Если пользователь не найден, неактивен или сменил пароль
+        """
+        user = super().get_user(validated_token)
+        if validated_token.get(AUTH_VERSION_CLAIM, 1) != user.auth_version:
+            raise AuthenticationFailed("The user's password has been changed.", code="password_changed")
+        return user
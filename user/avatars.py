@@ -0,0 +1,137 @@
+# user/avatars.py
+"""
+Производные аватаров: квадратные копии фиксированных размеров (AVATAR_SIZES) в WebP и JPEG.
+
+Оригинал, загруженный пользователем, хранится как есть и наружу не отдаётся (nginx отвечает 404 на
+/media/avatars/, кроме avatars/derived/), клиентам отдаются только производные:
+- метаданные (EXIF с геопозицией и моделью камеры, ICC-профиль) в производные не копируются, ориентация
+  из EXIF применяется к пикселям до его отбрасывания;
+- имя файла — хэш содержимого (avatars/derived/<sha256>.<ext>), поэтому файл никогда не меняется
+  и кэшируется клиентами и nginx навсегда, а одинаковые картинки хранятся один раз.
+
+Производные строит задача Celery user.tasks.generate_avatar_derivatives после сохранения нового аватара,
+результат — словарь {"webp": {"64": "<имя файла>", ...}, "jpeg": {...}} в User.avatar_derivatives.
+"""
+
+import hashlib
+import io
+import logging
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .authentication import invalidate_user
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+DERIVED_DIR = "avatars/derived/"
+
+# Формат производной → (формат Pillow, расширение файла, параметры сохранения)
+FORMATS = {
+    "webp": ("WEBP", "webp", {"method": 4}),
+    "jpeg": ("JPEG", "jpg", {"optimize": True, "progressive": True}),
+}
+
+
+def flatten(image):
+    """
+    Приводит изображение к RGB; прозрачные области заливаются белым (JPEG не поддерживает альфа-канал).
+    """
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def render_derivatives(file):
+    """
+    Строит производные изображения из файла.
+
+    :param file: Открытый файл изображения
+    :return: Словарь {формат: {размер: (байты, расширение)}}
+    """
+    sizes = sorted(settings.AVATAR_SIZES, reverse=True)
+    with Image.open(file) as image:
+        # JPEG декодируется сразу в уменьшенном масштабе (1/2 … 1/8), не меньше наибольшей производной
+        image.draft("RGB", (sizes[0], sizes[0]))
+        image = flatten(ImageOps.exif_transpose(image))
+
+    derivatives: dict[str, dict[str, tuple[bytes, str]]] = {name: {} for name in FORMATS}
+    for size in sizes:
+        # Каждый следующий размер уменьшается из предыдущего, а не из оригинала
+        image = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        for name, (pillow_format, extension, options) in FORMATS.items():
+            buffer = io.BytesIO()
+            image.save(buffer, pillow_format, quality=settings.AVATAR_QUALITY, **options)
+            derivatives[name][str(size)] = (buffer.getvalue(), extension)
+    return derivatives
+
+
+def save_derivatives(storage, derivatives):
+    """
+    Сохраняет производные под именами по хэшу содержимого (уже сохранённые не перезаписываются).
+
+    :param storage: Хранилище файлов
+    :param derivatives: Результат render_derivatives
+    :return: Словарь {формат: {размер: имя файла}}
+    """
+    names: dict[str, dict[str, str]] = {}
+    for name, by_size in derivatives.items():
+        for size, (content, extension) in by_size.items():
+            path = f"{DERIVED_DIR}{hashlib.sha256(content).hexdigest()}.{extension}"
+            if not storage.exists(path):
+                path = storage.save(path, ContentFile(content))
+            names.setdefault(name, {})[size] = path
+    return names
+
+
+def generate(user_id, name):
+    """
+    Строит и сохраняет производные аватара пользователя.
+
+    :param user_id: Идентификатор пользователя
+    :param name: Имя файла аватара, для которого поставлена задача
+    :return: True, если производные записаны; False, если аватар с тех пор сменился или файл не читается
+    """
+    auth_version = User.objects.filter(pk=user_id, image=name).values_list("auth_version", flat=True).first()
+    if auth_version is None:
+        return False
+    storage = User._meta.get_field("image").storage
+    try:
+        with storage.open(name) as file:
+            derivatives = render_derivatives(file)
+    except (UnidentifiedImageError, Image.DecompressionBombError) as error:
+        logger.warning("Аватар %s пользователя %s не обработан: %s", name, user_id, error)
+        return False
+    names = save_derivatives(storage, derivatives)
+    # Аватар мог смениться, пока строились производные: тогда их запишет задача нового аватара
+    if not User.objects.filter(pk=user_id, image=name).update(avatar_derivatives=names):
+        return False
+    # update() не шлёт post_save — пользователь в кэше аутентификации сбрасывается явно
+    invalidate_user(User(pk=user_id, auth_version=auth_version))
+    return True
+
+
+def derivative_urls(user, request=None):
+    """
+    Возвращает ссылки на производные аватара.
+
+    :param user: Пользователь
+    :param request: Запрос — для абсолютных ссылок
+    :return: Словарь {формат: {размер: URL}} или None, если производных ещё нет
+    """
+    if not user.image or not user.avatar_derivatives:
+        return None
+    storage = User._meta.get_field("image").storage
+    urls = {}
+    for name, by_size in user.avatar_derivatives.items():
+        urls[name] = {}
+        for size, path in by_size.items():
+            url = storage.url(path)
+            urls[name][size] = request.build_absolute_uri(url) if request is not None else url
+    return urls
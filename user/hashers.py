@@ -0,0 +1,75 @@
+# user/hashers.py
+"""
+Хешеры паролей со стоимостью из настроек.
+
+Алгоритм новых хешей — PASSWORD_HASHER (argon2, scrypt или pbkdf2), стоимость — PASSWORD_ARGON2_*,
+PASSWORD_SCRYPT_* и PASSWORD_PBKDF2_ITERATIONS. Хеши прежних алгоритмов и прежней стоимости по-прежнему
+проверяются (все хешеры перечислены в PASSWORD_HASHERS), а при успешном входе Django пересчитывает такой хеш
+с текущими параметрами (must_update, см. User.check_password) — смена алгоритма или стоимости не требует
+сброса паролей.
+
+Имена алгоритмов совпадают со стандартными хешерами Django, поэтому уже сохранённые хеши распознаются.
+"""
+
+import base64
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """
+    Argon2id: стоимость — число проходов, память (КиБ) и число потоков одного хеширования.
+    """
+
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_ARGON2_PARALLELISM
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    """
+    scrypt: стоимость — N (work factor) и r (block size); память одного хеширования — 128 × N × r байт.
+    """
+
+    @property
+    def work_factor(self):
+        return settings.PASSWORD_SCRYPT_WORK_FACTOR
+
+    @property
+    def block_size(self):
+        return settings.PASSWORD_SCRYPT_BLOCK_SIZE
+
+    def encode(self, password, salt, n=None, r=None, p=None):
+        """
+        Как у Django, но лимит памяти считается по параметрам этого хеша, а не по текущим настройкам: по умолчанию
+        OpenSSL ограничивает scrypt 32 МиБ, а хеш, созданный с большей стоимостью, должен проверяться
+        и после её снижения (и пересчитываться при входе).
+        """
+        self._check_encode_args(password, salt)
+        n = n or self.work_factor
+        r = r or self.block_size
+        p = p or self.parallelism
+        maxmem = 128 * r * (2 * n + p)
+        hash_ = hashlib.scrypt(password.encode(), salt=salt.encode(), n=n, r=r, p=p, maxmem=maxmem, dklen=64)
+        hash_ = base64.b64encode(hash_).decode("ascii").strip()
+        return "%s$%d$%s$%d$%d$%s" % (self.algorithm, n, salt, r, p, hash_)
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256: стоимость — число итераций.
+    """
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS
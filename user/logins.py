@@ -0,0 +1,74 @@
+# user/logins.py
+"""
+Учёт входов пользователей (User.last_login) без записи в таблицу пользователей на каждый вход.
+
+Вход (выдача JWT или вход в сессию) записывается не чаще раза в LOGIN_RECORD_INTERVAL минут на пользователя:
+первый вход в окне занимает ключ login:recent:<id> через cache.add, остальные входы окна ничего не пишут.
+Записанный вход — пара (id пользователя, время) в журнале в кэше (Redis, см. config.journal) под префиксом
+login, как у уведомлений об отзывах (bulletin.notifications).
+Периодическая задача user.tasks.flush_logins читает журнал от курсора и обновляет last_login всех
+пользователей пачки одним bulk_update — без сигналов post_save, поэтому кэш аутентификации не сбрасывается.
+
+Время входа в last_login отстаёт от фактического не больше чем на LOGIN_RECORD_INTERVAL минут
+плюс интервал сброса.
+"""
+
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import cache
+
+from config import metrics
+from config.journal import CacheJournal
+
+from .models import User
+
+RECENT_KEY = "login:recent:{}"
+
+metrics.register("logins.recorded", "logins.flushed")
+
+journal = CacheJournal("login")
+
+
+def record_login(user_id):
+    """
+    Записывает вход пользователя в журнал, если в текущем окне LOGIN_RECORD_INTERVAL вход ещё не записан.
+
+    :param user_id: Идентификатор пользователя
+    :return: True, если вход записан
+    """
+    if not cache.add(RECENT_KEY.format(user_id), 1, timeout=settings.LOGIN_RECORD_INTERVAL * 60):
+        return False
+    journal.append((user_id, time.time()))
+    metrics.incr("logins.recorded")
+    return True
+
+
+def flush(batch_size=1000):
+    """
+    Записывает накопленные входы в last_login пачками bulk_update. Одновременно выполняется только один сброс.
+
+    :param batch_size: Сколько записей журнала читать одним get_many и сколько строк обновлять одним запросом
+    :return: Количество обновлённых пользователей
+    """
+    with journal.flushing() as locked:
+        if not locked:
+            return 0
+        entries, position, cursor = journal.read_pending(batch_size)
+        if position == cursor:
+            return 0
+
+        latest: dict[int, float] = {}
+        for user_id, logged_in in entries:
+            latest[user_id] = max(logged_in, latest.get(user_id, 0))
+        users = [
+            User(pk=user_id, last_login=datetime.fromtimestamp(logged_in, timezone.utc))
+            for user_id, logged_in in latest.items()
+        ]
+        # Удалённые с момента входа пользователи просто не попадают под UPDATE
+        User.objects.bulk_update(users, ["last_login"], batch_size=batch_size)
+
+        journal.commit(position, cursor)
+        metrics.incr("logins.flushed", len(users))
+        return len(users)
@@ -0,0 +1,63 @@
+# user/management/commands/bench_auth.py
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from user import authentication
+from user.authentication import CachedJWTAuthentication
+from user.models import User
+
+
+class Command(BaseCommand):
+    """
+    Кастомная команда. Измеряет стоимость JWT-аутентификации на один запрос (разбор и проверка подписи токена
+    плюс получение пользователя):
+    - JWTAuthentication — пользователь из базы на каждый запрос;
+    - CachedJWTAuthentication без памяти процесса — пользователь из кэша Django (Redis в боевых настройках);
+    - CachedJWTAuthentication — пользователь из памяти процесса.
+
+    Пользователь создаётся во временной транзакции и откатывается.
+    """
+
+    help = "Микробенчмарк JWT-аутентификации на один запрос: база, кэш, память процесса"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=5000, help="Количество запросов")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.run(options["requests"])
+            transaction.set_rollback(True)
+
+    def run(self, requests):
+        user = User.objects.create(email="bench-auth@example.com", password="!")
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        local_timeout = settings.AUTH_USER_LOCAL_TIMEOUT
+        variants = (
+            ("JWTAuthentication", JWTAuthentication(), local_timeout),
+            ("кэш", CachedJWTAuthentication(), 0),
+            ("память процесса", CachedJWTAuthentication(), max(local_timeout, 60)),
+        )
+        try:
+            for label, backend, timeout in variants:
+                settings.AUTH_USER_LOCAL_TIMEOUT = timeout
+                authentication.local_users.clear()
+                backend.authenticate(request)  # прогрев
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    for _ in range(requests):
+                        backend.authenticate(request)
+                    elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"{label:>17}: {elapsed / requests * 1_000_000:8.1f} мкс/запрос, "
+                    f"запросов к базе: {len(queries)}"
+                )
+        finally:
+            settings.AUTH_USER_LOCAL_TIMEOUT = local_timeout
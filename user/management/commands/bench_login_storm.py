@@ -0,0 +1,105 @@
+# user/management/commands/bench_login_storm.py
+import random
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from user import logins
+from user.models import User
+
+STATS_QUERY = """
+    SELECT n_tup_upd, n_tup_hot_upd, n_dead_tup FROM pg_stat_user_tables WHERE relid = %s::regclass
+"""
+
+
+class Command(BaseCommand):
+    """
+    Кастомная команда. «Шторм входов»: --logins входов случайных пользователей из --users и их учёт в last_login:
+    - per-login — UPDATE строки пользователя на каждый вход (как django.contrib.auth.models.update_last_login);
+    - buffered — журнал в кэше с окном LOGIN_RECORD_INTERVAL и сброс bulk_update каждые --flush-every входов
+      (как периодическая задача user.tasks.flush_logins).
+
+    Печатает время, число UPDATE и обновлённых строк, а на PostgreSQL — прирост n_tup_upd, n_tup_hot_upd
+    и n_dead_tup таблицы пользователей (pg_stat_user_tables). Пользователи создаются и удаляются командой.
+
+    Пример: python manage.py bench_login_storm --users 1000 --logins 20000
+    """
+
+    help = "Бенчмарк учёта входов: UPDATE на каждый вход против буфера в кэше"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000, help="Количество пользователей")
+        parser.add_argument("--logins", type=int, default=20000, help="Количество входов")
+        parser.add_argument("--flush-every", type=int, default=2000, help="Сброс буфера каждые N входов")
+
+    def handle(self, *args, **options):
+        users = User.objects.bulk_create(
+            User(email=f"bench-login-{number}@example.com", password="!") for number in range(options["users"])
+        )
+        ids = [user.pk for user in users]
+        storm = random.Random(0).choices(ids, k=options["logins"])
+        try:
+            self.run("per-login", lambda: self.per_login(storm))
+            self.run("buffered", lambda: self.buffered(storm, options["flush_every"]))
+        finally:
+            User.objects.filter(pk__in=ids).delete()
+
+    def run(self, name, storm):
+        """
+        Выполняет шторм и печатает замеры.
+        """
+        cache.clear()
+        before = self.table_stats()
+        statements = []
+        with connection.execute_wrapper(lambda execute, sql, *args: statements.append(sql) or execute(sql, *args)):
+            started = time.perf_counter()
+            rows = storm()
+            elapsed = time.perf_counter() - started
+        updates = sum(sql.startswith("UPDATE") for sql in statements)
+        line = f"{name:>9}: {elapsed:6.2f} с | UPDATE: {updates:6} | строк обновлено: {rows:6}"
+        after = self.table_stats()
+        if before is not None and after is not None:
+            upd, hot, dead = (end - start for start, end in zip(before, after))
+            line += f" | n_tup_upd +{upd} (HOT +{hot}) | n_dead_tup +{dead}"
+        self.stdout.write(line)
+
+    @staticmethod
+    def per_login(storm):
+        """
+        UPDATE на каждый вход.
+
+        :return: Число обновлённых строк
+        """
+        return sum(User.objects.filter(pk=user_id).update(last_login=timezone.now()) for user_id in storm)
+
+    @staticmethod
+    def buffered(storm, flush_every):
+        """
+        Журнал входов и периодический сброс.
+
+        :return: Число обновлённых строк
+        """
+        rows = 0
+        for number, user_id in enumerate(storm, 1):
+            logins.record_login(user_id)
+            if number % flush_every == 0:
+                rows += logins.flush()
+        return rows + logins.flush()
+
+    @staticmethod
+    def table_stats():
+        """
+        Возвращает (n_tup_upd, n_tup_hot_upd, n_dead_tup) таблицы пользователей или None не на PostgreSQL.
+        """
+        if connection.vendor != "postgresql":
+            return None
+        with connection.cursor() as cursor:
+            # Счётчики своего сеанса попадают в pg_stat_user_tables после сброса статистики сеанса
+            cursor.execute("SELECT pg_stat_force_next_flush()")
+            time.sleep(1.5)
+            cursor.execute("SELECT pg_stat_clear_snapshot()")
+            cursor.execute(STATS_QUERY, [User._meta.db_table])
+            return cursor.fetchone()
@@ -0,0 +1,68 @@
+# user/management/commands/bench_password_hashing.py
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+PASSWORD = "secure1234"
+
+# (подпись, алгоритм, стоимость); первая строка каждого алгоритма — значения по умолчанию из config.settings
+VARIANTS = [
+    ("pbkdf2 600k", "pbkdf2", {"PASSWORD_PBKDF2_ITERATIONS": 600000}),
+    ("pbkdf2 1M (Django)", "pbkdf2", {"PASSWORD_PBKDF2_ITERATIONS": 1000000}),
+    ("scrypt N=2^15", "scrypt", {"PASSWORD_SCRYPT_WORK_FACTOR": 2**15}),
+    ("scrypt N=2^17 (OWASP)", "scrypt", {"PASSWORD_SCRYPT_WORK_FACTOR": 2**17}),
+    ("scrypt N=2^14 (Django)", "scrypt", {"PASSWORD_SCRYPT_WORK_FACTOR": 2**14}),
+    ("argon2 t=2 m=19M p=1", "argon2", {"PASSWORD_ARGON2_TIME_COST": 2, "PASSWORD_ARGON2_MEMORY_COST": 19456}),
+    ("argon2 t=3 m=12M p=1", "argon2", {"PASSWORD_ARGON2_TIME_COST": 3, "PASSWORD_ARGON2_MEMORY_COST": 12288}),
+    ("argon2 t=1 m=47M p=1", "argon2", {"PASSWORD_ARGON2_TIME_COST": 1, "PASSWORD_ARGON2_MEMORY_COST": 47104}),
+    (
+        "argon2 t=2 m=100M p=8 (Django)",
+        "argon2",
+        {"PASSWORD_ARGON2_TIME_COST": 2, "PASSWORD_ARGON2_MEMORY_COST": 102400, "PASSWORD_ARGON2_PARALLELISM": 8},
+    ),
+]
+
+
+class Command(BaseCommand):
+    """
+    Кастомная команда. Пропускная способность проверки пароля при входе для алгоритмов и стоимостей хеширования
+    (см. user.hashers): --logins проверок check_password в --threads потоках, как в воркере Gunicorn gthread
+    с WEB_THREADS потоками. Печатает время одной проверки, процессорное время на проверку и входов в секунду.
+    Хешеры отпускают GIL, поэтому при нескольких ядрах потоки воркера проверяют пароли параллельно.
+
+    Пример: python manage.py bench_password_hashing --logins 50 --threads 1 4
+    """
+
+    help = "Бенчмарк проверки пароля при входе: алгоритмы и стоимость хеширования"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--logins", type=int, default=40, help="Количество проверок пароля на вариант")
+        parser.add_argument("--threads", type=int, nargs="+", default=[1, 4], help="Число потоков (несколько)")
+        parser.add_argument("--only", help="Только варианты, подпись которых начинается с этой строки")
+
+    def handle(self, *args, **options):
+        for label, algorithm, cost in VARIANTS:
+            if options["only"] and not label.startswith(options["only"]):
+                continue
+            hashers = [settings.PASSWORD_HASHER_CLASSES[algorithm]]
+            with override_settings(PASSWORD_HASHERS=hashers, **cost):
+                encoded = make_password(PASSWORD)
+                for threads in options["threads"]:
+                    self.run(label, encoded, options["logins"], threads)
+
+    def run(self, label, encoded, logins, threads):
+        """
+        Выполняет проверки пароля и печатает замеры.
+        """
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            started, cpu_started = time.perf_counter(), time.process_time()
+            assert all(pool.map(lambda _: check_password(PASSWORD, encoded), range(logins)))
+            elapsed, cpu = time.perf_counter() - started, time.process_time() - cpu_started
+        self.stdout.write(
+            f"{label:>30} | потоков: {threads:2} | {elapsed / logins * 1000 * threads:7.1f} мс/вход | "
+            f"CPU {cpu / logins * 1000:7.1f} мс/вход | {logins / elapsed:7.1f} входов/с"
+        )
@@ -0,0 +1,69 @@
+# user/management/commands/bench_password_reset.py
+import statistics
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from rest_framework.test import APIRequestFactory
+
+from config import celery_app
+from config.smtp_sink import SMTPSink
+from user.models import User
+from user.views import PasswordResetRequestView
+
+
+class Command(BaseCommand):
+    """
+    Кастомная команда. Измеряет задержку (p50/p99) эндпоинта запроса сброса пароля:
+    - письмо отправляется в запросе (задача выполняется сразу, task_always_eager — как было раньше);
+    - письмо ставится в очередь Celery (брокер из CELERY_BROKER_URL).
+
+    Письма уходят в локальную SMTP-заглушку; задержка подключения имитирует медленный почтовый сервер.
+    """
+
+    help = "Бенчмарк задержки запроса сброса пароля: отправка в запросе против очереди"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="Количество запросов на режим")
+        parser.add_argument("--connect-latency-ms", type=float, default=100, help="Задержка подключения к SMTP")
+
+    def handle(self, *args, **options):
+        emails = list(User.objects.order_by("id").values_list("email", flat=True)[:50])
+        if not emails:
+            raise CommandError("В базе нет пользователей: запустите seed_bulletins")
+
+        factory = APIRequestFactory()
+        view = PasswordResetRequestView.as_view()
+        self.stdout.write(f"Брокер: {celery_app.conf.broker_url}, задержка SMTP {options['connect_latency_ms']} мс")
+        with SMTPSink(connect_latency=options["connect_latency_ms"] / 1000) as sink:
+            with override_settings(**sink.email_settings(), ALLOWED_HOSTS=["*"]):
+                for name, eager in (("в запросе", True), ("в очереди", False)):
+                    celery_app.conf.task_always_eager = eager
+                    try:
+                        timings = self.measure(factory, view, emails, options["requests"])
+                    finally:
+                        celery_app.conf.task_always_eager = False
+                    quantiles = statistics.quantiles(timings, n=100)
+                    self.stdout.write(
+                        f"{name:>10}: p50 {quantiles[49]:8.2f} мс | p99 {quantiles[98]:8.2f} мс | "
+                        f"писем получено заглушкой: {sink.messages}"
+                    )
+
+    @staticmethod
+    def measure(factory, view, emails, requests):
+        """
+        Возвращает время ответа (мс) на каждый запрос.
+        """
+        timings = []
+        for number in range(requests):
+            request = factory.post("/api/user/reset_password/", {"email": emails[number % len(emails)]}, format="json")
+            started = time.perf_counter()
+            response = view(request)
+            timings.append((time.perf_counter() - started) * 1000)
+            if response.status_code != 200:
+                raise CommandError(f"Неожиданный ответ {response.status_code}: {response.data}")
+            # Ключи идемпотентности не должны схлопывать письма разных итераций замера
+            cache.clear()
+        return timings
@@ -0,0 +1,62 @@
+# user/management/commands/bench_permissions.py
+import time
+
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from bulletin.models import Bulletin
+from bulletin.permissions import IsAuthorOrAdminOrReadOnlyForBulletins
+from user.models import User
+from user.roles import ADMIN_GROUP, admin_cache_key
+
+
+class Command(BaseCommand):
+    """
+    Кастомная команда. Измеряет стоимость проверки объектных прав на изменение чужого объявления
+    администратором (участником группы) на один запрос: без кэша (запрос к auth_group на каждый раз)
+    и с кэшем признака администратора. Все данные создаются во временной транзакции и откатываются.
+    """
+
+    help = "Микробенчмарк проверки прав доступа на один запрос"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000, help="Количество запросов")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.run(options["requests"])
+            transaction.set_rollback(True)
+
+    def run(self, requests):
+        author = User.objects.create(email="bench-author@example.com", password="!")
+        admin = User.objects.create(email="bench-admin@example.com", password="!")
+        admin.groups.add(Group.objects.get_or_create(name=ADMIN_GROUP)[0])
+        bulletin = Bulletin.objects.create(title="Бенчмарк", price=1, description="...", author=author)
+
+        factory = APIRequestFactory()
+        permission = IsAuthorOrAdminOrReadOnlyForBulletins()
+
+        def evaluate():
+            request = Request(factory.patch("/"))
+            request.user = admin
+            assert permission.has_object_permission(request, None, bulletin)
+
+        for label, warm_cache in (("без кэша", False), ("с кэшем", True)):
+            cache.delete(admin_cache_key(admin.pk))
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                for _ in range(requests):
+                    if not warm_cache:
+                        cache.delete(admin_cache_key(admin.pk))
+                    evaluate()
+                elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"{label:>9}: {elapsed / requests * 1_000_000:8.1f} мкс/запрос, "
+                f"SQL-запросов: {len(queries) / requests:.2f}/запрос"
+            )
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.1 on 2026-10-18 13:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0003_user_date_joined_alter_user_last_login"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="avatar_derivatives",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Имена файлов производных аватара: {формат: {размер: имя}}",
+                verbose_name="Производные аватара",
+            ),
+        ),
+    ]
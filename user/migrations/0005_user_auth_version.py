@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-18 13:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0004_user_avatar_derivatives"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="auth_version",
+            field=models.PositiveIntegerField(
+                default=1,
+                editable=False,
+                help_text="Увеличивается при смене пароля: токены с прежней версией не принимаются",
+                verbose_name="Версия токенов",
+            ),
+        ),
+    ]
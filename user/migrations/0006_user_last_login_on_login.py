@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 13:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0005_user_auth_version"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="user",
+            name="last_login",
+            field=models.DateTimeField(blank=True, null=True, verbose_name="Последний вход"),
+        ),
+    ]
@@ -1,3 +1,4 @@
+from django.contrib.auth.hashers import check_password
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from django.db import models
 
@@ -52,8 +53,10 @@ class User(AbstractBaseUser, PermissionsMixin):
              phone (str): Телефон для связи;
              email (str): Электронная почта пользователя;
                     role: Роль пользователя, доступные значения: user, admin. Роли: user, admin;
-                   image: Аватарка пользователя;
+                   image: Аватарка пользователя (оригинал);
+      avatar_derivatives: Производные аватара по формату и размеру (см. user.avatars);
           password (str): Пароль пользователя;
+      auth_version (int): Версия токенов, растёт при смене пароля (см. user.authentication);
     """
 
     ROLE_CHOICES = [
@@ -107,6 +110,14 @@ class User(AbstractBaseUser, PermissionsMixin):
         null=True,
     )  # type: ignore[var-annotated]
 
+    avatar_derivatives = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name="Производные аватара",
+        help_text="Имена файлов производных аватара: {формат: {размер: имя}}",
+    )  # type: ignore[var-annotated]
+
     is_active = models.BooleanField(
         default=True,
         verbose_name="Активен",
@@ -122,8 +133,10 @@ class User(AbstractBaseUser, PermissionsMixin):
         verbose_name="Суперпользователь",
     )  # type: ignore[var-annotated]
 
+    # Заполняется при входе, не чаще раза в LOGIN_RECORD_INTERVAL минут (см. user.logins), а не при каждом save()
     last_login = models.DateTimeField(
-        auto_now=True,
+        blank=True,
+        null=True,
         verbose_name="Последний вход",
     )  # type: ignore[var-annotated]
 
@@ -132,6 +145,13 @@ class User(AbstractBaseUser, PermissionsMixin):
         verbose_name="Дата регистрации",
     )  # type: ignore[var-annotated]
 
+    auth_version = models.PositiveIntegerField(
+        default=1,
+        editable=False,
+        verbose_name="Версия токенов",
+        help_text="Увеличивается при смене пароля: токены с прежней версией не принимаются",
+    )  # type: ignore[var-annotated]
+
     objects = UserManager()
 
     USERNAME_FIELD = "email"
@@ -143,6 +163,32 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     id: int  # Для mypy
 
+    def set_password(self, raw_password):
+        """
+        Устанавливает пароль и увеличивает версию токенов: выданные ранее токены перестают приниматься.
+        Для нового пользователя (ещё не сохранённого) версия не меняется.
+        :param raw_password: Новый пароль
+        """
+        super().set_password(raw_password)
+        if self.pk is not None:
+            self.auth_version += 1
+
+    def check_password(self, raw_password):
+        """
+        Проверяет пароль. Если хеш получен другим алгоритмом или с другой стоимостью, чем текущие
+        (см. user.hashers), пересчитывает его и сохраняет только поле password: пароль тот же, поэтому
+        версия токенов не меняется и выданные токены остаются действительными.
+        :param raw_password: Пароль
+        :return: True, если пароль верный
+        """
+
+        def setter(raw_password):
+            AbstractBaseUser.set_password(self, raw_password)
+            self._password = None
+            self.save(update_fields=["password"])
+
+        return check_password(raw_password, self.password, setter)
+
     def __str__(self):
         """
         Возвращает строковое представление пользователя.
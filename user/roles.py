@@ -0,0 +1,64 @@
+# user/roles.py
+"""
+Определение роли администратора для проверок прав доступа.
+
+Администратор — пользователь с ролью "admin" (поле User.role) или участник группы "Администраторы".
+Членство в группе кэшируется в Redis и сбрасывается при изменении групп пользователя (см. user.signals);
+в пределах одного запроса результат запоминается на объекте запроса, чтобы повторные проверки прав
+не обращались даже к кэшу.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+
+ADMIN_GROUP = "Администраторы"
+ADMIN_ROLE = "admin"
+
+
+def admin_cache_key(user_id):
+    """
+    Возвращает ключ кэша с признаком членства пользователя в группе администраторов.
+    """
+    return f"user:{user_id}:is_admin"
+
+
+def is_admin(user):
+    """
+    Проверяет, является ли пользователь администратором.
+
+    :param user: Пользователь (в том числе анонимный)
+    :return: True, если пользователь — администратор
+    """
+    if not user.is_authenticated:
+        return False
+    if user.role == ADMIN_ROLE:
+        return True
+
+    key = admin_cache_key(user.pk)
+    in_group = cache.get(key)
+    if in_group is None:
+        in_group = user.groups.filter(name=ADMIN_GROUP).exists()
+        cache.set(key, in_group, settings.USER_ROLE_CACHE_TIMEOUT)
+    return in_group
+
+
+def request_is_admin(request):
+    """
+    Проверяет, является ли автор запроса администратором. Результат вычисляется один раз за запрос.
+
+    :param request: Объект запроса DRF
+    :return: True, если пользователь — администратор
+    """
+    resolved = getattr(request, "_is_admin", None)
+    if resolved is None:
+        resolved = request._is_admin = is_admin(request.user)
+    return resolved
+
+
+def invalidate_admin_status(user_ids):
+    """
+    Сбрасывает закэшированный признак администратора для пользователей.
+
+    :param user_ids: Идентификаторы пользователей
+    """
+    cache.delete_many([admin_cache_key(user_id) for user_id in user_ids])
@@ -1,8 +1,16 @@
+from functools import partial
+
+from django.db import transaction
+
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
+from user.authentication import AUTH_VERSION_CLAIM
+from user.avatars import derivative_urls
+from user.logins import record_login
 from user.models import User
+from user.tasks import generate_avatar_derivatives
 
 
 class RegisterSerializer(serializers.ModelSerializer):
@@ -56,12 +64,55 @@ class RegisterSerializer(serializers.ModelSerializer):
 class EmailTokenObtainPairSerializer(TokenObtainPairSerializer):
     username_field = "email"
 
+    @classmethod
+    def get_token(cls, user):
+        """
+        Добавляет в токены версию (см. user.authentication): после смены пароля они перестают приниматься.
+        Access-токен, полученный по refresh-токену, наследует claim.
+        """
+        token = super().get_token(user)
+        token[AUTH_VERSION_CLAIM] = user.auth_version
+        return token
+
+    def validate(self, attrs):
+        """
+        Выдаёт токены и учитывает вход (см. user.logins): без записи в таблицу пользователей на каждый вход.
+        """
+        data = super().validate(attrs)
+        record_login(self.user.pk)
+        return data
+
 
 class UserSerializer(serializers.ModelSerializer):
     """
     Представляет собой универсальный сериализатор пользователя.
+
+    Аватар загружается в поле image (multipart), а отдаётся в поле avatar — ссылками на производные
+    {формат: {размер: URL}} (см. user.avatars); пока производные строятся, avatar — null.
     """
 
+    image = serializers.ImageField(write_only=True, required=False, allow_null=True)
+    avatar = serializers.SerializerMethodField()
+
+    def get_avatar(self, user):
+        """
+        Возвращает ссылки на производные аватара.
+        """
+        return derivative_urls(user, self.context.get("request"))
+
+    def update(self, instance, validated_data):
+        """
+        Обновляет пользователя. Для нового аватара старые производные сбрасываются, а новые строятся задачей
+        Celery после фиксации транзакции.
+        """
+        image_changed = "image" in validated_data
+        if image_changed:
+            instance.avatar_derivatives = {}
+        user = super().update(instance, validated_data)
+        if image_changed and user.image:
+            transaction.on_commit(partial(generate_avatar_derivatives.delay, user.pk, user.image.name))
+        return user
+
     class Meta:
         """
         Говорит сериализатору, что он работает с моделью User, и определяет список полей,
@@ -69,5 +120,17 @@ class UserSerializer(serializers.ModelSerializer):
         """
 
         model = User
-        fields = ["id", "email", "first_name", "last_name", "role", "is_active", "is_staff", "is_superuser"]
-        read_only_fields = ["id", "email"]
+        fields = [
+            "id",
+            "email",
+            "first_name",
+            "last_name",
+            "role",
+            "is_active",
+            "is_staff",
+            "is_superuser",
+            "image",
+            "avatar",
+        ]
+        # Роль и флаги прав не меняются через профиль: role == "admin" даёт права администратора (см. user.roles)
+        read_only_fields = ["id", "email", "role", "is_active", "is_staff", "is_superuser"]
@@ -0,0 +1,56 @@
+# user/signals.py
+from django.contrib.auth.models import Group, update_last_login
+from django.contrib.auth.signals import user_logged_in
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .authentication import invalidate_user
+from .logins import record_login
+from .models import User
+from .roles import invalidate_admin_status
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def reset_admin_status_on_groups_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Сбрасывает кэш признака администратора при изменении групп пользователя
+    (user.groups.add/remove/clear или group.user_set.add/remove/clear).
+    """
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            invalidate_admin_status([instance.pk])
+        return
+
+    # Изменение со стороны группы: для clear пользователей нужно собрать до очистки
+    if action == "pre_clear":
+        invalidate_admin_status(instance.user_set.values_list("pk", flat=True))
+    elif action in ("post_add", "post_remove"):
+        invalidate_admin_status(pk_set)
+
+
+@receiver(pre_delete, sender=Group)
+def reset_admin_status_on_group_delete(sender, instance, **kwargs):
+    """
+    Сбрасывает кэш признака администратора у участников удаляемой группы.
+    """
+    invalidate_admin_status(instance.user_set.values_list("pk", flat=True))
+
+
+@receiver([post_save, post_delete], sender=User)
+def reset_cached_auth_user(sender, instance, **kwargs):
+    """
+    Удаляет пользователя из кэша аутентификации после изменения (профиль, деактивация, смена пароля) или удаления.
+    """
+    invalidate_user(instance)
+
+
+# Вход в сессию (админка, Browsable API) учитывается так же, как выдача JWT: через журнал, а не save() пользователя
+user_logged_in.disconnect(update_last_login, dispatch_uid="update_last_login")
+
+
+@receiver(user_logged_in)
+def record_session_login(sender, user, **kwargs):
+    """
+    Учитывает вход в сессию (см. user.logins).
+    """
+    record_login(user.pk)
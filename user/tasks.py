@@ -0,0 +1,27 @@
+# user/tasks.py
+from celery import shared_task
+
+from . import avatars, logins
+
+
+@shared_task(acks_late=True, autoretry_for=(OSError,), max_retries=3, retry_backoff=5, retry_jitter=True)
+def generate_avatar_derivatives(user_id, name):
+    """
+    Строит производные нового аватара пользователя (см. user.avatars).
+    При ошибке чтения или записи файлов задача повторяется.
+
+    :param user_id: Идентификатор пользователя
+    :param name: Имя файла аватара на момент постановки задачи
+    :return: True, если производные записаны
+    """
+    return avatars.generate(user_id, name)
+
+
+@shared_task
+def flush_logins():
+    """
+    Периодическая задача: записывает накопленные входы пользователей в last_login (см. user.logins).
+
+    :return: Количество обновлённых пользователей
+    """
+    return logins.flush()
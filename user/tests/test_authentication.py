@@ -0,0 +1,152 @@
+# user/tests/test_authentication.py
+"""
+Что покрыто:
+кэш пользователя — повторные запросы с тем же JWT не обращаются к базе (память процесса и Redis)
+хэш пароля не кэшируется — поле password отложено, сохранение профиля его не затирает
+инвалидация — изменение профиля и деактивация видны следующему запросу, в том числе в другом процессе (Redis)
+версия токена — claim auth_version при входе и обновлении, после смены пароля старые токены не принимаются
+"""
+
+from django.core.cache import cache
+from django.urls import reverse
+
+import pytest
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from user import authentication
+from user.authentication import AUTH_VERSION_CLAIM, CachedJWTAuthentication
+from user.models import User
+
+URL = reverse("user:user-me")
+
+
+@pytest.fixture
+def user(db):
+    """
+    Создаёт и возвращает пользователя.
+
+    :return: User
+    """
+    return User.objects.create_user(email="auth@example.com", password="secure1234", first_name="Иван")
+
+
+def login(user, password="secure1234"):
+    """
+    Выполняет вход и возвращает пару токенов.
+
+    :return: dict с ключами access и refresh
+    """
+    response = APIClient().post(reverse("user:token_obtain_pair"), {"email": user.email, "password": password})
+    assert response.status_code == 200
+    return response.data
+
+
+def client_for(token):
+    """
+    Возвращает APIClient с заголовком Authorization.
+    """
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
+
+
+def authenticate(token):
+    """
+    Аутентифицирует запрос с токеном через CachedJWTAuthentication.
+
+    :return: Пользователь
+    """
+    request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+    return CachedJWTAuthentication().authenticate(request)[0]
+
+
+def test_cached_user(user, django_assert_num_queries):
+    """
+    Пользователь загружается из базы один раз; следующие запросы — из памяти процесса, а без неё — из Redis.
+    Каждый запрос получает свою копию.
+    """
+    token = str(AccessToken.for_user(user))
+    with django_assert_num_queries(1):
+        first = authenticate(token)
+
+    with django_assert_num_queries(0):
+        second = authenticate(token)
+        authentication.local_users.clear()
+        third = authenticate(token)
+
+    assert first.pk == second.pk == third.pk == user.pk
+    assert second is not first and third is not second
+
+
+def test_cached_user_without_password(user):
+    """
+    В кэше нет хэша пароля; обращение к полю загружает его из базы, сохранение профиля пароль не затирает.
+    """
+    token = str(AccessToken.for_user(user))
+    authenticate(token)
+    key = authentication.user_cache_key(user.pk, user.auth_version)
+
+    assert "password" not in vars(cache.get(key))
+    assert "password" not in vars(authentication.local_users[key][1])
+
+    cached = authenticate(token)
+    assert cached.get_deferred_fields() == {"password"}
+    client_for(login(user)["access"]).patch(URL, {"first_name": "Пётр"})
+    user.refresh_from_db()
+    assert user.check_password("secure1234")
+    assert cached.check_password("secure1234")
+
+
+def test_profile_update_invalidates(user):
+    """
+    Изменение профиля сбрасывает кэш: следующий запрос видит новые данные, даже из другого процесса.
+    """
+    client = client_for(login(user)["access"])
+    assert client.get(URL).data["first_name"] == "Иван"
+
+    client.patch(URL, {"first_name": "Пётр"})
+    # Другой процесс не видел этого сохранения в своей памяти: его путь — Redis, запись в котором удалена
+    authentication.local_users.clear()
+    assert client.get(URL).data["first_name"] == "Пётр"
+
+
+def test_deactivation_invalidates(user):
+    """
+    После деактивации токен пользователя больше не принимается.
+    """
+    client = client_for(login(user)["access"])
+    assert client.get(URL).status_code == 200
+
+    assert client.delete(URL).status_code == 204
+    assert client.get(URL).status_code == 401
+
+
+def test_token_version(user):
+    """
+    Токены входа и обновления несут версию; после смены пароля старые токены отклоняются, новые принимаются.
+    """
+    tokens = login(user)
+    assert AccessToken(tokens["access"])[AUTH_VERSION_CLAIM] == 1
+    refreshed = APIClient().post(reverse("user:token_refresh"), {"refresh": tokens["refresh"]}).data["access"]
+    assert AccessToken(refreshed)[AUTH_VERSION_CLAIM] == 1
+    old = client_for(tokens["access"])
+    assert old.get(URL).status_code == 200
+
+    user.set_password("new-secure-5678")
+    user.save()
+
+    response = old.get(URL)
+    assert response.status_code == 401
+    assert response.data["detail"].code == "password_changed"
+    assert client_for(login(user, "new-secure-5678")["access"]).get(URL).status_code == 200
+
+
+def test_token_without_version(user):
+    """
+    Токены без claim auth_version (выданные до его появления) считаются версией 1.
+    """
+    token = RefreshToken.for_user(user).access_token
+    assert AUTH_VERSION_CLAIM not in token
+
+    assert client_for(str(token)).get(URL).status_code == 200
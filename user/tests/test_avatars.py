@@ -0,0 +1,163 @@
+# user/tests/test_avatars.py
+"""
+Что покрыто:
+загрузка аватара — задача ставится после фиксации транзакции, до её выполнения avatar = null
+производные — все размеры в WebP и JPEG, квадратные, без EXIF, имена по хэшу содержимого, абсолютные ссылки;
+запись производных сбрасывает пользователя в кэше аутентификации
+устаревшая задача — если аватар сменился, производные старого не записываются
+удаление аватара — производные сбрасываются
+"""
+
+import hashlib
+import io
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+
+import pytest
+from PIL import Image
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from user.models import User
+from user.tasks import generate_avatar_derivatives
+
+URL = reverse("user:user-me")
+
+
+@pytest.fixture(autouse=True)
+def media(settings, tmp_path):
+    """
+    Складывает загруженные файлы во временный каталог.
+    """
+    settings.MEDIA_ROOT = tmp_path
+    settings.AVATAR_SIZES = [32, 96]
+    return tmp_path
+
+
+@pytest.fixture
+def user(db):
+    """
+    Создаёт и возвращает пользователя.
+
+    :return: User
+    """
+    return User.objects.create_user(email="avatar@example.com", password="password")
+
+
+@pytest.fixture
+def client(user):
+    """
+    Возвращает APIClient, авторизованный пользователем.
+
+    :return: APIClient
+    """
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def photo(name="photo.jpg", color="red"):
+    """
+    Возвращает JPEG 320x200 с EXIF (производитель камеры и ориентация) для загрузки.
+
+    :return: SimpleUploadedFile
+    """
+    image = Image.new("RGB", (320, 200), color)
+    exif = Image.Exif()
+    exif[0x010F] = "Камера"  # Make
+    exif[0x0112] = 1  # Orientation
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", exif=exif)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/jpeg")
+
+
+def upload(client, django_capture_on_commit_callbacks, **kwargs):
+    """
+    Загружает аватар и возвращает ответ и аргументы поставленной задачи (None, если задача не ставилась).
+    """
+    with patch("user.serializers.generate_avatar_derivatives.delay") as delay:
+        with django_capture_on_commit_callbacks(execute=True):
+            response = client.patch(URL, {"image": photo(**kwargs)}, format="multipart")
+    return response, delay.call_args.args if delay.called else None
+
+
+def test_upload_schedules_derivatives(client, user, django_capture_on_commit_callbacks):
+    """
+    После загрузки ставится задача для нового файла; пока она не выполнена, производных нет.
+    """
+    response, args = upload(client, django_capture_on_commit_callbacks)
+
+    assert response.status_code == 200
+    assert response.data["avatar"] is None
+    assert "image" not in response.data
+    user.refresh_from_db()
+    assert args == (user.pk, user.image.name)
+
+
+def test_derivatives(client, user, media, django_capture_on_commit_callbacks):
+    """
+    Задача строит квадратные копии всех размеров в обоих форматах без метаданных, под именами по хэшу.
+    """
+    _, args = upload(client, django_capture_on_commit_callbacks)
+
+    assert generate_avatar_derivatives(*args) is True
+
+    user.refresh_from_db()  # force_authenticate отдаёт запросам этот же объект
+    avatar = client.get(URL).data["avatar"]
+    assert set(avatar) == {"webp", "jpeg"}
+    assert set(avatar["webp"]) == {"32", "96"}
+    assert avatar["jpeg"]["96"].startswith("http://testserver/media/avatars/derived/")
+    for name, by_size in user.avatar_derivatives.items():
+        for size, path in by_size.items():
+            content = (media / path).read_bytes()
+            assert path.endswith(hashlib.sha256(content).hexdigest() + (".webp" if name == "webp" else ".jpg"))
+            with Image.open(io.BytesIO(content)) as image:
+                assert image.size == (int(size), int(size))
+                assert not image.getexif()
+                assert "icc_profile" not in image.info
+
+
+def test_derivatives_invalidate_auth_cache(client, user, django_capture_on_commit_callbacks):
+    """
+    Запись производных сбрасывает пользователя в кэше аутентификации: запрос с JWT сразу видит аватар.
+    """
+    _, args = upload(client, django_capture_on_commit_callbacks)
+    jwt_client = APIClient()
+    jwt_client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+    assert jwt_client.get(URL).data["avatar"] is None  # пользователь без производных попал в кэш
+
+    generate_avatar_derivatives(*args)
+
+    assert set(jwt_client.get(URL).data["avatar"]) == {"webp", "jpeg"}
+
+
+def test_stale_task(client, user, django_capture_on_commit_callbacks):
+    """
+    Задача старого аватара ничего не записывает, если пользователь уже загрузил новый.
+    """
+    _, old = upload(client, django_capture_on_commit_callbacks, name="old.jpg")
+    _, new = upload(client, django_capture_on_commit_callbacks, name="new.jpg", color="blue")
+
+    assert old != new
+    assert generate_avatar_derivatives(*old) is False
+    user.refresh_from_db()
+    assert user.avatar_derivatives == {}
+
+
+def test_remove_avatar(client, user, django_capture_on_commit_callbacks):
+    """
+    Удаление аватара сбрасывает производные и не ставит задачу.
+    """
+    _, args = upload(client, django_capture_on_commit_callbacks)
+    generate_avatar_derivatives(*args)
+
+    with patch("user.serializers.generate_avatar_derivatives.delay") as delay:
+        response = client.patch(URL, {"image": None}, format="json")
+
+    assert response.data["avatar"] is None
+    assert not delay.called
+    user.refresh_from_db()
+    assert not user.image
+    assert user.avatar_derivatives == {}
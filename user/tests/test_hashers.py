@@ -0,0 +1,120 @@
+# user/tests/test_hashers.py
+"""
+Что покрыто:
+новые пароли — хешируются алгоритмом PASSWORD_HASHER со стоимостью из настроек
+пересчёт при входе — хеш прежнего алгоритма или прежней стоимости пересчитывается при успешном входе,
+выданные токены остаются действительными; неудачный вход хеш не меняет
+снижение стоимости — хеш с большей стоимостью (и памятью) по-прежнему проверяется и пересчитывается
+"""
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, identify_hasher
+from django.test import override_settings
+from django.urls import reverse
+
+import pytest
+from rest_framework.test import APIClient
+
+from user.models import User
+
+PASSWORD = "secure1234"
+
+
+def hashers(preferred):
+    """
+    Возвращает PASSWORD_HASHERS с указанным алгоритмом новых хешей (как в config.settings).
+    """
+    classes = settings.PASSWORD_HASHER_CLASSES
+    return [classes[preferred]] + [path for name, path in classes.items() if name != preferred]
+
+
+@pytest.fixture
+def legacy_user(db):
+    """
+    Создаёт пользователя с хешем PBKDF2, как до перехода на argon2.
+
+    :return: User
+    """
+    with override_settings(PASSWORD_HASHERS=hashers("pbkdf2"), PASSWORD_PBKDF2_ITERATIONS=1000):
+        return User.objects.create_user(email="hash@example.com", password=PASSWORD)
+
+
+def login(user, password=PASSWORD):
+    """
+    Выполняет вход и возвращает ответ.
+    """
+    return APIClient().post(reverse("user:token_obtain_pair"), {"email": user.email, "password": password})
+
+
+@override_settings(PASSWORD_ARGON2_TIME_COST=3, PASSWORD_ARGON2_MEMORY_COST=8192)
+def test_new_password_uses_configured_cost(db):
+    """
+    Новый пароль хешируется argon2 с настроенной стоимостью.
+    """
+    user = User.objects.create_user(email="new@example.com", password=PASSWORD)
+
+    assert identify_hasher(user.password).algorithm == "argon2"
+    assert "$m=8192,t=3,p=1$" in user.password
+    assert user.check_password(PASSWORD)
+
+
+def test_legacy_hash_upgraded_on_login(legacy_user):
+    """
+    Успешный вход пересчитывает хеш PBKDF2 в argon2; токен остаётся действительным, версия токенов не меняется.
+    """
+    response = login(legacy_user)
+    assert response.status_code == 200
+
+    legacy_user.refresh_from_db()
+    assert identify_hasher(legacy_user.password).algorithm == "argon2"
+    assert legacy_user.auth_version == 1
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+    assert client.get(reverse("user:user-me")).status_code == 200
+    assert login(legacy_user).status_code == 200
+
+
+def test_failed_login_keeps_hash(legacy_user):
+    """
+    Неверный пароль не меняет хеш.
+    """
+    encoded = legacy_user.password
+
+    assert login(legacy_user, "wrong-password").status_code == 401
+
+    legacy_user.refresh_from_db()
+    assert legacy_user.password == encoded
+
+
+def test_cost_change_upgrades_on_login(db):
+    """
+    Хеш с прежней стоимостью пересчитывается с новой при входе, пароль продолжает подходить.
+    """
+    with override_settings(PASSWORD_HASHERS=hashers("scrypt"), PASSWORD_SCRYPT_WORK_FACTOR=2**10):
+        user = User.objects.create_user(email="scrypt@example.com", password=PASSWORD)
+    with override_settings(PASSWORD_HASHERS=hashers("scrypt"), PASSWORD_SCRYPT_WORK_FACTOR=2**11):
+        assert login(user).status_code == 200
+
+        user.refresh_from_db()
+        assert identify_hasher(user.password).decode(user.password)["work_factor"] == 2**11
+        assert user.check_password(PASSWORD)
+
+
+def test_lowered_cost_keeps_old_hashes(db):
+    """
+    После снижения стоимости хеш, которому нужно больше памяти, чем позволяют новые параметры, проверяется
+    и пересчитывается при входе.
+    """
+    with override_settings(
+        PASSWORD_HASHERS=hashers("scrypt"), PASSWORD_SCRYPT_WORK_FACTOR=2**12, PASSWORD_SCRYPT_BLOCK_SIZE=16
+    ):
+        user = User.objects.create_user(email="scrypt@example.com", password=PASSWORD)
+    with override_settings(
+        PASSWORD_HASHERS=hashers("scrypt"), PASSWORD_SCRYPT_WORK_FACTOR=2**10, PASSWORD_SCRYPT_BLOCK_SIZE=8
+    ):
+        assert check_password(PASSWORD, user.password)
+        assert login(user).status_code == 200
+
+        user.refresh_from_db()
+        decoded = identify_hasher(user.password).decode(user.password)
+        assert (decoded["work_factor"], decoded["block_size"]) == (2**10, 8)
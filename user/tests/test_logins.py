@@ -0,0 +1,97 @@
+# user/tests/test_logins.py
+"""
+Что покрыто:
+last_login — не меняется при сохранении пользователя (PATCH профиля)
+вход — выдача JWT не пишет в таблицу пользователей, вход попадает в журнал не чаще раза в LOGIN_RECORD_INTERVAL
+сброс — last_login всех пользователей пачки обновляется одним запросом, берётся последний вход, журнал очищается
+"""
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+import pytest
+from rest_framework.test import APIClient
+
+from user import logins
+from user.models import User
+from user.tasks import flush_logins
+
+
+@pytest.fixture
+def users(db):
+    """
+    Создаёт трёх пользователей.
+
+    :return: Список User
+    """
+    return [User.objects.create_user(email=f"login{number}@example.com", password="secure1234") for number in range(3)]
+
+
+def login(user):
+    """
+    Выполняет вход и возвращает ответ.
+    """
+    return APIClient().post(reverse("user:token_obtain_pair"), {"email": user.email, "password": "secure1234"})
+
+
+def test_save_keeps_last_login(users):
+    """
+    Изменение профиля не трогает last_login.
+    """
+    client = APIClient()
+    client.force_authenticate(users[0])
+
+    client.patch(reverse("user:user-me"), {"first_name": "Новое"})
+
+    users[0].refresh_from_db()
+    assert users[0].first_name == "Новое"
+    assert users[0].last_login is None
+
+
+def test_login_is_buffered(users):
+    """
+    Вход не обновляет строку пользователя; повторный вход в окне не записывается.
+    """
+    with CaptureQueriesContext(connection) as context:
+        assert login(users[0]).status_code == 200
+    assert not [query for query in context.captured_queries if query["sql"].startswith("UPDATE")]
+
+    login(users[0])
+
+    entries, _, _ = logins.journal.read_pending(100)
+    assert [entry[0] for entry in entries] == [users[0].pk]
+    users[0].refresh_from_db()
+    assert users[0].last_login is None
+
+
+def test_flush(users, django_assert_num_queries):
+    """
+    Сброс обновляет last_login всех вошедших одним запросом и очищает журнал.
+    """
+    for user in users[:2]:
+        login(user)
+
+    with django_assert_num_queries(1):
+        assert flush_logins() == 2
+
+    last_logins = dict(User.objects.values_list("pk", "last_login"))
+    assert last_logins[users[0].pk] is not None and last_logins[users[1].pk] is not None
+    assert last_logins[users[2].pk] is None
+    assert flush_logins() == 0
+
+
+def test_flush_takes_latest(users):
+    """
+    Если окно истекло и вход записан дважды, в last_login попадает последний.
+    """
+    login(users[0])
+    cache.delete(logins.RECENT_KEY.format(users[0].pk))  # окно LOGIN_RECORD_INTERVAL истекло
+    login(users[0])
+    entries, _, _ = logins.journal.read_pending(100)
+
+    flush_logins()
+
+    users[0].refresh_from_db()
+    assert users[0].last_login.timestamp() == pytest.approx(max(entry[1] for entry in entries))
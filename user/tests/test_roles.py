@@ -0,0 +1,104 @@
+# user/tests/test_roles.py
+"""
+Что покрыто:
+is_admin — роль admin и членство в группе 'Администраторы'
+кэш — повторная проверка не обращается к базе, изменение групп сбрасывает кэш
+request_is_admin — результат вычисляется один раз за запрос
+профиль — роль и флаги прав пользователь себе не меняет
+"""
+
+from django.contrib.auth.models import Group
+from django.urls import reverse
+
+import pytest
+from rest_framework.test import APIClient, APIRequestFactory
+
+from user.models import User
+from user.roles import ADMIN_GROUP, is_admin, request_is_admin
+
+
+@pytest.fixture
+def group(db):
+    """
+    Создаёт группу администраторов.
+
+    :return: Group
+    """
+    return Group.objects.create(name=ADMIN_GROUP)
+
+
+@pytest.fixture
+def user(db):
+    """
+    Создаёт обычного пользователя.
+
+    :return: User
+    """
+    return User.objects.create(email="role@example.com", password="!")
+
+
+def test_admin_role_needs_no_queries(user, django_assert_num_queries):
+    """
+    Пользователь с ролью admin определяется без запросов к базе.
+    """
+    user.role = "admin"
+
+    with django_assert_num_queries(0):
+        assert is_admin(user)
+
+
+def test_group_membership_cached_and_invalidated(user, group, django_assert_num_queries):
+    """
+    Членство в группе кэшируется и сбрасывается при добавлении в группу и удалении из неё.
+    """
+    assert not is_admin(user)
+
+    user.groups.add(group)
+    with django_assert_num_queries(1):
+        assert is_admin(user)
+    with django_assert_num_queries(0):
+        assert is_admin(user)
+
+    group.user_set.remove(user)
+    assert not is_admin(user)
+
+
+def test_group_clear_from_group_side(user, group):
+    """
+    Очистка участников группы сбрасывает кэш её бывших участников.
+    """
+    user.groups.add(group)
+    assert is_admin(user)
+
+    group.user_set.clear()
+
+    assert not is_admin(user)
+
+
+def test_request_is_admin_memoized(user, group, django_assert_num_queries):
+    """
+    В пределах запроса признак вычисляется один раз.
+    """
+    request = APIRequestFactory().get("/")
+    request.user = user
+
+    with django_assert_num_queries(1):
+        assert not request_is_admin(request)
+        assert not request_is_admin(request)
+
+
+def test_role_not_editable_by_user(user):
+    """
+    Пользователь не может выдать себе роль admin или флаги прав через профиль.
+    """
+    client = APIClient()
+    client.force_authenticate(user)
+
+    response = client.patch(
+        reverse("user:user-me"), {"role": "admin", "is_staff": True, "is_superuser": True, "first_name": "Иван"}
+    )
+
+    assert response.status_code == 200
+    user.refresh_from_db()
+    assert (user.role, user.is_staff, user.is_superuser, user.first_name) == ("user", False, False, "Иван")
+    assert not is_admin(user)
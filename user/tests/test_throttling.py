@@ -0,0 +1,179 @@
+# user/tests/test_throttling.py
+"""
+Что покрыто:
+вход — корзина email (без учёта регистра) исчерпана: 429 с Retry-After без запросов к базе, отказ в метриках;
+другой email проходит
+атомарность — отклонённый запрос не расходует остальные корзины
+пополнение — токены возвращаются со временем
+Lua-скрипт в Redis (fakeredis) — отказ с Retry-After, атомарность, срок жизни корзин, пополнение
+IP — клиент определяется по X-Forwarded-For с учётом NUM_PROXIES
+сброс пароля — лишние запросы отклоняются до постановки письма в очередь
+"""
+
+import time
+from unittest.mock import patch
+
+from django.core.cache.backends.redis import RedisCache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+import fakeredis
+import pytest
+from rest_framework.test import APIClient
+
+from config import metrics, throttling
+from user.models import User
+
+LOGIN_URL = reverse("user:token_obtain_pair")
+
+
+@pytest.fixture
+def user(db):
+    """
+    Создаёт и возвращает пользователя.
+
+    :return: User
+    """
+    return User.objects.create_user(email="throttle@example.com", password="secure1234")
+
+
+@pytest.fixture
+def rates(settings):
+    """
+    Маленькие ставки входа: 2 попытки на email, 3 на IP, 4 всего.
+    """
+    settings.THROTTLE_RATES = {"login.account": "2/m", "login.ip": "3/m", "login.global": "4/m"}
+    return settings.THROTTLE_RATES
+
+
+@pytest.fixture
+def redis_server(monkeypatch):
+    """
+    Подменяет кэш троттлинга на RedisCache поверх fakeredis (с Lua): корзины проверяет consume_redis.
+
+    :return: FakeRedis
+    """
+    server = fakeredis.FakeRedis()
+    redis_cache = RedisCache("redis://fakeredis:6379/0", {})
+    monkeypatch.setattr(redis_cache._cache, "get_client", lambda key=None, write=False: server)
+    monkeypatch.setattr(throttling, "cache", redis_cache)
+    monkeypatch.setattr(throttling, "_script", None)
+    return server
+
+
+def login(email, client=None):
+    """
+    Выполняет попытку входа и возвращает ответ.
+    """
+    return (client or APIClient()).post(LOGIN_URL, {"email": email, "password": "secure1234"})
+
+
+def test_account_bucket(user, rates):
+    """
+    Третья попытка входа с тем же email отклоняется до проверки пароля; другой email проходит.
+    """
+    assert login(user.email).status_code == 200
+    # Регистр и пробелы email не дают новую корзину
+    assert login(f" {user.email.upper()}").status_code == 401
+
+    with CaptureQueriesContext(connection) as queries:
+        response = login(user.email)
+    assert response.status_code == 429
+    assert int(response["Retry-After"]) == 30
+    assert len(queries) == 0
+    assert metrics.snapshot()["throttle.login.account.rejected"] == 1
+
+    assert login("other@example.com").status_code == 401
+
+
+def test_rejected_request_keeps_tokens(user, rates):
+    """
+    Отказ по корзине email не списывает токены из корзин IP и общей.
+    """
+    login(user.email)
+    login(user.email)
+    for _ in range(5):
+        assert login(user.email).status_code == 429
+
+    assert login("other@example.com").status_code == 401
+    assert login("third@example.com").status_code == 429
+    assert metrics.snapshot()["throttle.login.ip.rejected"] == 1
+
+
+def test_refill(user, rates):
+    """
+    Через полминуты в корзине email (2 в минуту) появляется токен.
+    """
+    now = 1_000_000.0
+    with patch.object(throttling.time, "time", lambda: now):
+        login(user.email)
+        login(user.email)
+        assert login(user.email).status_code == 429
+
+        now += 30
+        assert login(user.email).status_code == 200
+        assert login(user.email).status_code == 429
+
+
+def test_redis_rejects_with_retry_after(user, rates, redis_server):
+    """
+    Lua-скрипт в Redis: третья попытка с тем же email — 429 с Retry-After, остальные корзины не расходуются;
+    у корзин есть срок жизни.
+    """
+    assert login(user.email).status_code == 200
+    assert login(user.email).status_code == 200
+
+    response = login(user.email)
+    assert response.status_code == 429
+    assert int(response["Retry-After"]) == 30
+    assert metrics.snapshot()["throttle.login.account.rejected"] == 1
+
+    # Отказ по email не списал токены IP (3) и общей корзины (4): у них ещё по токену
+    assert login("other@example.com").status_code == 401
+    assert login("third@example.com").status_code == 429
+    assert metrics.snapshot()["throttle.login.ip.rejected"] == 1
+    keys = redis_server.keys(f"*{throttling.KEY_PREFIX}login:*")
+    assert len(keys) == 4
+    assert all(0 < redis_server.ttl(key) <= 61 for key in keys)
+
+
+def test_redis_refill(user, rates, redis_server):
+    """
+    Lua-скрипт в Redis: токены пополняются по часам Redis (2 в секунду — токен через полсекунды).
+    """
+    rates["login.account"] = "2/s"
+    login(user.email)
+    login(user.email)
+    assert login(user.email).status_code == 429
+
+    time.sleep(0.6)
+    assert login(user.email).status_code == 200
+    assert login(user.email).status_code == 429
+
+
+def test_client_ip(user, rates):
+    """
+    IP клиента берётся из X-Forwarded-For, добавленного прокси: у разных клиентов — разные корзины.
+    """
+    rates["login.account"] = ""
+    first = APIClient(HTTP_X_FORWARDED_FOR="10.0.0.1")
+    second = APIClient(HTTP_X_FORWARDED_FOR="spoofed, 10.0.0.2")
+    for _ in range(3):
+        assert login(user.email, first).status_code == 200
+
+    assert login(user.email, first).status_code == 429
+    assert login(user.email, second).status_code == 200
+
+
+def test_password_reset(user, settings):
+    """
+    Четвёртый запрос сброса пароля для того же email за час отклоняется, письмо не ставится в очередь.
+    """
+    url = reverse("user:password_reset")
+    with patch("user.views.send_password_reset_email.delay") as delay:
+        for _ in range(3):
+            assert APIClient().post(url, {"email": user.email}).status_code == 200
+
+        assert APIClient().post(url, {"email": user.email}).status_code == 429
+    assert delay.call_count == 3
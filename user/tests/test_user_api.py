@@ -1,4 +1,9 @@
-from django.contrib.auth.tokens import default_token_generator
+from datetime import datetime
+from smtplib import SMTPException
+from unittest.mock import patch
+
+from django.contrib.auth.tokens import PasswordResetTokenGenerator, default_token_generator
+from django.core import mail
 from django.urls import reverse
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_encode
@@ -7,7 +12,9 @@ import pytest
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from config import celery_app
 from user.models import User
+from user.utils import send_password_reset_email
 
 
 @pytest.mark.django_db
@@ -153,6 +160,72 @@ class TestPasswordReset:
         assert response.status_code == status.HTTP_200_OK
         assert "Письмо для сброса пароля отправлено" in response.data["message"]
 
+    def test_password_reset_request_queues_task(self):
+        """
+        Тест: письмо не отправляется в запросе, а ставится в очередь с ключом идемпотентности.
+        :return:
+        """
+        url = reverse("user:password_reset")
+        with patch("user.views.send_password_reset_email.delay") as delay:
+            response = self.client.post(url, {"email": "reset@example.com"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert mail.outbox == []
+        email, reset_url, idempotency_key = delay.call_args.args
+        assert email == "reset@example.com"
+        assert "reset_password_confirm" in reset_url
+        assert len(idempotency_key) == 64
+
+    def test_password_reset_retry_same_idempotency_key(self):
+        """
+        Тест: повтор запроса в другую секунду даёт новый токен, но тот же ключ идемпотентности;
+        после смены пароля ключ новый.
+        :return:
+        """
+        url = reverse("user:password_reset")
+        calls = []
+        with patch("user.views.send_password_reset_email.delay") as delay:
+            for now in (datetime(2024, 1, 1, 12, 0, 0), datetime(2024, 1, 1, 12, 0, 7)):
+                with patch.object(PasswordResetTokenGenerator, "_now", return_value=now):
+                    self.client.post(url, {"email": "reset@example.com"})
+                calls.append(delay.call_args.args)
+            self.user.set_password("newpassword123")
+            self.user.save()
+            self.client.post(url, {"email": "reset@example.com"})
+
+        (_, first_url, first_key), (_, second_url, second_key) = calls
+        assert first_url != second_url
+        assert first_key == second_key
+        assert delay.call_args.args[2] != first_key
+
+    def test_password_reset_task_routed_to_own_queue(self):
+        """
+        Тест: задача сброса пароля направляется в очередь password_reset.
+        :return:
+        """
+        route = celery_app.amqp.router.route({}, send_password_reset_email.name)
+        assert route["queue"].name == "password_reset"
+
+    def test_password_reset_task_idempotent(self):
+        """
+        Тест: повторное выполнение задачи с тем же ключом не отправляет второе письмо.
+        :return:
+        """
+        assert send_password_reset_email("reset@example.com", "http://reset", "key") is True
+        assert send_password_reset_email("reset@example.com", "http://reset", "key") is False
+        assert len(mail.outbox) == 1
+
+    def test_password_reset_task_retries_on_smtp_error(self):
+        """
+        Тест: при ошибке SMTP ключ освобождается и задача повторяется, письмо уходит со второй попытки.
+        :return:
+        """
+        with patch("user.utils.send_mail", side_effect=[SMTPException("down"), 1]) as send_mail:
+            result = send_password_reset_email.apply(args=("reset@example.com", "http://reset", "retry"))
+
+        assert result.successful()
+        assert send_mail.call_count == 2
+
     def test_password_reset_confirm_success(self):
         """
         Тест успешного сброса пароля.
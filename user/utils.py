@@ -1,8 +1,15 @@
 # user/utils.py
+import hashlib
+from smtplib import SMTPException
+
+from django.conf import settings
+from django.core.cache import cache
 from django.core.mail import send_mail
 
 from celery import shared_task
 
+PASSWORD_RESET_SENT_KEY = "password_reset:sent:{}"
+
 
 @shared_task
 def send_welcome_email(user_email):
@@ -17,14 +24,50 @@ def send_welcome_email(user_email):
     send_mail(subject, message, "no-reply@example.com", [user_email])
 
 
-def send_password_reset_email(email: str, reset_url: str):
+def password_reset_idempotency_key(user):
+    """
+    Строит ключ идемпотентности письма сброса пароля из данных, которые не меняются между повторами запроса:
+    пользователя, email и хеша пароля (после смены пароля ключ новый). Токен сброса в ключ не входит — в нём
+    отметка времени, и повтор запроса в другую секунду дал бы другой ключ.
+
+    :param user: Пользователь
+    :return: Ключ идемпотентности (sha256)
+    """
+    return hashlib.sha256(f"{user.pk}:{user.email}:{user.password}".encode()).hexdigest()
+
+
+@shared_task(
+    bind=True,
+    acks_late=True,
+    autoretry_for=(SMTPException, OSError),
+    max_retries=5,
+    retry_backoff=5,
+    retry_backoff_max=300,
+    retry_jitter=True,
+)
+def send_password_reset_email(self, email: str, reset_url: str, idempotency_key: str):
     """
     Отправляет письмо со ссылкой для сброса пароля.
 
+    Задача идёт в отдельную очередь password_reset (CELERY_TASK_ROUTES), при ошибке SMTP повторяется
+    с экспоненциальной задержкой. Письмо с одним ключом идемпотентности отправляется один раз за
+    PASSWORD_RESET_RESEND_INTERVAL минут — и при повторной доставке задачи, и при повторном запросе: ключ
+    занимается через cache.add до отправки и освобождается, если отправка не удалась.
+
     :param email: Email-адрес пользователя, запрашивающего сброс пароля.
     :param reset_url: Уникальная ссылка для сброса пароля.
-    :return: None
+    :param idempotency_key: Ключ идемпотентности (см. password_reset_idempotency_key).
+    :return: True, если письмо отправлено, False — если оно уже было отправлено ранее.
     """
+    key = PASSWORD_RESET_SENT_KEY.format(idempotency_key)
+    if not cache.add(key, 1, timeout=settings.PASSWORD_RESET_RESEND_INTERVAL * 60):
+        return False
+
     subject = "Сброс пароля"
     message = f"Для сброса пароля перейдите по ссылке: {reset_url}"
-    send_mail(subject, message, "no-reply@example.com", [email])
+    try:
+        send_mail(subject, message, "no-reply@example.com", [email])
+    except Exception:
+        cache.delete(key)
+        raise
+    return True
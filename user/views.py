@@ -10,16 +10,20 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenObtainPairView
 
+from config.db_router import ReplicaReadMixin
+from config.profiling import ProfilingMixin
+from config.throttling import TokenBucketThrottle
+
 from .models import User
 from .serializers import (  # type: ignore[reportUnusedImport]
     EmailTokenObtainPairSerializer,
     RegisterSerializer,
     UserSerializer,
 )
-from .utils import send_password_reset_email, send_welcome_email
+from .utils import password_reset_idempotency_key, send_password_reset_email, send_welcome_email
 
 
-class RegisterAPIView(CreateAPIView):
+class RegisterAPIView(ProfilingMixin, CreateAPIView):
     """
     Регистрация нового пользователя.
     Параметры запроса:
@@ -41,6 +45,8 @@ class RegisterAPIView(CreateAPIView):
 
     serializer_class = RegisterSerializer
     permission_classes = (AllowAny,)
+    throttle_classes = (TokenBucketThrottle,)
+    throttle_scope = "register"
 
     def perform_create(self, serializer):
         """
@@ -78,20 +84,26 @@ class RegisterAPIView(CreateAPIView):
         return response
 
 
-class EmailTokenObtainPairView(TokenObtainPairView):
+class EmailTokenObtainPairView(ProfilingMixin, TokenObtainPairView):
     """
-    Представляет сериализатор для получения пары токенов.
+    Представляет сериализатор для получения пары токенов. Попытки входа ограничены по IP, по email и в целом
+    (см. config.throttling) — до проверки пароля.
     """
 
     serializer_class = EmailTokenObtainPairSerializer  # type: ignore[assignment]
+    throttle_classes = (TokenBucketThrottle,)
+    throttle_scope = "login"
 
 
-class PasswordResetRequestView(APIView):
+class PasswordResetRequestView(ProfilingMixin, APIView):
     """
-    Получает email, генерирует uid/token и отправляет ссылку для сброса пароля.
+    Получает email, генерирует uid/token и ставит письмо со ссылкой для сброса пароля в очередь Celery:
+    ответ не ждёт SMTP-сервер.
     """
 
     permission_classes = [AllowAny]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = "password_reset"
 
     def post(self, request):
         email = request.data.get("email")
@@ -104,17 +116,20 @@ class PasswordResetRequestView(APIView):
         token = default_token_generator.make_token(user)
 
         reset_url = f"{request.scheme}://{request.get_host()}/users/reset_password_confirm/?uid={uid}&token={token}"
-        send_password_reset_email(user.email, reset_url)
+        send_password_reset_email.delay(user.email, reset_url, password_reset_idempotency_key(user))  # type: ignore
 
         return Response({"message": "Письмо для сброса пароля отправлено"}, status=status.HTTP_200_OK)
 
 
-class PasswordResetConfirmView(APIView):
+class PasswordResetConfirmView(ProfilingMixin, APIView):
     """
     Подтверждает токен и устанавливает новый пароль.
     """
 
     permission_classes = [AllowAny]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = "password_reset_confirm"
+    throttle_account_field = "uid"
 
     def post(self, request):
         uid = request.data.get("uid")
@@ -136,10 +151,10 @@ class PasswordResetConfirmView(APIView):
         return Response({"message": "Пароль успешно изменен"}, status=status.HTTP_200_OK)
 
 
-class UserMeAPIView(RetrieveUpdateDestroyAPIView):
+class UserMeAPIView(ProfilingMixin, ReplicaReadMixin, RetrieveUpdateDestroyAPIView):
     """
     Управление текущим пользователем:
-    - GET: Получить данные
+    - GET: Получить данные (с реплики, см. config.db_router)
     - PUT/PATCH: Обновить данные
     - DELETE: Деактивировать пользователя
     """